@@ -0,0 +1,158 @@
+"""Response cache for Typesense queries."""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a canonical cache key from JSON-serializable parts.
+
+    Dictionaries are serialized with sorted keys, so two parameter dicts with
+    the same content produce the same key regardless of insertion order.
+
+    Args:
+        *parts: Values identifying the request (collection, params, ...)
+
+    Returns:
+        Canonical string key
+    """
+    return json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a JSON value by its encoded size.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        Size in bytes of the UTF-8 JSON encoding
+    """
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode())
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache bounded by entry count and by a byte budget.
+
+    Entries expire `ttl` seconds after being stored. When either bound is
+    exceeded, the least recently used entries are evicted first. Cached values
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Time-to-live in seconds (0 disables the cache)
+            max_entries: Maximum number of cached entries
+            max_bytes: Maximum total size of cached entries, in bytes
+            timer: Clock used for expiration (for tests)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Each entry is a (value, size) tuple so TTLCache can enforce the byte budget
+        self._entries: TTLCache = TTLCache(
+            maxsize=max(max_bytes, 1),
+            ttl=max(ttl, 0),
+            timer=timer,
+            getsizeof=lambda entry: entry[1],
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.ttl > 0 and self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: str) -> Any | None:
+        """
+        Get a cached value, counting the lookup as a hit or miss.
+
+        Args:
+            key: Cache key (see make_cache_key)
+
+        Returns:
+            Cached value, or None if absent or expired
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, size: int | None = None) -> None:
+        """
+        Store a value, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key (see make_cache_key)
+            value: Value to cache
+            size: Size of the value in bytes (estimated if omitted)
+        """
+        if not self.enabled:
+            return
+
+        if size is None:
+            size = estimate_size(value)
+
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {size} byte response (budget: {self.max_bytes})")
+            return
+
+        with self._lock:
+            self._entries[key] = (value, size)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem()
+
+    def clear(self) -> None:
+        """Remove every entry (counters are preserved)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache usage counters.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, entries and bytes in use
+        """
+        with self._lock:
+            self._entries.expire()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": int(self._entries.currsize),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
@@ -1,5 +1,7 @@
 """Configuration management for GovBRNews MCP Server."""
 
+from typing import Any, Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,8 +14,56 @@ class Settings(BaseSettings):
     typesense_protocol: str = "http"
     typesense_api_key: str
 
+    # HTTP connection pool (async client)
+    typesense_timeout: float = 10.0  # seconds
+    typesense_max_connections: int = 20
+    typesense_max_keepalive_connections: int = 10
+    typesense_keepalive_expiry: float = 30.0  # seconds
+
     # Cache configuration
-    cache_ttl: int = 300  # 5 minutes default
+    cache_ttl: int = 300  # 5 minutes default (0 disables caching)
+    cache_max_entries: int = 1024
+    cache_max_bytes: int = 64 * 1024 * 1024  # 64 MiB
+
+    # Document cache (govbrnews://news/{id}, similar_news references)
+    document_cache_ttl: int = 3600  # 1 hour
+    document_cache_max_entries: int = 2048
+    document_cache_max_bytes: int = 32 * 1024 * 1024  # 32 MiB
+
+    # Temporal counts of closed periods (past months/weeks barely change)
+    period_cache_ttl: int = 2592000  # 30 days (0 disables)
+    period_cache_max_entries: int = 100000
+    period_cache_max_bytes: int = 16 * 1024 * 1024  # 16 MiB
+    period_settle_seconds: int = 172800  # 2 days for ingest to catch up
+
+    # Schema introspection
+    schema_ttl: int = 3600  # 1 hour
+
+    # Resource snapshot (agencies, themes, stats)
+    snapshot_refresh_interval: int = 600  # 10 minutes
+
+    # Content similarity (similar_news)
+    similarity_index_path: str | None = None  # on-disk corpus TF-IDF index (None: candidates only)
+    similarity_candidates: int = 200  # candidates reranked per reference (max 250 from Typesense)
+    similarity_window_days: int = 730  # Typesense candidates published within ± days (0: any date)
+    duplicate_index_path: str | None = None  # on-disk MinHash index (None: candidates only)
+    duplicate_threshold: float = 0.8  # estimated Jaccard of near-duplicate releases
+    vector_index_path: str | None = None  # on-disk embedding index (None: no semantic search)
+    vector_nprobe: int = 8  # IVF lists compared per semantic query
+
+    # Transport: "stdio" (one client per process) or "streamable-http"
+    transport: Literal["stdio", "streamable-http"] = "stdio"
+
+    # Streamable HTTP serving
+    http_host: str = "127.0.0.1"
+    http_port: int = 8000
+    http_path: str = "/mcp"
+    http_workers: int = 1  # each worker has its own connection pool and caches
+    http_stateless: bool = False  # always stateless with more than one worker
+    http_keepalive_timeout: int = 75  # seconds, above typical proxy idle timeouts
+    http_graceful_shutdown_timeout: int = 30  # seconds to drain in-flight requests
+    http_allowed_hosts: list[str] = []  # Host headers accepted (empty: loopback and HTTP_HOST)
+    http_allowed_origins: list[str] = []  # Origin headers accepted (empty: the allowed hosts)
 
     # Logging
     log_level: str = "INFO"
@@ -26,5 +76,33 @@ class Settings(BaseSettings):
     )
 
 
-# Singleton instance
-settings = Settings()
+_settings: Settings | None = None
+
+
+def get_settings() -> Settings:
+    """
+    Get the application settings, loading them on first use.
+
+    Settings are read from the environment lazily so that importing the
+    package never requires TYPESENSE_API_KEY or touches the `.env` file.
+
+    Returns:
+        Settings instance
+    """
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def reset_settings() -> None:
+    """Drop the loaded settings so the next access re-reads the environment."""
+    global _settings
+    _settings = None
+
+
+def __getattr__(name: str) -> Any:
+    # Backward compatibility: `from govbrnews_mcp.config import settings`
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,7 @@ Resources do servidor MCP GovBRNews.
 
 from .agencies import format_agencies, get_agencies
 from .news import format_news, get_news_by_id
+from .snapshot import ResourceSnapshot, get_resource_snapshot
 from .stats import format_stats, get_stats
 from .themes import format_themes, get_themes
 
@@ -16,4 +17,6 @@ __all__ = [
     "format_themes",
     "get_news_by_id",
     "format_news",
+    "ResourceSnapshot",
+    "get_resource_snapshot",
 ]
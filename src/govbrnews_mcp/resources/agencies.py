@@ -5,24 +5,25 @@ Resource para lista de agências do dataset GovBRNews.
 import logging
 from typing import Any
 
-from ..typesense_client import get_typesense_client
+from ..typesense_client import get_async_typesense_client
+from ..utils.formatters import format_snapshot_info
 
 logger = logging.getLogger(__name__)
 
 
-def get_agencies() -> dict[str, Any]:
+async def get_agencies() -> dict[str, Any]:
     """
     Obtém lista completa de agências com contagens.
 
     Returns:
         Dicionário com lista de agências e contagens
     """
-    client = get_typesense_client()
+    client = get_async_typesense_client()
 
     agencies = []
     try:
         # Usar facets para obter todas as agências
-        facet_result = client.client.collections["news"].documents.search({
+        facet_result = await client.search("news", {
             "q": "*",
             "query_by": "title",
             "facet_by": "agency",
@@ -82,4 +83,7 @@ def format_agencies(agencies_data: dict[str, Any]) -> str:
             count = agency_info["count"]
             lines.append(f"- **{agency}:** {count:,} notícias")
 
+    if snapshot_info := format_snapshot_info(agencies_data.get("snapshot")):
+        lines.append(snapshot_info)
+
     return "\n".join(lines)
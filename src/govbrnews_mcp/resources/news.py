@@ -5,13 +5,13 @@ Resource para notícia individual do dataset GovBRNews.
 import logging
 from typing import Any
 
-from ..typesense_client import get_typesense_client
+from ..typesense_client import get_async_typesense_client
 from ..utils.formatters import format_timestamp
 
 logger = logging.getLogger(__name__)
 
 
-def get_news_by_id(news_id: str) -> dict[str, Any]:
+async def get_news_by_id(news_id: str) -> dict[str, Any]:
     """
     Obtém notícia individual completa por ID.
 
@@ -21,10 +21,10 @@ def get_news_by_id(news_id: str) -> dict[str, Any]:
     Returns:
         Dicionário com dados completos da notícia
     """
-    client = get_typesense_client()
+    client = get_async_typesense_client()
 
     try:
-        document = client.get_document("news", news_id)
+        document = await client.get_document("news", news_id)
 
         if not document:
             return {
@@ -0,0 +1,190 @@
+"""
+Snapshot em memória dos resources agregados (agências, temas e estatísticas).
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ..config import get_settings
+from ..typesense_client import get_async_typesense_client
+from .agencies import get_agencies
+from .stats import get_stats
+from .themes import get_themes
+
+logger = logging.getLogger(__name__)
+
+# Resources mantidos no snapshot e as funções que os calculam
+SNAPSHOT_RESOURCES: dict[str, Callable[[], Awaitable[dict[str, Any]]]] = {
+    "agencies": get_agencies,
+    "themes": get_themes,
+    "stats": get_stats,
+}
+
+
+class ResourceSnapshot:
+    """
+    Snapshot dos resources agregados, atualizado em segundo plano.
+
+    Os dados só mudam quando o pipeline de ingestão adiciona documentos, então
+    as leituras são servidas da memória. A cada `refresh_interval` segundos o
+    snapshot compara o `num_documents` da coleção com o valor da última
+    atualização (watermark) e só recalcula os resources se ele mudou.
+
+    Leituras de um snapshot vencido retornam os dados atuais imediatamente e
+    disparam uma atualização em segundo plano (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float | None = None,
+        timer: Callable[[], float] = time.time,
+    ):
+        """
+        Inicializa um snapshot vazio.
+
+        Args:
+            refresh_interval: Segundos entre atualizações
+                              (padrão: settings.snapshot_refresh_interval)
+            timer: Relógio usado para calcular a idade (para testes)
+        """
+        self.refresh_interval = (
+            get_settings().snapshot_refresh_interval if refresh_interval is None else refresh_interval
+        )
+        self.num_documents: int | None = None
+        self.computed_at: float | None = None
+        self.checked_at: float | None = None
+        self._timer = timer
+        self._data: dict[str, dict[str, Any]] = {}
+        self._refresh_task: asyncio.Task | None = None
+        self._loop_task: asyncio.Task | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Se o snapshot passou do intervalo de atualização."""
+        return self.checked_at is None or self._timer() - self.checked_at >= self.refresh_interval
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Atualiza o snapshot se a coleção mudou desde a última atualização.
+
+        Chamadas concorrentes compartilham a mesma atualização.
+
+        Args:
+            force: Recalcular mesmo se o watermark não mudou
+
+        Returns:
+            True se os resources foram recalculados
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh(force))
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self, force: bool) -> bool:
+        """Executa a atualização (ver refresh)."""
+        client = get_async_typesense_client()
+
+        try:
+            collection_info = await client.get_collection_info("news")
+            num_documents = collection_info.get("num_documents")
+        except Exception as e:
+            logger.warning(f"Snapshot watermark check failed: {e}")
+            num_documents = None
+
+        if (
+            not force
+            and num_documents is not None
+            and num_documents == self.num_documents
+            and len(self._data) == len(SNAPSHOT_RESOURCES)
+        ):
+            self.checked_at = self._timer()
+            logger.debug(f"Snapshot unchanged (num_documents={num_documents})")
+            return False
+
+        names = list(SNAPSHOT_RESOURCES)
+        results = await asyncio.gather(
+            *(SNAPSHOT_RESOURCES[name]() for name in names), return_exceptions=True
+        )
+
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException) or "error" in result:
+                # Manter a versão anterior do resource, se houver
+                logger.warning(f"Snapshot refresh failed for '{name}': {result}")
+                self._data.setdefault(name, result if isinstance(result, dict) else {
+                    "error": f"Não foi possível calcular o resource '{name}'"
+                })
+                continue
+            self._data[name] = result
+
+        self.num_documents = num_documents
+        self.computed_at = self.checked_at = self._timer()
+        logger.info(f"Snapshot refreshed (num_documents={num_documents})")
+        return True
+
+    async def get(self, name: str) -> dict[str, Any]:
+        """
+        Obtém um resource do snapshot.
+
+        Args:
+            name: Nome do resource ("agencies", "themes" ou "stats")
+
+        Returns:
+            Dados do resource com a chave `snapshot` contendo idade
+            (`age_seconds`) e watermark (`num_documents`)
+        """
+        if name not in self._data or "error" in self._data[name]:
+            await self.refresh(force=name in self._data)
+        elif self.is_stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.ensure_future(self._refresh(False))
+
+        return {
+            **self._data[name],
+            "snapshot": {
+                "age_seconds": round(self._timer() - self.computed_at, 1),
+                "num_documents": self.num_documents,
+            },
+        }
+
+    async def _run(self) -> None:
+        """Loop de atualização periódica."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Snapshot refresh loop error: {e}", exc_info=True)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """Inicia a atualização periódica em segundo plano."""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Interrompe a atualização periódica."""
+        for task in (self._loop_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = None
+        self._refresh_task = None
+
+
+_snapshot: ResourceSnapshot | None = None
+
+
+def get_resource_snapshot() -> ResourceSnapshot:
+    """
+    Obtém a instância compartilhada do snapshot.
+
+    Returns:
+        ResourceSnapshot instance
+    """
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = ResourceSnapshot()
+    return _snapshot
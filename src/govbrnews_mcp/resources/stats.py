@@ -2,27 +2,77 @@
 Resource para estatísticas gerais do dataset GovBRNews.
 """
 
+import asyncio
 import logging
+import time
+from collections.abc import Awaitable
 from typing import Any
 
-from ..typesense_client import get_typesense_client
-from ..utils.formatters import format_timestamp
+from ..typesense_client import get_async_typesense_client
+from ..utils.formatters import format_snapshot_info, format_timestamp
 
 logger = logging.getLogger(__name__)
 
 
-def get_stats() -> dict[str, Any]:
+async def get_stats() -> dict[str, Any]:
     """
     Obtém estatísticas gerais do dataset.
 
+    Usa no máximo dois round-trips ao Typesense, executados em paralelo:
+    metadados da coleção e um multi_search com as facets (ano e agência) e
+    as notícias mais antiga e mais recente.
+
     Returns:
-        Dicionário com estatísticas do dataset
+        Dicionário com estatísticas do dataset e latência de cada seção
+        (em `timings_ms`)
     """
-    client = get_typesense_client()
+    client = get_async_typesense_client()
 
-    # Obter informações da coleção
-    collection_info = client.get_collection_info("news")
+    searches = [
+        {  # Distribuição por ano e top agências em uma única query
+            "collection": "news",
+            "q": "*",
+            "query_by": "title",
+            "facet_by": "published_year,agency",
+            "per_page": 0,
+            "max_facet_values": 20
+        },
+        {  # Notícia mais antiga
+            "collection": "news",
+            "q": "*",
+            "query_by": "title",
+            "sort_by": "published_at:asc",
+            "include_fields": "published_at",
+            "per_page": 1
+        },
+        {  # Notícia mais recente
+            "collection": "news",
+            "q": "*",
+            "query_by": "title",
+            "sort_by": "published_at:desc",
+            "include_fields": "published_at",
+            "per_page": 1
+        }
+    ]
+
+    # Os dois round-trips são independentes: executar em paralelo
+    collection_outcome, search_outcome = await asyncio.gather(
+        _timed(client.get_collection_info("news")),
+        _timed(client.multi_search(searches)),
+        return_exceptions=True
+    )
 
+    if isinstance(collection_outcome, BaseException):
+        raise collection_outcome
+    collection_info, collection_ms = collection_outcome
+
+    if isinstance(search_outcome, BaseException):
+        logger.warning(f"Failed to get stats sections: {search_outcome}")
+        error = {"error": str(search_outcome)}
+        search_outcome = ([error, error, error], None)
+    multi_results, multi_search_ms = search_outcome
+
+    # Obter informações da coleção
     if not collection_info:
         logger.error("Failed to get collection info")
         return {
@@ -31,94 +81,61 @@ def get_stats() -> dict[str, Any]:
         }
 
     total_docs = collection_info.get("num_documents", 0)
+    facet_result, oldest_result, newest_result = multi_results
 
-    # Buscar distribuição por ano (últimos 10 anos visíveis)
+    # Distribuição por ano (últimos 10 anos visíveis) e top 5 agências
     year_distribution = {}
-    try:
-        # Usar facets para obter distribuição por ano
-        facet_result = client.client.collections["news"].documents.search({
-            "q": "*",
-            "query_by": "title",
-            "facet_by": "published_year",
-            "per_page": 0,
-            "max_facet_values": 20
-        })
-
-        if "facet_counts" in facet_result:
-            for facet in facet_result["facet_counts"]:
-                if facet["field_name"] == "published_year":
-                    for count in facet["counts"]:
-                        year_distribution[count["value"]] = count["count"]
-    except Exception as e:
-        logger.warning(f"Failed to get year distribution: {e}")
-        year_distribution = {}
-
-    # Buscar top 5 agências
     top_agencies = []
-    try:
-        facet_result = client.client.collections["news"].documents.search({
-            "q": "*",
-            "query_by": "title",
-            "facet_by": "agency",
-            "per_page": 0,
-            "max_facet_values": 5
-        })
-
-        if "facet_counts" in facet_result:
-            for facet in facet_result["facet_counts"]:
-                if facet["field_name"] == "agency":
-                    top_agencies = [
-                        {"agency": count["value"], "count": count["count"]}
-                        for count in facet["counts"][:5]
-                    ]
-    except Exception as e:
-        logger.warning(f"Failed to get top agencies: {e}")
-        top_agencies = []
-
-    # Buscar período de cobertura
-    coverage_period = {}
-    try:
-        # Buscar notícia mais antiga
-        oldest_result = client.search("news", {
-            "q": "*",
-            "query_by": "title",
-            "sort_by": "published_at:asc",
-            "per_page": 1
-        })
+    if "error" in facet_result:
+        logger.warning(f"Failed to get year/agency distribution: {facet_result['error']}")
+    else:
+        for facet in facet_result.get("facet_counts", []):
+            if facet["field_name"] == "published_year":
+                for count in facet["counts"]:
+                    year_distribution[count["value"]] = count["count"]
+            elif facet["field_name"] == "agency":
+                top_agencies = [
+                    {"agency": count["value"], "count": count["count"]}
+                    for count in facet["counts"][:5]
+                ]
 
-        # Buscar notícia mais recente
-        newest_result = client.search("news", {
-            "q": "*",
-            "query_by": "title",
-            "sort_by": "published_at:desc",
-            "per_page": 1
-        })
-
-        if oldest_result.get("found", 0) > 0:
-            oldest_doc = oldest_result["hits"][0]["document"]
-            coverage_period["start_date"] = oldest_doc.get("published_at")
-            coverage_period["start_date_formatted"] = format_timestamp(
-                oldest_doc.get("published_at")
-            )
-
-        if newest_result.get("found", 0) > 0:
-            newest_doc = newest_result["hits"][0]["document"]
-            coverage_period["end_date"] = newest_doc.get("published_at")
-            coverage_period["end_date_formatted"] = format_timestamp(
-                newest_doc.get("published_at")
-            )
-    except Exception as e:
-        logger.warning(f"Failed to get coverage period: {e}")
-        coverage_period = {}
+    # Período de cobertura
+    coverage_period = {}
+    for key, result in (("start", oldest_result), ("end", newest_result)):
+        if "error" in result:
+            logger.warning(f"Failed to get coverage period {key}: {result['error']}")
+            continue
+
+        if result.get("found", 0) > 0:
+            doc = result["hits"][0]["document"]
+            coverage_period[f"{key}_date"] = doc.get("published_at")
+            coverage_period[f"{key}_date_formatted"] = format_timestamp(doc.get("published_at"))
+
+    timings_ms = {
+        "collection_info": collection_ms,
+        "multi_search": multi_search_ms,
+        "facets": facet_result.get("search_time_ms"),
+        "coverage_start": oldest_result.get("search_time_ms"),
+        "coverage_end": newest_result.get("search_time_ms"),
+    }
+    logger.info(f"Stats computed: {timings_ms}")
 
     return {
         "total_documents": total_docs,
         "year_distribution": year_distribution,
         "top_agencies": top_agencies,
-        "coverage_period": coverage_period
+        "coverage_period": coverage_period,
+        "timings_ms": timings_ms
     }
 
 
+async def _timed(awaitable: Awaitable[Any]) -> tuple[Any, float]:
+    """Aguarda uma chamada e retorna (resultado, latência em ms)."""
+    start = time.perf_counter()
+    result = await awaitable
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
 def format_stats(stats: dict[str, Any]) -> str:
     """
     Formata estatísticas em Markdown.
@@ -165,4 +182,7 @@ def format_stats(stats: dict[str, Any]) -> str:
             lines.append(f"{i}. **{agency}:** {count:,} notícias")
         lines.append("")
 
+    if snapshot_info := format_snapshot_info(stats.get("snapshot")):
+        lines.append(snapshot_info)
+
     return "\n".join(lines)
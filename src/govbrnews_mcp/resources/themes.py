@@ -5,24 +5,25 @@ Resource para taxonomia de temas do dataset GovBRNews.
 import logging
 from typing import Any
 
-from ..typesense_client import get_typesense_client
+from ..typesense_client import get_async_typesense_client
+from ..utils.formatters import format_snapshot_info
 
 logger = logging.getLogger(__name__)
 
 
-def get_themes() -> dict[str, Any]:
+async def get_themes() -> dict[str, Any]:
     """
     Obtém taxonomia completa de temas com contagens.
 
     Returns:
         Dicionário com lista de temas e contagens
     """
-    client = get_typesense_client()
+    client = get_async_typesense_client()
 
     themes = []
     try:
         # Usar facets para obter todos os temas
-        facet_result = client.client.collections["news"].documents.search({
+        facet_result = await client.search("news", {
             "q": "*",
             "query_by": "title",
             "facet_by": "theme_1_level_1",
@@ -82,4 +83,7 @@ def format_themes(themes_data: dict[str, Any]) -> str:
             count = theme_info["count"]
             lines.append(f"- **{theme}:** {count:,} notícias")
 
+    if snapshot_info := format_snapshot_info(themes_data.get("snapshot")):
+        lines.append(snapshot_info)
+
     return "\n".join(lines)
@@ -0,0 +1,138 @@
+"""Collection schema introspection for GovBRNews MCP Server."""
+
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .config import get_settings
+from .typesense_client import get_async_typesense_client
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionSchema:
+    """
+    Cached view of a Typesense collection's fields and their capabilities.
+
+    The schema is loaded once through `get_collection_info` and refreshed
+    when it is older than `ttl` seconds or after `invalidate()` (e.g. when a
+    query relying on a field fails). If a refresh fails, the previous schema
+    keeps being used until the next attempt.
+    """
+
+    def __init__(
+        self,
+        collection: str = "news",
+        ttl: float | None = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize an empty schema.
+
+        Args:
+            collection: Collection name
+            ttl: Seconds before the schema is reloaded (default: settings.schema_ttl)
+            timer: Clock used for expiration (for tests)
+        """
+        self.collection = collection
+        self.ttl = get_settings().schema_ttl if ttl is None else ttl
+        self.num_documents: int | None = None
+        self._timer = timer
+        self._fields: dict[str, dict[str, Any]] | None = None
+        self._loaded_at: float | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the schema must be (re)loaded before use."""
+        return self._loaded_at is None or self._timer() - self._loaded_at >= self.ttl
+
+    def update(self, collection_info: dict[str, Any]) -> None:
+        """
+        Replace the cached schema with a collection info response.
+
+        Args:
+            collection_info: Response of `get_collection_info`
+        """
+        self._fields = {field["name"]: field for field in collection_info.get("fields", [])}
+        self.num_documents = collection_info.get("num_documents")
+        self._loaded_at = self._timer()
+        logger.debug(f"Schema for '{self.collection}' loaded with {len(self._fields)} fields")
+
+    def invalidate(self) -> None:
+        """Force a reload on the next capability check."""
+        self._loaded_at = None
+
+    async def get_fields(self) -> dict[str, dict[str, Any]] | None:
+        """
+        Get the collection fields, loading them if stale.
+
+        Returns:
+            Dictionary of field definitions by name, or None if the schema
+            has never been loaded successfully
+        """
+        if self.is_stale:
+            try:
+                client = get_async_typesense_client()
+                self.update(await client.get_collection_info(self.collection))
+            except Exception as e:
+                logger.warning(f"Failed to load schema for '{self.collection}': {e}")
+                # Retry on the next check instead of waiting for the TTL
+                self._loaded_at = None
+
+        return self._fields
+
+    async def has_field(self, name: str, default: bool = False) -> bool:
+        """
+        Check whether the collection defines a field.
+
+        Args:
+            name: Field name
+            default: Answer to use when the schema is unavailable
+
+        Returns:
+            True if the field exists
+        """
+        fields = await self.get_fields()
+        if fields is None:
+            return default
+        return name in fields
+
+    async def is_facetable(self, name: str, default: bool = False) -> bool:
+        """
+        Check whether a field exists and can be used in `facet_by`.
+
+        Args:
+            name: Field name
+            default: Answer to use when the schema is unavailable
+
+        Returns:
+            True if the field is facetable
+        """
+        fields = await self.get_fields()
+        if fields is None:
+            return default
+        return bool(fields.get(name, {}).get("facet", False))
+
+
+_schemas: dict[str, CollectionSchema] = {}
+
+
+def get_collection_schema(collection: str = "news") -> CollectionSchema:
+    """
+    Get the shared schema instance for a collection.
+
+    Args:
+        collection: Collection name
+
+    Returns:
+        CollectionSchema instance
+    """
+    if collection not in _schemas:
+        _schemas[collection] = CollectionSchema(collection)
+    return _schemas[collection]
+
+
+def reset_collection_schemas() -> None:
+    """Drop every cached schema (mainly for tests)."""
+    _schemas.clear()
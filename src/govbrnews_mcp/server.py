@@ -1,32 +1,90 @@
 """FastMCP server for GovBRNews."""
 
 import logging
-from mcp.server.fastmcp import FastMCP
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from .tools import search_news, get_facets, similar_news, analyze_temporal
+from mcp.server.fastmcp import FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
+from starlette.applications import Starlette
+
+from .tools import (
+    search_news,
+    get_facets,
+    similar_news,
+    similar_news_batch,
+    find_duplicates,
+    analyze_temporal,
+    analyze_temporal_multi,
+    theme_report,
+    compare_agencies_data,
+    get_pivot,
+)
 from .resources import (
-    get_stats,
     format_stats,
-    get_agencies,
     format_agencies,
-    get_themes,
     format_themes,
     get_news_by_id,
     format_news,
+    get_resource_snapshot,
 )
-from .config import settings
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+from .config import Settings, get_settings
+from .typesense_client import reset_typesense_clients
 
 logger = logging.getLogger(__name__)
 
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# Bind addresses that are not a name clients can send in the Host header
+WILDCARD_HOSTS = ("0.0.0.0", "::")
+
+
+def configure_logging() -> None:
+    """Configure logging from settings (called at startup, not at import)."""
+    logging.basicConfig(
+        level=getattr(logging, get_settings().log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+
+# Number of active holders of the process-wide resources (see server_resources)
+_resource_holders = 0
+
+
+@asynccontextmanager
+async def server_resources() -> AsyncIterator[None]:
+    """
+    Keep the process-wide resources alive: the resource snapshot refresher
+    and the pooled Typesense connections.
+
+    Nested entries share the same resources; they are released when the
+    outermost holder exits. Over HTTP the application lifespan is the
+    outermost holder, so per-session lifespans never tear them down.
+    """
+    global _resource_holders
+    _resource_holders += 1
+    if _resource_holders == 1:
+        get_resource_snapshot().start()
+    try:
+        yield
+    finally:
+        _resource_holders -= 1
+        if _resource_holders == 0:
+            await get_resource_snapshot().stop()
+            await reset_typesense_clients()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """MCP server lifespan (once per stdio run, once per HTTP session)."""
+    async with server_resources():
+        yield
+
+
 # Initialize FastMCP server
 mcp = FastMCP(
     name="GovBRNews",
+    lifespan=lifespan,
 )
 
 logger.info("Initializing GovBRNews MCP Server")
@@ -35,41 +93,51 @@ logger.info("Initializing GovBRNews MCP Server")
 mcp.tool()(search_news)
 mcp.tool()(get_facets)
 mcp.tool()(similar_news)
+mcp.tool()(similar_news_batch)
+mcp.tool()(find_duplicates)
 mcp.tool()(analyze_temporal)
-
-logger.info("Registered tools: search_news, get_facets, similar_news, analyze_temporal")
+mcp.tool()(analyze_temporal_multi)
+mcp.tool()(theme_report)
+mcp.tool()(compare_agencies_data)
+mcp.tool()(get_pivot)
+
+logger.info(
+    "Registered tools: search_news, get_facets, similar_news, similar_news_batch, "
+    "find_duplicates, analyze_temporal, analyze_temporal_multi, theme_report, "
+    "compare_agencies_data, get_pivot"
+)
 
 # Register resources using FastMCP decorators
 @mcp.resource("govbrnews://stats")
-def stats_resource() -> str:
+async def stats_resource() -> str:
     """Estatísticas gerais do dataset GovBRNews."""
-    stats = get_stats()
+    stats = await get_resource_snapshot().get("stats")
     return format_stats(stats)
 
 
 @mcp.resource("govbrnews://agencies")
-def agencies_resource() -> str:
+async def agencies_resource() -> str:
     """Lista completa de agências governamentais com contagens."""
-    agencies = get_agencies()
+    agencies = await get_resource_snapshot().get("agencies")
     return format_agencies(agencies)
 
 
 @mcp.resource("govbrnews://themes")
-def themes_resource() -> str:
+async def themes_resource() -> str:
     """Taxonomia completa de temas com contagens."""
-    themes = get_themes()
+    themes = await get_resource_snapshot().get("themes")
     return format_themes(themes)
 
 
 @mcp.resource("govbrnews://news/{news_id}")
-def news_resource(news_id: str) -> str:
+async def news_resource(news_id: str) -> str:
     """
     Notícia individual completa.
 
     Args:
         news_id: ID da notícia no Typesense
     """
-    news = get_news_by_id(news_id)
+    news = await get_news_by_id(news_id)
     return format_news(news)
 
 
@@ -107,6 +175,11 @@ def analyze_theme(theme: str) -> list[dict]:
                 "type": "text",
                 "text": f"""Realize uma análise completa e detalhada sobre o tema: **{theme}**
 
+Comece chamando `theme_report` com o tema "{theme}": ele executa de uma só vez
+as consultas das seções 1 a 5 abaixo (volume, evolução mensal e semanal, agências,
+temas relacionados e notícias mais relevantes). Use as ferramentas individuais
+apenas para aprofundar algum ponto.
+
 Siga este roteiro de análise:
 
 ## 1. Visão Geral
@@ -176,6 +249,11 @@ def compare_agencies(agencies: list[str], theme: str = "*") -> list[dict]:
                 "type": "text",
                 "text": f"""Realize uma comparação detalhada entre as agências: **{agencies_str}**{theme_filter}
 
+Comece chamando `compare_agencies_data` com as agências ({agencies_str}){theme_filter}:
+ele executa de uma só vez as consultas das seções 1 a 3 abaixo e devolve tabelas
+alinhadas com uma coluna por agência. Use as ferramentas individuais apenas para
+aprofundar algum ponto.
+
 Siga este roteiro de análise comparativa:
 
 ## 1. Volumes Globais
@@ -355,6 +433,7 @@ Siga este roteiro de descoberta contextual:
 - Analise as 5-10 notícias mais similares
 - Identifique: mesma agência? mesmo tema? mesmo período?
 - Há uma narrativa conectando essas notícias?
+- Para expandir a vizinhança, use `similar_news_batch` com os IDs dessas notícias (uma única chamada)
 
 ## 3. Contexto Temporal
 - Com base na data da notícia, use `search_news` para buscar notícias sobre o mesmo tema:
@@ -403,15 +482,107 @@ Siga este roteiro de descoberta contextual:
 logger.info("Registered prompts: analyze_theme, compare_agencies, temporal_evolution, discover_context")
 
 
+def transport_security_settings(settings: Settings) -> TransportSecuritySettings:
+    """
+    Build the DNS rebinding protection for the HTTP transport.
+
+    Protection is always on. Without `http_allowed_hosts`, the loopback
+    names and `http_host` (any port) are accepted; deployments behind a
+    proxy or bound to a wildcard address list their public names there.
+
+    Returns:
+        Host/Origin validation settings for FastMCP
+    """
+    hosts = list(settings.http_allowed_hosts)
+    if not hosts:
+        names = ["127.0.0.1", "localhost", "[::1]"]
+        if settings.http_host not in LOOPBACK_HOSTS + WILDCARD_HOSTS:
+            names.append(settings.http_host)
+        hosts = [f"{name}:*" for name in names]
+        if settings.http_host in WILDCARD_HOSTS:
+            logger.warning(
+                f"HTTP server bound to {settings.http_host} without HTTP_ALLOWED_HOSTS: "
+                "only loopback Host headers are accepted"
+            )
+
+    origins = list(settings.http_allowed_origins) or [
+        f"{scheme}://{host}" for host in hosts for scheme in ("http", "https")
+    ]
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=hosts,
+        allowed_origins=origins,
+    )
+
+
+def create_http_app() -> Starlette:
+    """
+    Build the streamable HTTP application (one per worker process).
+
+    Used by uvicorn as an application factory, so each worker builds its own
+    app, Typesense connection pool and caches.
+
+    Returns:
+        Starlette application serving MCP at `settings.http_path`
+    """
+    configure_logging()
+    settings = get_settings()
+
+    mcp.settings.host = settings.http_host
+    mcp.settings.port = settings.http_port
+    mcp.settings.streamable_http_path = settings.http_path
+    # Sessions live in the memory of one worker: with several workers any of
+    # them may receive the next request, so every request must stand alone
+    mcp.settings.stateless_http = settings.http_stateless or settings.http_workers > 1
+    mcp.settings.transport_security = transport_security_settings(settings)
+
+    app = mcp.streamable_http_app()
+    session_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def app_lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with server_resources(), session_lifespan(app):
+            yield
+
+    app.router.lifespan_context = app_lifespan
+    return app
+
+
+def run_http() -> None:
+    """Serve MCP over streamable HTTP with uvicorn."""
+    import uvicorn
+
+    settings = get_settings()
+    logger.info(
+        f"Serving streamable HTTP on http://{settings.http_host}:{settings.http_port}"
+        f"{settings.http_path} ({settings.http_workers} worker(s))"
+    )
+    uvicorn.run(
+        "govbrnews_mcp.server:create_http_app",
+        factory=True,
+        host=settings.http_host,
+        port=settings.http_port,
+        workers=settings.http_workers,
+        timeout_keep_alive=settings.http_keepalive_timeout,
+        timeout_graceful_shutdown=settings.http_graceful_shutdown_timeout,
+        log_level=settings.log_level.lower(),
+    )
+
+
 def main():
     """Entry point for the MCP server."""
+    configure_logging()
+    settings = get_settings()
     logger.info("Starting GovBRNews MCP Server...")
     logger.info(f"Typesense endpoint: {settings.typesense_protocol}://"
                 f"{settings.typesense_host}:{settings.typesense_port}")
 
     try:
-        # Run the FastMCP server
-        mcp.run()
+        if settings.transport == "streamable-http":
+            run_http()
+        else:
+            # Run the FastMCP server over stdio
+            mcp.run()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -0,0 +1,135 @@
+"""
+Similaridade de conteúdo entre notícias, calculada no próprio processo.
+"""
+
+import logging
+from pathlib import Path
+
+from ..config import get_settings
+from .minhash import MinHashIndex, cluster_duplicates, duplicate_text, minhash_signature
+from .storage import index_version
+from .text import document_text, reference_keywords, tokenize
+from .tfidf import TfidfIndex
+from .vectors import VectorIndex, embed_text, embed_texts
+
+logger = logging.getLogger(__name__)
+
+# None: ainda não carregado; False: não configurado ou indisponível
+_similarity_index: TfidfIndex | bool | None = None
+_duplicate_index: MinHashIndex | bool | None = None
+_vector_index: VectorIndex | bool | None = None
+# Gravação do índice em disco que está carregada (ver storage.index_version)
+_similarity_version: tuple[int, int] | None = None
+_duplicate_version: tuple[int, int] | None = None
+_vector_version: tuple[int, int] | None = None
+
+
+def get_similarity_index() -> TfidfIndex | None:
+    """
+    Obtém o índice TF-IDF do corpus salvo em `similarity_index_path`.
+
+    O índice é aberto com memory-map na primeira chamada e reaberto quando
+    uma nova versão é gravada no mesmo diretório. Sem índice
+    configurado (ou se ele não puder ser lido), retorna None e as buscas
+    por similaridade usam apenas candidatos do Typesense.
+
+    Returns:
+        TfidfIndex ou None
+    """
+    global _similarity_index, _similarity_version
+    path = get_settings().similarity_index_path
+    version = index_version(path) if path else None
+    if _similarity_index is None or version != _similarity_version:
+        _similarity_index = False
+        _similarity_version = version
+        if path:
+            try:
+                _similarity_index = TfidfIndex.load(Path(path))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load similarity index from {path}: {e}")
+
+    return _similarity_index or None
+
+
+def get_duplicate_index() -> MinHashIndex | None:
+    """
+    Obtém o índice MinHash de quase-duplicatas salvo em `duplicate_index_path`.
+
+    Sem índice configurado (ou se ele não puder ser lido), retorna None e a
+    detecção de duplicatas compara apenas candidatos do Typesense. Quando
+    `update_duplicate_index` grava uma nova versão, o índice é reaberto.
+
+    Returns:
+        MinHashIndex ou None
+    """
+    global _duplicate_index, _duplicate_version
+    path = get_settings().duplicate_index_path
+    version = index_version(path) if path else None
+    if _duplicate_index is None or version != _duplicate_version:
+        _duplicate_index = False
+        _duplicate_version = version
+        if path:
+            try:
+                _duplicate_index = MinHashIndex.load(Path(path))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load duplicate index from {path}: {e}")
+
+    # Índice vazio também é válido (len() == 0 não significa indisponível)
+    return _duplicate_index if _duplicate_index is not False else None
+
+
+def get_vector_index() -> VectorIndex | None:
+    """
+    Obtém o índice de embeddings salvo em `vector_index_path`.
+
+    Sem índice configurado (ou se ele não puder ser lido), retorna None e a
+    busca semântica fica indisponível. Uma reconstrução gravada no mesmo
+    diretório (inclusive com outro `nlist`) é reaberta no acesso seguinte.
+
+    Returns:
+        VectorIndex ou None
+    """
+    global _vector_index, _vector_version
+    path = get_settings().vector_index_path
+    version = index_version(path) if path else None
+    if _vector_index is None or version != _vector_version:
+        _vector_index = False
+        _vector_version = version
+        if path:
+            try:
+                _vector_index = VectorIndex.load(Path(path))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load vector index from {path}: {e}")
+
+    return _vector_index if _vector_index is not False else None
+
+
+def reset_similarity_index() -> None:
+    """Descarta os índices carregados (o próximo acesso relê o disco)."""
+    global _similarity_index, _duplicate_index, _vector_index
+    global _similarity_version, _duplicate_version, _vector_version
+    _similarity_index = None
+    _similarity_version = None
+    _duplicate_index = None
+    _duplicate_version = None
+    _vector_index = None
+    _vector_version = None
+
+
+__all__ = [
+    "TfidfIndex",
+    "MinHashIndex",
+    "VectorIndex",
+    "cluster_duplicates",
+    "document_text",
+    "duplicate_text",
+    "embed_text",
+    "embed_texts",
+    "minhash_signature",
+    "reference_keywords",
+    "tokenize",
+    "get_similarity_index",
+    "get_duplicate_index",
+    "get_vector_index",
+    "reset_similarity_index",
+]
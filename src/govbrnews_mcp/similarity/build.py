@@ -0,0 +1,196 @@
+"""
+Construção dos índices locais de similaridade a partir do Typesense.
+
+Uso:
+    govbrnews-mcp-build-index [diretório]         # TF-IDF (reconstrução completa)
+    govbrnews-mcp-update-duplicates [diretório]   # MinHash (incremental)
+    govbrnews-mcp-build-vectors [diretório]       # Embeddings (reconstrução completa)
+
+Sem diretório, usam `similarity_index_path`, `duplicate_index_path` e
+`vector_index_path` das configurações.
+"""
+
+import asyncio
+import logging
+import queue
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ..config import get_settings
+from ..typesense_client import get_async_typesense_client, reset_typesense_clients
+from .minhash import MinHashIndex
+from .text import document_text
+from .tfidf import TfidfIndex
+from .vectors import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+# Campos exportados para indexação
+EXPORT_FIELDS = "id,title,content"
+
+# Campos exportados para o índice de duplicatas
+DUPLICATE_EXPORT_FIELDS = "id,title,content,published_at"
+
+# Documentos exportados que podem aguardar a tokenização
+EXPORT_BUFFER = 1000
+
+T = TypeVar("T")
+
+
+async def build_corpus_index(directory: str | Path) -> TfidfIndex:
+    """
+    Exporta todas as notícias e salva o índice TF-IDF em disco.
+
+    A exportação (rede) e a tokenização (CPU) rodam em paralelo: os
+    documentos passam por uma fila limitada, sem carregar o corpus inteiro
+    na memória.
+
+    Args:
+        directory: Diretório de destino do índice
+
+    Returns:
+        Índice construído
+    """
+    started = time.perf_counter()
+    index = await _build_from_export(TfidfIndex.build)
+    index.save(directory)
+    logger.info(
+        f"Built similarity index with {len(index)} documents "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return index
+
+
+async def build_vector_index(directory: str | Path) -> VectorIndex:
+    """
+    Exporta todas as notícias e salva o índice de embeddings em disco.
+
+    Como em build_corpus_index(), exportação e cálculo dos embeddings rodam
+    em paralelo. Corpora grandes ganham um índice IVF (ver VectorIndex.build()).
+
+    Args:
+        directory: Diretório de destino do índice
+
+    Returns:
+        Índice construído
+    """
+    started = time.perf_counter()
+    index = await _build_from_export(VectorIndex.build)
+    index.save(directory)
+    logger.info(
+        f"Built vector index with {len(index)} documents and {index.nlist} lists "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return index
+
+
+async def _build_from_export(build: Callable[[Iterator[tuple[str, str]]], T]) -> T:
+    """
+    Constrói um índice com os pares (id, texto) de todas as notícias exportadas.
+
+    Os documentos passam por uma fila limitada até a construção, que roda
+    em outra thread enquanto a exportação continua.
+    """
+    client = get_async_typesense_client()
+    documents: queue.Queue = queue.Queue(maxsize=EXPORT_BUFFER)
+    done = object()
+
+    def consume() -> Iterator[tuple[str, str]]:
+        while (doc := documents.get()) is not done:
+            yield str(doc["id"]), document_text(doc)
+
+    loop = asyncio.get_running_loop()
+    built = loop.run_in_executor(None, lambda: build(consume()))
+
+    try:
+        async for doc in client.export_documents("news", include_fields=EXPORT_FIELDS):
+            await loop.run_in_executor(None, documents.put, doc)
+    finally:
+        await loop.run_in_executor(None, documents.put, done)
+
+    return await built
+
+
+async def update_duplicate_index(directory: str | Path) -> MinHashIndex:
+    """
+    Acrescenta ao índice MinHash as notícias publicadas desde a última atualização.
+
+    Na primeira execução (diretório sem índice), indexa o corpus inteiro.
+    Nas seguintes, exporta só as notícias a partir do watermark salvo menos
+    `period_settle_seconds`: o schema não tem data de ingestão, e notícias
+    ingeridas com atraso chegam com `published_at` anterior ao watermark.
+    IDs já indexados na janela reexportada são ignorados.
+
+    Args:
+        directory: Diretório do índice
+
+    Returns:
+        Índice atualizado
+    """
+    path = Path(directory)
+    try:
+        index = MinHashIndex.load(path, mmap=False)
+    except FileNotFoundError:
+        index = MinHashIndex()
+
+    filter_by = None
+    if index.watermark:
+        since = index.watermark - get_settings().period_settle_seconds
+        filter_by = f"published_at:>={since}"
+    client = get_async_typesense_client()
+    started = time.perf_counter()
+
+    added = 0
+    async for doc in client.export_documents(
+        "news", include_fields=DUPLICATE_EXPORT_FIELDS, filter_by=filter_by
+    ):
+        added += index.add_documents([doc])
+
+    index.save(path)
+    logger.info(
+        f"Added {added} documents to the duplicate index ({len(index)} total) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return index
+
+
+def _run_cli(build: Callable[[str], Awaitable[Any]], setting: str) -> None:
+    """Executa uma construção de índice pela linha de comando."""
+    logging.basicConfig(
+        level=getattr(logging, get_settings().log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else getattr(get_settings(), setting)
+    if not directory:
+        sys.exit(f"Informe o diretório do índice ou defina {setting.upper()}")
+
+    async def run() -> None:
+        try:
+            await build(directory)
+        finally:
+            await reset_typesense_clients()
+
+    asyncio.run(run())
+
+
+def main() -> None:
+    """Linha de comando: constrói o índice TF-IDF do corpus."""
+    _run_cli(build_corpus_index, "similarity_index_path")
+
+
+def main_duplicates() -> None:
+    """Linha de comando: atualiza o índice de quase-duplicatas."""
+    _run_cli(update_duplicate_index, "duplicate_index_path")
+
+
+def main_vectors() -> None:
+    """Linha de comando: constrói o índice de embeddings."""
+    _run_cli(build_vector_index, "vector_index_path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Candidatos do Typesense para comparação local com uma notícia de referência.
+"""
+
+import logging
+import re
+from typing import Any
+
+from ..typesense_client import MAX_PER_PAGE
+from ..utils.formatters import get_highlight_snippet
+from .rerank import SECONDS_PER_DAY
+from .text import reference_keywords
+
+logger = logging.getLogger(__name__)
+
+# Campos usados no reranqueamento (o conteúdo vem como trecho ou à parte)
+CANDIDATE_FIELDS = "id,title,agency,theme_1_level_1,published_at"
+
+# Tokens de cada lado do termo encontrado no trecho de conteúdo dos candidatos
+CANDIDATE_SNIPPET_TOKENS = 60
+
+HIGHLIGHT_TAGS = re.compile(r"</?mark>")
+
+
+async def search_candidates(
+    client,
+    reference_doc: dict[str, Any],
+    pool_size: int,
+    window_days: int | None = None,
+    full_content: bool = False
+) -> dict[str, dict[str, Any]]:
+    """
+    Busca notícias que compartilham termos com a notícia de referência.
+
+    A busca usa os termos do título; o Typesense descarta termos até reunir
+    `pool_size` candidatos. Para não transferir centenas de textos
+    completos, os candidatos trazem como `content` apenas um trecho em
+    torno dos termos encontrados (ou nada, se só o título coincidir);
+    `full_content` traz o conteúdo completo.
+
+    Com `window_days`, só entram notícias publicadas até essa quantidade de
+    dias antes ou depois da referência (se ela tiver data).
+
+    Args:
+        client: Cliente Typesense assíncrono
+        reference_doc: Notícia de referência
+        pool_size: Máximo de candidatos (limitado a MAX_PER_PAGE)
+        window_days: Janela de datas em dias (None ou 0: sem janela)
+        full_content: Trazer o conteúdo completo em vez de um trecho
+
+    Returns:
+        Candidatos por ID, sem a própria notícia de referência
+    """
+    search = build_candidate_search(reference_doc, pool_size, window_days, full_content)
+    if search is None:
+        return {}
+
+    results = await client.search(search.pop("collection"), search)
+    return parse_candidates(results, reference_doc)
+
+
+def build_candidate_search(
+    reference_doc: dict[str, Any],
+    pool_size: int,
+    window_days: int | None = None,
+    full_content: bool = False
+) -> dict[str, Any] | None:
+    """
+    Monta a busca de candidatos de search_candidates() no formato multi_search.
+
+    Permite enviar as buscas de várias notícias de referência em um único
+    multi_search (ver parse_candidates()).
+
+    Returns:
+        Busca com `collection`, ou None se a referência não tiver termos
+    """
+    keywords = reference_keywords(reference_doc)
+    if not keywords:
+        return None
+
+    pool_size = min(max(1, pool_size), MAX_PER_PAGE)
+    search: dict[str, Any] = {
+        "collection": "news",
+        "q": " ".join(keywords),
+        "query_by": "title,content",
+        "per_page": pool_size,
+        "drop_tokens_threshold": pool_size,
+    }
+    if full_content:
+        search["include_fields"] = f"{CANDIDATE_FIELDS},content"
+    else:
+        search.update({
+            "include_fields": CANDIDATE_FIELDS,
+            "highlight_fields": "content",
+            "highlight_affix_num_tokens": CANDIDATE_SNIPPET_TOKENS,
+            "snippet_threshold": CANDIDATE_SNIPPET_TOKENS * 2,
+        })
+
+    published_at = reference_doc.get("published_at")
+    if window_days and published_at:
+        window = window_days * SECONDS_PER_DAY
+        search["filter_by"] = (
+            f"published_at:>={published_at - window} && published_at:<={published_at + window}"
+        )
+
+    return search
+
+
+def parse_candidates(
+    results: dict[str, Any],
+    reference_doc: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """
+    Candidatos por ID de uma resposta da busca de candidatos.
+
+    Respostas com erro (falha individual em um multi_search) não têm
+    candidatos. Sem o conteúdo completo, o trecho destacado pelo Typesense
+    (sem as marcações) ocupa o lugar de `content`.
+    """
+    reference_id = str(reference_doc.get("id"))
+    candidates = {}
+    for hit in results.get("hits", []):
+        doc = hit["document"]
+        if str(doc.get("id")) == reference_id:
+            continue
+        if "content" not in doc and (snippet := get_highlight_snippet(hit, "content")):
+            doc = {**doc, "content": HIGHLIGHT_TAGS.sub("", snippet)}
+        candidates[str(doc.get("id"))] = doc
+    return candidates
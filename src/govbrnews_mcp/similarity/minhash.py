@@ -0,0 +1,354 @@
+"""
+Detecção de quase-duplicatas com assinaturas MinHash e buckets LSH.
+
+Cada notícia vira o conjunto de trigramas de palavras do título e do
+conteúdo. A assinatura MinHash estima a similaridade de Jaccard entre dois
+conjuntos pela fração de posições iguais. As assinaturas são divididas em
+bandas (LSH): notícias que coincidem em ao menos uma banda inteira são
+candidatas, e só elas têm a similaridade estimada.
+
+Em disco, o índice guarda apenas as assinaturas (`uint32`), as datas de
+publicação e os IDs; as chaves das bandas são recalculadas ao abrir.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .storage import META_FILE, write_index
+from .text import TOKEN_PATTERN, normalize
+
+logger = logging.getLogger(__name__)
+
+# Permutações da assinatura: BANDS bandas de ROWS linhas. Com 16 × 8, pares
+# com Jaccard 0.8 viram candidatos com ~99% de chance e pares com 0.5, ~6%.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Palavras por shingle
+SHINGLE_SIZE = 3
+
+# Primo de Mersenne 2^31 - 1: produtos de valores menores cabem em uint64
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+
+def _coefficients(name: str, count: int, modulus: int) -> np.ndarray:
+    """
+    Coeficientes pseudoaleatórios fixos (1 a modulus - 1).
+
+    Derivados de BLAKE2b, e não de um gerador do NumPy, para que índices
+    salvos continuem válidos em qualquer processo e versão.
+    """
+    return np.array([
+        int.from_bytes(hashlib.blake2b(f"{name}:{i}".encode(), digest_size=8).digest(), "little")
+        % (modulus - 1) + 1
+        for i in range(count)
+    ], dtype=np.uint64)
+
+
+# Coeficientes das permutações (a·x + b mod p) e da combinação das bandas
+_PERM_A = _coefficients("minhash-a", NUM_PERM, int(MERSENNE_PRIME))
+_PERM_B = _coefficients("minhash-b", NUM_PERM, int(MERSENNE_PRIME))
+_BAND_MULTIPLIERS = _coefficients("lsh-band", ROWS, 1 << 62)
+_SHINGLE_MULTIPLIERS = np.array([1_000_003, 999_983, 1], dtype=np.uint64)
+
+# Assinatura de um texto sem palavras (não é duplicata de nada)
+EMPTY_SIGNATURE = np.full(NUM_PERM, int(MERSENNE_PRIME), dtype=np.uint32)
+
+# Versão do formato em disco
+INDEX_VERSION = 1
+
+
+def duplicate_text(doc: dict[str, Any]) -> str:
+    """Texto comparado na detecção de duplicatas: título e conteúdo."""
+    return f"{doc.get('title') or ''} {doc.get('content') or ''}"
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """
+    Hashes dos trigramas de palavras de um texto (sem repetição).
+
+    Textos com menos de três palavras usam as próprias palavras.
+    """
+    words = TOKEN_PATTERN.findall(normalize(text))
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+
+    hashes = np.array([zlib.crc32(word.encode()) for word in words], dtype=np.uint64)
+    if hashes.size >= SHINGLE_SIZE:
+        windows = np.lib.stride_tricks.sliding_window_view(hashes, SHINGLE_SIZE)
+        hashes = (windows * _SHINGLE_MULTIPLIERS).sum(axis=1)
+
+    return np.unique(hashes % MERSENNE_PRIME)
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    Assinatura MinHash de um texto.
+
+    Returns:
+        Array `uint32` com NUM_PERM valores
+    """
+    shingles = shingle_hashes(text)
+    if shingles.size == 0:
+        return EMPTY_SIGNATURE.copy()
+
+    permuted = (_PERM_A[:, None] * shingles[None, :] + _PERM_B[:, None]) % MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """
+    Chave de cada banda LSH das assinaturas.
+
+    Args:
+        signatures: Array (n, NUM_PERM) ou (NUM_PERM,)
+
+    Returns:
+        Array `uint64` (n, BANDS) ou (BANDS,)
+    """
+    bands = signatures.astype(np.uint64).reshape(*signatures.shape[:-1], BANDS, ROWS)
+    return (bands * _BAND_MULTIPLIERS).sum(axis=-1)
+
+
+def estimate_similarity(signatures: np.ndarray, signature: np.ndarray) -> np.ndarray:
+    """Jaccard estimado entre várias assinaturas e uma assinatura."""
+    return (signatures == signature).mean(axis=-1)
+
+
+def is_empty(signature: np.ndarray) -> bool:
+    """Se a assinatura é de um texto sem palavras."""
+    return bool(np.array_equal(signature, EMPTY_SIGNATURE))
+
+
+def cluster_duplicates(signatures: np.ndarray, threshold: float) -> list[int]:
+    """
+    Agrupa assinaturas quase idênticas.
+
+    Pares que coincidem em alguma banda e têm Jaccard estimado acima do
+    limiar ficam no mesmo grupo (transitivamente).
+
+    Args:
+        signatures: Array (n, NUM_PERM)
+        threshold: Jaccard mínimo (0 a 1)
+
+    Returns:
+        Grupo de cada assinatura (o menor índice do grupo)
+    """
+    n = len(signatures)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    keys = band_keys(signatures)
+    for i in range(n):
+        if is_empty(signatures[i]):
+            continue
+        later = np.flatnonzero((keys[i + 1:] == keys[i]).any(axis=1)) + i + 1
+        for j in later[estimate_similarity(signatures[later], signatures[i]) >= threshold]:
+            root_i, root_j = find(i), find(int(j))
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    return [find(i) for i in range(n)]
+
+
+class MinHashIndex:
+    """
+    Índice incremental de assinaturas MinHash para encontrar quase-duplicatas.
+
+    Documentos novos são acrescentados com add(); `watermark` guarda o maior
+    `published_at` indexado, para que a próxima atualização exporte só o que
+    foi publicado depois.
+    """
+
+    def __init__(
+        self,
+        ids: list[str] | None = None,
+        signatures: np.ndarray | None = None,
+        published_at: np.ndarray | None = None,
+        watermark: int | None = None,
+    ):
+        """
+        Inicializa o índice (vazio ou a partir de arrays já calculados).
+
+        Args:
+            ids: ID de cada documento
+            signatures: Assinaturas (n, NUM_PERM)
+            published_at: Timestamp de publicação de cada documento
+            watermark: Maior `published_at` já indexado
+        """
+        self.ids = list(ids or [])
+        self.watermark = watermark
+        self._signatures = (
+            signatures if signatures is not None else np.zeros((0, NUM_PERM), dtype=np.uint32)
+        )
+        self._published_at = (
+            published_at if published_at is not None else np.zeros(0, dtype=np.int64)
+        )
+        self._keys = band_keys(self._signatures)
+        self._pending: list[tuple[np.ndarray, int]] = []
+        self._positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._positions
+
+    def add(self, doc_id: str, text: str, published_at: int | None = None) -> bool:
+        """
+        Acrescenta um documento (IDs já indexados são ignorados).
+
+        Returns:
+            True se o documento foi acrescentado
+        """
+        if doc_id in self._positions:
+            return False
+
+        self._positions[doc_id] = len(self.ids)
+        self.ids.append(doc_id)
+        self._pending.append((minhash_signature(text), published_at or 0))
+        if published_at and (self.watermark is None or published_at > self.watermark):
+            self.watermark = published_at
+        return True
+
+    def add_documents(self, documents: Iterable[dict[str, Any]]) -> int:
+        """
+        Acrescenta documentos do Typesense (id, title, content, published_at).
+
+        Returns:
+            Quantidade de documentos novos
+        """
+        return sum(
+            self.add(str(doc["id"]), duplicate_text(doc), doc.get("published_at"))
+            for doc in documents
+        )
+
+    def _flush(self) -> None:
+        """Incorpora os documentos acrescentados aos arrays."""
+        if not self._pending:
+            return
+        signatures = np.stack([signature for signature, _ in self._pending])
+        published_at = np.array([timestamp for _, timestamp in self._pending], dtype=np.int64)
+        self._signatures = np.concatenate([self._signatures, signatures])
+        self._published_at = np.concatenate([self._published_at, published_at])
+        self._keys = np.concatenate([self._keys, band_keys(signatures)])
+        self._pending = []
+
+    def signature_of(self, doc_id: str) -> np.ndarray | None:
+        """Assinatura de um documento indexado (ou None)."""
+        position = self._positions.get(doc_id)
+        if position is None:
+            return None
+        self._flush()
+        return np.asarray(self._signatures[position])
+
+    def query(
+        self,
+        signature: np.ndarray,
+        threshold: float,
+        exclude: Iterable[str] = ()
+    ) -> list[tuple[str, float]]:
+        """
+        Documentos quase idênticos a uma assinatura.
+
+        Args:
+            signature: Assinatura MinHash de referência
+            threshold: Jaccard estimado mínimo (0 a 1)
+            exclude: IDs a ignorar (ex: a própria notícia)
+
+        Returns:
+            Pares (id, Jaccard estimado) em ordem decrescente
+        """
+        self._flush()
+        if is_empty(signature) or not len(self.ids):
+            return []
+
+        candidates = np.flatnonzero((self._keys == band_keys(signature)).any(axis=1))
+        similarity = estimate_similarity(self._signatures[candidates], signature)
+        keep = similarity >= threshold
+        candidates, similarity = candidates[keep], similarity[keep]
+        excluded = set(exclude)
+
+        order = np.argsort(-similarity, kind="stable")
+        return [
+            (self.ids[i], float(s))
+            for i, s in zip(candidates[order], similarity[order])
+            if self.ids[i] not in excluded
+        ]
+
+    def published_at_of(self, doc_id: str) -> int | None:
+        """Timestamp de publicação indexado de um documento (ou None)."""
+        position = self._positions.get(doc_id)
+        if position is None:
+            return None
+        self._flush()
+        return int(self._published_at[position]) or None
+
+    def save(self, directory: str | Path) -> None:
+        """
+        Salva o índice em um diretório (assinaturas, datas e `meta.json`).
+
+        Os arquivos são trocados sem sobrescrever os que um servidor em
+        execução tenha mapeado (ver `storage.write_index`).
+
+        Args:
+            directory: Diretório de destino (criado se não existir)
+        """
+        self._flush()
+        path = write_index(
+            directory,
+            {"signatures": self._signatures, "published_at": self._published_at},
+            {
+                "version": INDEX_VERSION,
+                "num_perm": NUM_PERM,
+                "bands": BANDS,
+                "watermark": self.watermark,
+                "ids": self.ids,
+            },
+        )
+        logger.info(f"Saved MinHash index ({len(self.ids)} documents) to {path}")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "MinHashIndex":
+        """
+        Abre um índice salvo com save().
+
+        Args:
+            directory: Diretório do índice
+            mmap: Abrir as assinaturas com memory-map
+
+        Returns:
+            MinHashIndex
+
+        Raises:
+            FileNotFoundError: Se o diretório não contém um índice
+            ValueError: Se o índice usa outro formato ou outra assinatura
+        """
+        path = Path(directory)
+        meta = json.loads((path / META_FILE).read_text(encoding="utf-8"))
+        if (meta.get("version"), meta.get("num_perm"), meta.get("bands")) != (
+            INDEX_VERSION, NUM_PERM, BANDS
+        ):
+            raise ValueError(f"Unsupported MinHash index format: {meta.get('version')}")
+
+        mmap_mode = "r" if mmap else None
+        index = cls(
+            meta["ids"],
+            np.load(path / "signatures.npy", mmap_mode=mmap_mode),
+            np.load(path / "published_at.npy", mmap_mode=mmap_mode),
+            meta.get("watermark"),
+        )
+        logger.info(f"Loaded MinHash index ({len(index)} documents) from {path}")
+        return index
@@ -0,0 +1,82 @@
+"""
+Reranqueamento local de candidatos a notícias similares.
+
+A pontuação final combina a similaridade de conteúdo (cosseno TF-IDF) com
+a coincidência de agência e tema e a proximidade temporal em relação à
+notícia de referência. Os componentes são calculados para todos os
+candidatos de uma vez, com arrays NumPy.
+"""
+
+from typing import Any
+
+import numpy as np
+
+# Pesos dos componentes da pontuação (somam 1)
+TEXT_WEIGHT = 0.7
+AGENCY_WEIGHT = 0.1
+THEME_WEIGHT = 0.1
+RECENCY_WEIGHT = 0.1
+
+# Dias de distância em que a proximidade temporal cai pela metade
+RECENCY_HALF_LIFE_DAYS = 90
+
+SECONDS_PER_DAY = 86400
+
+
+def rerank_candidates(
+    reference_doc: dict[str, Any],
+    documents: dict[str, dict[str, Any]],
+    text_scores: dict[str, float],
+    limit: int
+) -> list[tuple[str, float]]:
+    """
+    Ordena candidatos pela pontuação combinada.
+
+    Só candidatos com similaridade de conteúdo positiva são pontuados:
+    agência, tema e data desempatam e reordenam notícias com texto
+    parecido, mas não tornam similar uma notícia sem termos em comum.
+
+    Args:
+        reference_doc: Notícia de referência
+        documents: Candidatos por ID (com agency, theme_1_level_1 e published_at)
+        text_scores: Cosseno TF-IDF de cada candidato com a referência
+        limit: Máximo de candidatos retornados
+
+    Returns:
+        Pares (id, pontuação entre 0 e 1) em ordem decrescente
+    """
+    ids = [
+        doc_id for doc_id, score in text_scores.items()
+        if score > 0 and doc_id in documents
+    ]
+    if not ids:
+        return []
+
+    candidates = [documents[doc_id] for doc_id in ids]
+    text = np.array([text_scores[doc_id] for doc_id in ids])
+    score = TEXT_WEIGHT * text
+    score += AGENCY_WEIGHT * _matches(candidates, "agency", reference_doc.get("agency"))
+    score += THEME_WEIGHT * _matches(
+        candidates, "theme_1_level_1", reference_doc.get("theme_1_level_1")
+    )
+
+    reference_time = reference_doc.get("published_at")
+    if reference_time:
+        published = np.array(
+            [doc.get("published_at") or np.nan for doc in candidates], dtype=float
+        )
+        distance_days = np.abs(published - reference_time) / SECONDS_PER_DAY
+        # Candidatos sem data não ganham nem perdem por proximidade
+        score += RECENCY_WEIGHT * np.nan_to_num(
+            np.exp2(-distance_days / RECENCY_HALF_LIFE_DAYS), nan=0.0
+        )
+
+    order = np.argsort(-score, kind="stable")[:limit]
+    return [(ids[i], float(score[i])) for i in order]
+
+
+def _matches(candidates: list[dict[str, Any]], field: str, value: Any) -> np.ndarray:
+    """1.0 para candidatos com o mesmo valor da referência no campo, 0.0 para os demais."""
+    if not value:
+        return np.zeros(len(candidates))
+    return np.array([doc.get(field) == value for doc in candidates], dtype=float)
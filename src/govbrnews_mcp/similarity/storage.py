@@ -0,0 +1,71 @@
+"""
+Gravação e versionamento dos índices em disco.
+
+Um servidor em execução mantém os arrays do índice abertos com memory-map.
+Reescrever esses arquivos no lugar corromperia as páginas já mapeadas; por
+isso cada arquivo é gravado num diretório temporário irmão e trocado com
+`os.replace` (o inode antigo continua válido para quem o mapeou). O
+`meta.json` é trocado por último: até ele mudar, o índice anterior continua
+sendo o publicado.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+META_FILE = "meta.json"
+
+
+def write_index(directory: str | Path, arrays: dict[str, np.ndarray], meta: dict[str, Any]) -> Path:
+    """
+    Grava os arrays e o `meta.json` de um índice sem sobrescrever arquivos abertos.
+
+    Args:
+        directory: Diretório do índice (criado se não existir)
+        arrays: Arrays por nome de arquivo (sem a extensão `.npy`)
+        meta: Conteúdo do `meta.json`
+
+    Returns:
+        Caminho do diretório do índice
+    """
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+    try:
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(array))
+        (staging / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+        for name in arrays:
+            os.replace(staging / f"{name}.npy", path / f"{name}.npy")
+        os.replace(staging / META_FILE, path / META_FILE)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return path
+
+
+def index_version(directory: str | Path) -> tuple[int, int] | None:
+    """
+    Identifica a gravação atual de um índice pelo `meta.json`.
+
+    Cada save() troca o `meta.json` por um arquivo novo, então inode e
+    mtime mudam a cada gravação.
+
+    Args:
+        directory: Diretório do índice
+
+    Returns:
+        (inode, mtime em ns) do `meta.json`, ou None se ele não existe
+    """
+    try:
+        stat = (Path(directory) / META_FILE).stat()
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
@@ -0,0 +1,98 @@
+"""
+Tokenização de textos em português para os índices de similaridade.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Any
+
+# Tokens alfanuméricos após remover acentos e passar para minúsculas
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Tokens mais curtos que isso são descartados
+MIN_TOKEN_LENGTH = 3
+
+# Termos de uma notícia usados para buscar candidatos no Typesense
+MAX_KEYWORDS = 8
+
+# Vezes que o título entra no texto do documento (títulos resumem a notícia)
+TITLE_WEIGHT = 2
+
+# Palavras funcionais do português (sem acentos), mais termos onipresentes
+# nas notícias do governo federal que não ajudam a distinguir uma da outra
+STOPWORDS = frozenset("""
+a ao aos aquela aquelas aquele aqueles aquilo as ate com como contra da das de
+dela delas dele deles depois desde do dos e ela elas ele eles em entre era eram
+essa essas esse esses esta estas este estes eu foi foram ha isso isto ja la lhe
+lhes mais mas me mesmo meu minha muito na nao nas nem no nos nossa nosso num numa
+o os ou para pela pelas pelo pelos por porque qual quando que quem se sem ser sera
+seu seus sob sobre sua suas tambem te tem tinha tu tua um uma umas uns voce
+anos ano ainda assim bem cada onde pode podem sido sao seja sendo ter todo
+toda todos todas outro outra outros outras vai vao via deve devem apos durante
+segundo segunda primeiro primeira dia dias vez vezes forma parte alem
+governo federal brasil brasileiro brasileira nacional ministerio ministro
+ministra secretaria secretario gov www http https html
+""".split())
+
+
+def normalize(text: str) -> str:
+    """Remove acentos e passa o texto para minúsculas."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Divide um texto em tokens para indexação.
+
+    Remove acentos, stopwords, tokens curtos e tokens só com dígitos
+    (exceto anos, como "2025").
+
+    Args:
+        text: Texto em português
+
+    Returns:
+        Tokens na ordem em que aparecem
+    """
+    return [
+        token for token in TOKEN_PATTERN.findall(normalize(text))
+        if len(token) >= MIN_TOKEN_LENGTH
+        and token not in STOPWORDS
+        and (not token.isdigit() or len(token) == 4)
+    ]
+
+
+def document_text(doc: dict[str, Any]) -> str:
+    """
+    Texto indexado de uma notícia: título (com peso maior) e conteúdo.
+
+    Args:
+        doc: Documento do Typesense
+
+    Returns:
+        Texto a ser tokenizado
+    """
+    title = doc.get("title") or ""
+    content = doc.get("content") or ""
+    return " ".join([title] * TITLE_WEIGHT + [content])
+
+
+def reference_keywords(doc: dict[str, Any], max_keywords: int = MAX_KEYWORDS) -> list[str]:
+    """
+    Termos para buscar notícias parecidas com uma notícia de referência.
+
+    Usa os termos do título ou, sem título, os mais frequentes do conteúdo.
+
+    Args:
+        doc: Documento do Typesense
+        max_keywords: Máximo de termos
+
+    Returns:
+        Termos sem repetição, na ordem do título
+    """
+    keywords = list(dict.fromkeys(tokenize(doc.get("title") or "")))
+    if not keywords:
+        counts = Counter(tokenize(doc.get("content") or ""))
+        keywords = [term for term, _ in counts.most_common(max_keywords)]
+    return keywords[:max_keywords]
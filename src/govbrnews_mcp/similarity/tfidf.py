@@ -0,0 +1,252 @@
+"""
+Índice TF-IDF esparso com similaridade de cosseno vetorizada.
+
+Os vetores são guardados por termo (índice invertido, formato CSC): para
+cada termo, os documentos onde ele aparece e os pesos TF-IDF normalizados.
+A similaridade de uma consulta percorre só as listas dos termos da
+consulta, com um único `np.bincount` acumulando os produtos por documento.
+
+Salvo em disco, o índice é um diretório com arrays `.npy` abertos com
+memory-map: o processo só lê as páginas das listas que consulta.
+"""
+
+import json
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from .storage import META_FILE, write_index
+from .text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Arquivos do índice em disco
+ARRAY_FILES = ("idf", "postings_ptr", "postings_docs", "postings_weights")
+INDEX_VERSION = 1
+
+
+class TfidfIndex:
+    """
+    Índice TF-IDF de notícias para busca por similaridade de conteúdo.
+
+    Pesos: tf sublinear (1 + log tf) × idf suavizado
+    (log((1 + n) / (1 + df)) + 1), com cada documento normalizado para
+    norma L2 unitária, de forma que o produto escalar é o cosseno.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        vocabulary: dict[str, int],
+        idf: np.ndarray,
+        postings_ptr: np.ndarray,
+        postings_docs: np.ndarray,
+        postings_weights: np.ndarray,
+    ):
+        """
+        Inicializa o índice a partir de arrays já calculados.
+
+        Use build() para indexar textos e load() para abrir um índice salvo.
+
+        Args:
+            ids: ID de cada documento (posição = linha do índice)
+            vocabulary: Termo → posição
+            idf: IDF de cada termo
+            postings_ptr: Início da lista de cada termo (tamanho: termos + 1)
+            postings_docs: Documentos das listas, concatenados
+            postings_weights: Pesos TF-IDF normalizados das listas
+        """
+        self.ids = ids
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.postings_ptr = postings_ptr
+        self.postings_docs = postings_docs
+        self.postings_weights = postings_weights
+        self._positions = {doc_id: i for i, doc_id in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._positions
+
+    @classmethod
+    def build(cls, documents: Iterable[tuple[str, str]]) -> "TfidfIndex":
+        """
+        Indexa documentos.
+
+        Os textos são tokenizados um a um, sem guardar o texto original,
+        para que o corpus inteiro possa ser indexado em streaming.
+
+        Args:
+            documents: Pares (id, texto), com IDs únicos
+
+        Returns:
+            TfidfIndex em memória
+        """
+        ids: list[str] = []
+        vocabulary: dict[str, int] = {}
+        doc_rows: list[np.ndarray] = []
+        term_rows: list[np.ndarray] = []
+        tf_rows: list[np.ndarray] = []
+        for doc_id, text in documents:
+            row = len(ids)
+            ids.append(doc_id)
+            counts = Counter(tokenize(text))
+            if not counts:
+                continue
+            terms = [vocabulary.setdefault(term, len(vocabulary)) for term in counts]
+            term_rows.append(np.array(terms, dtype=np.int32))
+            tf_rows.append(np.array(list(counts.values()), dtype=np.float32))
+            doc_rows.append(np.full(len(terms), row, dtype=np.int32))
+
+        n_docs, n_terms = len(ids), len(vocabulary)
+        if doc_rows:
+            docs = np.concatenate(doc_rows)
+            terms = np.concatenate(term_rows)
+            tf = np.concatenate(tf_rows)
+        else:
+            docs = np.zeros(0, dtype=np.int32)
+            terms = np.zeros(0, dtype=np.int32)
+            tf = np.zeros(0, dtype=np.float32)
+
+        df = np.bincount(terms, minlength=n_terms)
+        idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+        weights = (1 + np.log(tf)) * idf[terms]
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=n_docs))
+        weights = (weights / norms[docs]).astype(np.float32)
+
+        # Agrupar por termo: listas invertidas
+        order = np.argsort(terms, kind="stable")
+        postings_ptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=postings_ptr[1:])
+
+        return cls(ids, vocabulary, idf, postings_ptr, docs[order], weights[order])
+
+    def vectorize(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vetor TF-IDF normalizado de um texto (termos fora do vocabulário são ignorados).
+
+        Returns:
+            Tupla (posições dos termos, pesos)
+        """
+        counts = Counter(token for token in tokenize(text) if token in self.vocabulary)
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        terms = np.array([self.vocabulary[term] for term in counts], dtype=np.int64)
+        tf = np.array(list(counts.values()), dtype=np.float32)
+        weights = (1 + np.log(tf)) * self.idf[terms]
+        return terms, (weights / np.linalg.norm(weights)).astype(np.float32)
+
+    def scores(self, terms: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Cosseno entre um vetor de consulta e todos os documentos.
+
+        Args:
+            terms: Posições dos termos da consulta
+            weights: Pesos normalizados da consulta
+
+        Returns:
+            Array com a similaridade de cada documento (0 a 1)
+        """
+        starts = self.postings_ptr[terms]
+        lengths = self.postings_ptr[terms + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(len(self.ids), dtype=np.float32)
+
+        # Posições de todas as listas dos termos, sem laço por termo
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(total)
+
+        products = self.postings_weights[positions] * np.repeat(weights, lengths)
+        return np.bincount(
+            self.postings_docs[positions], weights=products, minlength=len(self.ids)
+        ).astype(np.float32)
+
+    def most_similar(
+        self,
+        text: str,
+        limit: int,
+        exclude: Iterable[str] = ()
+    ) -> list[tuple[str, float]]:
+        """
+        Documentos mais similares a um texto.
+
+        Args:
+            text: Texto de referência
+            limit: Máximo de resultados
+            exclude: IDs a ignorar (ex: a própria notícia de referência)
+
+        Returns:
+            Pares (id, similaridade) em ordem decrescente, só com similaridade > 0
+        """
+        if limit <= 0:
+            return []
+
+        terms, weights = self.vectorize(text)
+        scores = self.scores(terms, weights)
+
+        for doc_id in exclude:
+            if (position := self._positions.get(doc_id)) is not None:
+                scores[position] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if candidates.size > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [(self.ids[i], float(scores[i])) for i in ranked]
+
+    def save(self, directory: str | Path) -> None:
+        """
+        Salva o índice em um diretório (arrays `.npy` e `meta.json`).
+
+        Os arquivos são trocados sem sobrescrever os que um servidor em
+        execução tenha mapeado (ver `storage.write_index`).
+
+        Args:
+            directory: Diretório de destino (criado se não existir)
+        """
+        terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        path = write_index(
+            directory,
+            {name: getattr(self, name) for name in ARRAY_FILES},
+            {"version": INDEX_VERSION, "ids": self.ids, "terms": terms},
+        )
+        logger.info(f"Saved TF-IDF index ({len(self.ids)} documents, {len(terms)} terms) to {path}")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "TfidfIndex":
+        """
+        Abre um índice salvo com save().
+
+        Args:
+            directory: Diretório do índice
+            mmap: Abrir os arrays com memory-map em vez de lê-los para a memória
+
+        Returns:
+            TfidfIndex
+
+        Raises:
+            FileNotFoundError: Se o diretório não contém um índice
+            ValueError: Se o índice foi salvo em outra versão do formato
+        """
+        path = Path(directory)
+        meta = json.loads((path / META_FILE).read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported TF-IDF index version: {meta.get('version')}")
+
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in ARRAY_FILES
+        }
+        vocabulary = {term: i for i, term in enumerate(meta["terms"])}
+
+        logger.info(f"Loaded TF-IDF index ({len(meta['ids'])} documents) from {path}")
+        return cls(meta["ids"], vocabulary, **arrays)
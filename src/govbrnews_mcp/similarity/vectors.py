@@ -0,0 +1,362 @@
+"""
+Busca vetorial local com embeddings de feature hashing.
+
+Cada texto vira um conjunto de features (palavras e quadrigramas de
+caracteres das palavras, que aproximam variações como "vacina" e
+"vacinação"), espalhadas por feature hashing e projetadas em EMBEDDING_DIM
+dimensões por uma projeção aleatória de sinais ±1. A linha da projeção de
+cada feature é calculada a partir do seu hash, sem matriz em memória e sem
+gerador aleatório: o mesmo texto tem o mesmo embedding em qualquer processo
+e versão, sem chamar serviços externos.
+
+Os embeddings normalizados ficam em uma matriz `float32` salva em disco e
+aberta com memory-map. A busca exata multiplica a matriz pela consulta em
+blocos; com muitos documentos, um índice IVF (k-means esférico) restringe a
+busca às listas dos centróides mais próximos da consulta.
+"""
+
+import json
+import logging
+import math
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from .storage import META_FILE, write_index
+from .text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Dimensões do embedding
+EMBEDDING_DIM = 256
+
+# Tamanho dos n-gramas de caracteres e seu peso em relação às palavras
+CHAR_NGRAM_SIZE = 4
+CHAR_NGRAM_WEIGHT = 0.5
+
+# Linhas multiplicadas por vez na busca exata e no treino do IVF
+SEARCH_CHUNK = 16384
+
+# IVF: só para índices com pelo menos IVF_MIN_DOCUMENTS (√n listas)
+IVF_MIN_DOCUMENTS = 20000
+IVF_ITERATIONS = 10
+
+# Arquivos do índice em disco
+IVF_ARRAY_FILES = ("centroids", "list_ptr", "list_rows")
+INDEX_VERSION = 1
+
+_DIMENSIONS = np.arange(EMBEDDING_DIM, dtype=np.uint64)
+
+
+def _features(text: str) -> tuple[list[str], np.ndarray]:
+    """Features de um texto e seus pesos (tf sublinear)."""
+    words = Counter(tokenize(text))
+    grams: Counter = Counter()
+    for word, count in words.items():
+        padded = f"<{word}>"
+        for start in range(len(padded) - CHAR_NGRAM_SIZE + 1):
+            grams["#" + padded[start:start + CHAR_NGRAM_SIZE]] += count
+
+    features = list(words) + list(grams)
+    weights = np.array(
+        [1 + math.log(count) for count in words.values()]
+        + [CHAR_NGRAM_WEIGHT * (1 + math.log(count)) for count in grams.values()],
+        dtype=np.float32,
+    )
+    return features, weights
+
+
+def _projection_rows(hashes: np.ndarray) -> np.ndarray:
+    """
+    Linhas ±1 da projeção aleatória de cada feature.
+
+    O sinal de cada posição vem do bit mais alto do hash (splitmix64) de
+    `hash × EMBEDDING_DIM + posição`.
+    """
+    with np.errstate(over="ignore"):
+        x = hashes[:, None] * np.uint64(EMBEDDING_DIM) + _DIMENSIONS
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+    return 1.0 - 2.0 * (x >> np.uint64(63)).astype(np.float32)
+
+
+def embed_text(text: str) -> np.ndarray:
+    """
+    Embedding normalizado de um texto.
+
+    Returns:
+        Array `float32` com EMBEDDING_DIM valores (zeros para texto sem palavras)
+    """
+    features, weights = _features(text)
+    if not features:
+        return np.zeros(EMBEDDING_DIM, dtype=np.float32)
+
+    hashes = np.array([zlib.crc32(feature.encode()) for feature in features], dtype=np.uint64)
+    # Features com o mesmo hash se somam (feature hashing)
+    hashes, positions = np.unique(hashes, return_inverse=True)
+    weights = np.bincount(positions, weights=weights).astype(np.float32)
+
+    vector = weights @ _projection_rows(hashes)
+    norm = np.linalg.norm(vector)
+    return (vector / norm).astype(np.float32) if norm > 0 else vector.astype(np.float32)
+
+
+def embed_texts(texts: Iterable[str]) -> np.ndarray:
+    """
+    Embeddings normalizados de vários textos.
+
+    Returns:
+        Array `float32` (n, EMBEDDING_DIM)
+    """
+    vectors = [embed_text(text) for text in texts]
+    if not vectors:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    return np.stack(vectors)
+
+
+class VectorIndex:
+    """
+    Índice de embeddings de notícias para busca semântica local.
+
+    O produto escalar entre embeddings normalizados é o cosseno. Sem IVF, a
+    busca é exata; com IVF, `nprobe` listas são comparadas por consulta.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        vectors: np.ndarray,
+        centroids: np.ndarray | None = None,
+        list_ptr: np.ndarray | None = None,
+        list_rows: np.ndarray | None = None,
+    ):
+        """
+        Inicializa o índice a partir de arrays já calculados.
+
+        Use build() para indexar textos e load() para abrir um índice salvo.
+
+        Args:
+            ids: ID de cada documento (posição = linha da matriz)
+            vectors: Embeddings normalizados (n, EMBEDDING_DIM)
+            centroids: Centróides do IVF (listas, EMBEDDING_DIM), se houver
+            list_ptr: Início da lista de cada centróide (tamanho: listas + 1)
+            list_rows: Linhas dos documentos, agrupadas por lista
+        """
+        self.ids = ids
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_ptr = list_ptr
+        self.list_rows = list_rows
+        self._positions = {doc_id: i for i, doc_id in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._positions
+
+    @property
+    def nlist(self) -> int:
+        """Número de listas do IVF (0 sem IVF)."""
+        return 0 if self.centroids is None else len(self.centroids)
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[tuple[str, str]],
+        nlist: int | None = None
+    ) -> "VectorIndex":
+        """
+        Indexa documentos.
+
+        Args:
+            documents: Pares (id, texto), com IDs únicos
+            nlist: Listas do IVF (None: √n a partir de IVF_MIN_DOCUMENTS
+                documentos; 0: sem IVF)
+
+        Returns:
+            VectorIndex em memória
+        """
+        ids: list[str] = []
+        vectors: list[np.ndarray] = []
+        for doc_id, text in documents:
+            ids.append(doc_id)
+            vectors.append(embed_text(text))
+
+        matrix = (
+            np.stack(vectors) if vectors else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        )
+        index = cls(ids, matrix)
+
+        if nlist is None:
+            nlist = int(math.sqrt(len(ids))) if len(ids) >= IVF_MIN_DOCUMENTS else 0
+        if nlist > 0:
+            index.train_ivf(nlist)
+        return index
+
+    def train_ivf(self, nlist: int, iterations: int = IVF_ITERATIONS) -> None:
+        """
+        Agrupa os embeddings em `nlist` listas com k-means esférico.
+
+        Os centróides iniciais são linhas igualmente espaçadas da matriz,
+        para que o treino seja determinístico.
+
+        Args:
+            nlist: Número de listas (limitado ao número de documentos)
+            iterations: Iterações do k-means
+        """
+        n = len(self.ids)
+        nlist = min(nlist, n)
+        if nlist <= 0:
+            return
+
+        centroids = np.array(self.vectors[np.linspace(0, n - 1, nlist).astype(np.int64)])
+        for _ in range(iterations):
+            sums = np.zeros_like(centroids)
+            for start in range(0, n, SEARCH_CHUNK):
+                chunk = np.asarray(self.vectors[start:start + SEARCH_CHUNK])
+                assigned = np.argmax(chunk @ centroids.T, axis=1)
+                one_hot = np.zeros((len(chunk), nlist), dtype=np.float32)
+                one_hot[np.arange(len(chunk)), assigned] = 1
+                sums += one_hot.T @ chunk
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Listas vazias mantêm o centróide anterior
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        assignments = np.concatenate([
+            np.argmax(np.asarray(self.vectors[start:start + SEARCH_CHUNK]) @ centroids.T, axis=1)
+            for start in range(0, n, SEARCH_CHUNK)
+        ])
+        self.centroids = centroids.astype(np.float32)
+        self.list_ptr = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignments, minlength=nlist), out=self.list_ptr[1:])
+        self.list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+
+    def scores(self, vector: np.ndarray, nprobe: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cosseno entre um embedding e os documentos comparados.
+
+        Args:
+            vector: Embedding normalizado da consulta
+            nprobe: Listas do IVF comparadas (None ou ≥ listas: busca exata)
+
+        Returns:
+            Tupla (linhas comparadas, similaridade de cada uma)
+        """
+        if self.centroids is None or nprobe is None or nprobe >= self.nlist:
+            rows = np.arange(len(self.ids))
+            similarity = np.concatenate([
+                np.asarray(self.vectors[start:start + SEARCH_CHUNK]) @ vector
+                for start in range(0, len(self.ids), SEARCH_CHUNK)
+            ]) if len(self.ids) else np.zeros(0, dtype=np.float32)
+            return rows, similarity
+
+        probed = np.argpartition(-(self.centroids @ vector), max(nprobe, 1) - 1)[:max(nprobe, 1)]
+        rows = np.sort(np.concatenate([
+            self.list_rows[self.list_ptr[c]:self.list_ptr[c + 1]] for c in probed
+        ]))
+        return rows, np.asarray(self.vectors[rows]) @ vector
+
+    def most_similar(
+        self,
+        text: str,
+        limit: int,
+        exclude: Iterable[str] = (),
+        nprobe: int | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        Documentos com embedding mais próximo do de um texto.
+
+        Args:
+            text: Texto da consulta
+            limit: Máximo de resultados
+            exclude: IDs a ignorar
+            nprobe: Listas do IVF comparadas (None: busca exata)
+
+        Returns:
+            Pares (id, similaridade) em ordem decrescente, só com similaridade > 0
+        """
+        vector = embed_text(text)
+        if limit <= 0 or not vector.any():
+            return []
+
+        rows, similarity = self.scores(vector, nprobe)
+        for doc_id in exclude:
+            if (position := self._positions.get(doc_id)) is not None:
+                similarity[rows == position] = 0
+
+        candidates = np.flatnonzero(similarity > 0)
+        if candidates.size > limit:
+            candidates = candidates[np.argpartition(-similarity[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.argsort(-similarity[candidates], kind="stable")]
+
+        return [(self.ids[rows[i]], float(similarity[i])) for i in ranked]
+
+    def save(self, directory: str | Path) -> None:
+        """
+        Salva o índice em um diretório (arrays `.npy` e `meta.json`).
+
+        Os arquivos são trocados sem sobrescrever os que um servidor em
+        execução tenha mapeado (ver `storage.write_index`).
+
+        Args:
+            directory: Diretório de destino (criado se não existir)
+        """
+        arrays = {"vectors": np.asarray(self.vectors, dtype=np.float32)}
+        if self.centroids is not None:
+            arrays.update({name: getattr(self, name) for name in IVF_ARRAY_FILES})
+
+        path = write_index(
+            directory,
+            arrays,
+            {
+                "version": INDEX_VERSION,
+                "dim": EMBEDDING_DIM,
+                "nlist": self.nlist,
+                "ids": self.ids,
+            },
+        )
+        if self.centroids is None:
+            # Listas IVF de uma versão anterior (o meta novo já não as usa)
+            for name in IVF_ARRAY_FILES:
+                (path / f"{name}.npy").unlink(missing_ok=True)
+        logger.info(f"Saved vector index ({len(self.ids)} documents, {self.nlist} lists) to {path}")
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "VectorIndex":
+        """
+        Abre um índice salvo com save().
+
+        Args:
+            directory: Diretório do índice
+            mmap: Abrir a matriz de embeddings com memory-map
+
+        Returns:
+            VectorIndex
+
+        Raises:
+            FileNotFoundError: Se o diretório não contém um índice
+            ValueError: Se o índice usa outro formato ou outra dimensão
+        """
+        path = Path(directory)
+        meta = json.loads((path / META_FILE).read_text(encoding="utf-8"))
+        if (meta.get("version"), meta.get("dim")) != (INDEX_VERSION, EMBEDDING_DIM):
+            raise ValueError(f"Unsupported vector index format: {meta.get('version')}")
+
+        ivf = (
+            {name: np.load(path / f"{name}.npy") for name in IVF_ARRAY_FILES}
+            if meta.get("nlist") else {}
+        )
+        index = cls(
+            meta["ids"],
+            np.load(path / "vectors.npy", mmap_mode="r" if mmap else None),
+            **ivf,
+        )
+        logger.info(f"Loaded vector index ({len(index)} documents, {index.nlist} lists) from {path}")
+        return index
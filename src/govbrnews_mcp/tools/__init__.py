@@ -4,12 +4,22 @@ Tools do servidor MCP GovBRNews.
 
 from .search import search_news
 from .facets import get_facets
-from .similar import similar_news
-from .temporal import analyze_temporal
+from .similar import similar_news, similar_news_batch
+from .duplicates import find_duplicates
+from .temporal import analyze_temporal, analyze_temporal_multi
+from .report import theme_report
+from .compare import compare_agencies_data
+from .pivot import get_pivot
 
 __all__ = [
     "search_news",
     "get_facets",
     "similar_news",
+    "similar_news_batch",
+    "find_duplicates",
     "analyze_temporal",
+    "analyze_temporal_multi",
+    "theme_report",
+    "compare_agencies_data",
+    "get_pivot",
 ]
@@ -0,0 +1,223 @@
+"""
+Tool de comparação entre agências (plano do prompt compare_agencies).
+"""
+
+import logging
+import time
+from typing import Any
+
+from ..schema import get_collection_schema
+from ..typesense_client import get_async_typesense_client
+from ..utils.batch import build_exact_filter, multi_search_groups
+from ..utils.temporal import build_temporal_plans, plan_temporal_distribution
+
+logger = logging.getLogger(__name__)
+
+# Campos comparados entre as agências e seus títulos
+COMPARE_FACETS = {
+    "theme_1_level_1": "Temas",
+    "category": "Categorias",
+}
+
+
+async def compare_agencies_data(
+    agencies: list[str],
+    theme: str = "*",
+    months: int = 12,
+    top_values: int = 10
+) -> str:
+    """
+    Compara agências lado a lado em uma única chamada.
+
+    Monta, para cada agência, as consultas de volume, evolução mensal, temas
+    e categorias (filtradas pelo tema, se informado) e executa todas em um
+    único multi_search. O resultado são tabelas alinhadas com uma coluna por
+    agência.
+
+    Args:
+        agencies: Agências a comparar (2 a 10). Ex: ["mec", "saude"]
+        theme: Termo de busca para restringir a comparação (padrão: "*")
+        months: Meses na evolução mensal (1-60, padrão: 12)
+        top_values: Temas/categorias mais frequentes por agência (1-50, padrão: 10)
+
+    Returns:
+        String formatada em Markdown com tabelas comparativas
+
+    Examples:
+        >>> await compare_agencies_data(["mec", "capes"], theme="bolsas")
+        # Volumes, evolução mensal, temas e categorias de MEC e CAPES sobre bolsas
+    """
+    agencies = list(dict.fromkeys(agency.strip() for agency in agencies if agency.strip()))
+    if not 2 <= len(agencies) <= 10:
+        return """# Erro
+
+Informe de 2 a 10 agências distintas para comparar."""
+
+    months = min(max(1, months), 60)
+    top_values = min(max(1, top_values), 50)
+
+    logger.info(
+        f"Comparing agencies: {agencies}, theme='{theme}', months={months}, top_values={top_values}"
+    )
+
+    try:
+        schema = get_collection_schema("news")
+        facet_fields = [
+            field for field in COMPARE_FACETS
+            if await schema.is_facetable(field, default=True)
+        ]
+
+        groups = []
+        plans = []
+        for agency in agencies:
+            agency_filter = build_exact_filter("agency", agency)
+            overview_search = {
+                "collection": "news",
+                "q": theme,
+                "query_by": "title,content",
+                "filter_by": agency_filter,
+                "per_page": 0,
+            }
+            if facet_fields:
+                overview_search["facet_by"] = ",".join(facet_fields)
+                overview_search["max_facet_values"] = top_values
+
+            plan = await plan_temporal_distribution(
+                theme, "monthly", max_periods=months, filter_by=agency_filter
+            )
+            plans.append(plan)
+            groups.extend([[overview_search], plan.searches])
+
+        client = get_async_typesense_client()
+        started = time.perf_counter()
+        results = await multi_search_groups(client, groups)
+        # Séries por facet que falharem são refeitas com uma contagem por período
+        monthly = await build_temporal_plans(client, plans, results[1::2])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        per_agency = {}
+        for i, agency in enumerate(agencies):
+            per_agency[agency] = {
+                "overview": results[2 * i][0],
+                "monthly": monthly[i],
+            }
+
+        return _format_comparison({
+            "agencies": agencies,
+            "theme": theme,
+            "data": per_agency,
+            "queries": sum(len(group) for group in groups),
+            "elapsed_ms": elapsed_ms,
+        })
+
+    except Exception as e:
+        logger.error(f"Error comparing agencies: {e}", exc_info=True)
+        return f"""# Erro na Comparação de Agências
+
+**Erro:** {str(e)}
+**Agências:** {', '.join(agencies)}
+**Tema:** `{theme}`
+
+Tente novamente com menos agências ou um período menor."""
+
+
+def _format_comparison(data: dict[str, Any]) -> str:
+    """Formata a comparação em tabelas com uma coluna por agência."""
+    agencies = data["agencies"]
+    per_agency = data["data"]
+    columns = " | ".join(agencies)
+    separator = "|---|" + "---|" * len(agencies)
+
+    output = ["# Comparação entre Agências", ""]
+    output.append(f"**Agências:** {', '.join(agencies)}")
+    if data["theme"] != "*":
+        output.append(f"**Tema:** `{data['theme']}`")
+    output.append(
+        f"*{data['queries']} consultas em um único lote | "
+        f"tempo de backend: {data['elapsed_ms']:.0f} ms*"
+    )
+    output.append("")
+
+    # Volumes globais
+    totals = {
+        agency: per_agency[agency]["overview"].get("found", 0)
+        if "error" not in per_agency[agency]["overview"] else None
+        for agency in agencies
+    }
+    grand_total = sum(total for total in totals.values() if total)
+    output.append("## Volumes Globais")
+    output.append("")
+    output.append("| Agência | Notícias | % do Total Comparado |")
+    output.append("|---------|----------|----------------------|")
+    for agency, total in totals.items():
+        if total is None:
+            output.append(f"| {agency} | erro | — |")
+            continue
+        share = total / grand_total * 100 if grand_total else 0
+        output.append(f"| {agency} | {total:,} | {share:.1f}% |")
+    output.append("")
+
+    # Evolução mensal: uma linha por mês, uma coluna por agência
+    output.append("## Evolução Mensal")
+    output.append("")
+    rows: dict[str, dict[str, Any]] = {}
+    for agency in agencies:
+        monthly = per_agency[agency]["monthly"]
+        for item in monthly.get("distribution", []):
+            rows.setdefault(item["period"], {"label": item["label"]})[agency] = item["count"]
+        for item in monthly.get("failed_periods", []):
+            rows.setdefault(item["period"], {"label": item["label"]})[agency] = "erro"
+
+    if rows:
+        output.append(f"| Período | {columns} |")
+        output.append(separator)
+        for period in sorted(rows):
+            row = rows[period]
+            output.append(
+                f"| {row['label']} | " + " | ".join(_cell(row.get(agency)) for agency in agencies) + " |"
+            )
+        output.append(
+            "| **Total** | " + " | ".join(
+                _cell(per_agency[agency]["monthly"].get("total_found")) for agency in agencies
+            ) + " |"
+        )
+    else:
+        output.append("Nenhum dado encontrado para o período.")
+    output.append("")
+
+    # Temas e categorias: uma linha por valor, uma coluna por agência
+    for field, title in COMPARE_FACETS.items():
+        values: dict[str, dict[str, int]] = {}
+        for agency in agencies:
+            for facet in per_agency[agency]["overview"].get("facet_counts", []):
+                if facet.get("field_name") != field:
+                    continue
+                for count in facet.get("counts", []):
+                    values.setdefault(count["value"], {})[agency] = count["count"]
+
+        if not values:
+            continue
+
+        output.append(f"## {title}")
+        output.append("")
+        output.append(f"| Item | {columns} |")
+        output.append(separator)
+        ranked = sorted(values.items(), key=lambda item: -sum(item[1].values()))
+        for value, counts in ranked:
+            output.append(
+                f"| {value} | " + " | ".join(_cell(counts.get(agency)) for agency in agencies) + " |"
+            )
+        output.append("")
+        output.append("*— indica que o item não está entre os mais frequentes da agência.*")
+        output.append("")
+
+    return "\n".join(output)
+
+
+def _cell(value: Any) -> str:
+    """Formata uma célula de tabela comparativa."""
+    if value is None:
+        return "—"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
@@ -0,0 +1,153 @@
+"""
+Tool para encontrar republicações quase idênticas de uma notícia.
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from ..config import get_settings
+from ..similarity import duplicate_text, get_duplicate_index, minhash_signature
+from ..similarity.candidates import search_candidates
+from ..similarity.minhash import estimate_similarity
+from ..typesense_client import get_async_typesense_client
+from ..utils.formatters import format_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+async def find_duplicates(
+    news_id: str,
+    threshold: float | None = None,
+    limit: int = 20
+) -> str:
+    """
+    Encontra cópias quase idênticas de uma notícia (ex: o mesmo release
+    republicado por várias agências).
+
+    Compara assinaturas MinHash dos trigramas de palavras do título e do
+    conteúdo. Com o índice de duplicatas configurado (`DUPLICATE_INDEX_PATH`),
+    todo o acervo é comparado; sem ele, as notícias do Typesense que
+    compartilham termos do título.
+
+    Args:
+        news_id: ID da notícia no Typesense
+        threshold: Similaridade de Jaccard estimada mínima (0.5-1.0,
+                   padrão: DUPLICATE_THRESHOLD, 0.8)
+        limit: Máximo de cópias listadas (1-50, padrão: 20)
+
+    Returns:
+        String formatada em Markdown com as cópias em ordem de publicação,
+        destacando a mais antiga
+
+    Examples:
+        >>> await find_duplicates("254647")
+        # Republicações do release 254647 em outras agências
+    """
+    if threshold is None:
+        threshold = get_settings().duplicate_threshold
+    threshold = min(max(0.5, threshold), 1.0)
+    limit = min(max(1, limit), 50)
+
+    client = get_async_typesense_client()
+
+    try:
+        try:
+            reference = await client.get_document("news", news_id)
+        except Exception as e:
+            logger.error(f"Failed to get reference document {news_id}: {e}")
+            return f"""# Erro
+
+Notícia com ID `{news_id}` não encontrada.
+
+Verifique se o ID está correto e tente novamente."""
+
+        index = get_duplicate_index()
+        if index is not None:
+            signature = index.signature_of(news_id)
+            if signature is None:
+                signature = minhash_signature(duplicate_text(reference))
+            matches = index.query(signature, threshold, exclude={news_id})[:limit]
+            documents = (
+                await client.get_documents("news", [doc_id for doc_id, _ in matches])
+                if matches else {}
+            )
+            # Documentos removidos do Typesense depois da indexação ficam de fora
+            matches = [(doc_id, score) for doc_id, score in matches if doc_id in documents]
+            source = f"índice de duplicatas ({len(index):,} notícias)"
+        else:
+            # MinHash compara o texto inteiro: candidatos com conteúdo completo
+            documents = await search_candidates(
+                client, reference, get_settings().similarity_candidates, full_content=True
+            )
+            matches = _match_candidates(reference, documents, threshold)[:limit]
+            source = f"{len(documents):,} candidatos do Typesense"
+
+        return _format_duplicates(reference, matches, documents, threshold, source)
+
+    except Exception as e:
+        logger.error(f"Error finding duplicates: {e}", exc_info=True)
+        return f"""# Erro ao Buscar Duplicatas
+
+**Erro:** {str(e)}
+
+**ID de referência:** `{news_id}`"""
+
+
+def _match_candidates(
+    reference: dict[str, Any],
+    candidates: dict[str, dict[str, Any]],
+    threshold: float
+) -> list[tuple[str, float]]:
+    """Candidatos com Jaccard estimado acima do limiar, em ordem decrescente."""
+    if not candidates:
+        return []
+
+    ids = list(candidates)
+    signatures = np.stack([minhash_signature(duplicate_text(candidates[i])) for i in ids])
+    similarity = estimate_similarity(signatures, minhash_signature(duplicate_text(reference)))
+
+    order = np.argsort(-similarity, kind="stable")
+    return [(ids[i], float(similarity[i])) for i in order if similarity[i] >= threshold]
+
+
+def _format_duplicates(
+    reference: dict[str, Any],
+    matches: list[tuple[str, float]],
+    documents: dict[str, dict[str, Any]],
+    threshold: float,
+    source: str
+) -> str:
+    """Formata as cópias (e a referência) em ordem de publicação."""
+    output = ["# Quase-Duplicatas", ""]
+    output.append(f"**Notícia de referência:** {reference.get('title', 'Sem título')}")
+    output.append(f"**ID:** `{reference.get('id')}`")
+    output.append(f"**Critério:** Jaccard estimado (MinHash) ≥ {threshold:.2f} sobre {source}")
+    output.append(f"**Encontrado:** {len(matches)} cópias")
+    output.append("")
+
+    if not matches:
+        output.append("Nenhuma cópia quase idêntica encontrada.")
+        return "\n".join(output)
+
+    copies = [(reference, None)] + [(documents[doc_id], score) for doc_id, score in matches]
+    copies.sort(key=lambda copy: copy[0].get("published_at") or 0)
+
+    output.append("| # | ID | Título | Agência | Publicado | Similaridade |")
+    output.append("|---|----|--------|---------|-----------|--------------|")
+    for i, (doc, score) in enumerate(copies, 1):
+        published = format_timestamp(doc["published_at"]) if doc.get("published_at") else "N/A"
+        similarity = "referência" if score is None else f"{score:.2f}"
+        output.append(
+            f"| {i} | `{doc.get('id')}` | {doc.get('title', 'Sem título')} | "
+            f"{doc.get('agency') or 'N/A'} | {published} | {similarity} |"
+        )
+
+    earliest = copies[0][0]
+    output.append("")
+    output.append(
+        f"*Publicação mais antiga: `{earliest.get('id')}` "
+        f"({earliest.get('agency') or 'agência não informada'}).*"
+    )
+    return "\n".join(output)
@@ -5,13 +5,14 @@ Tool para obter agregações e estatísticas do dataset GovBRNews.
 import logging
 from typing import Any
 
-from ..typesense_client import get_typesense_client
+from ..schema import get_collection_schema
+from ..typesense_client import get_async_typesense_client
 from ..utils.formatters import format_facets_results
 
 logger = logging.getLogger(__name__)
 
 
-def get_facets(
+async def get_facets(
     facet_fields: list[str],
     query: str = "*",
     max_values: int = 20
@@ -38,13 +39,13 @@ def get_facets(
         String formatada em Markdown com as agregações
 
     Examples:
-        >>> get_facets(["agency"], query="educação")
+        >>> await get_facets(["agency"], query="educação")
         # Retorna contagem de notícias sobre educação por agência
 
-        >>> get_facets(["published_year", "agency"], max_values=5)
+        >>> await get_facets(["published_year", "agency"], max_values=5)
         # Retorna top 5 anos e top 5 agências
 
-        >>> get_facets(["theme_1_level_1"], query="saúde")
+        >>> await get_facets(["theme_1_level_1"], query="saúde")
         # Retorna temas relacionados a saúde
     """
     # Validar facet_fields
@@ -72,7 +73,22 @@ Campos inválidos: {', '.join(invalid_fields)}
 
 Nenhum campo de facet especificado. Forneça ao menos um campo válido."""
 
-    client = get_typesense_client()
+    # Conferir no schema (em cache) se os campos aceitam facet, evitando
+    # um round-trip que terminaria em erro do Typesense
+    schema = get_collection_schema("news")
+    unavailable_fields = [
+        field for field in facet_fields
+        if not await schema.is_facetable(field, default=True)
+    ]
+
+    if unavailable_fields:
+        return f"""# Erro
+
+Campos sem suporte a agregação no índice atual: {', '.join(unavailable_fields)}
+
+Verifique o schema da coleção `news` no Typesense."""
+
+    client = get_async_typesense_client()
 
     try:
         # Preparar query Typesense
@@ -80,7 +96,7 @@ Nenhum campo de facet especificado. Forneça ao menos um campo válido."""
 
         logger.info(f"Executing facets query: fields={facet_fields}, query='{query}', max={max_values}")
 
-        results = client.client.collections["news"].documents.search({
+        results = await client.search("news", {
             "q": query,
             "query_by": "title,content",
             "facet_by": facet_by,
@@ -0,0 +1,327 @@
+"""
+Tool de tabelas dinâmicas (tabulação cruzada entre dois campos).
+"""
+
+import logging
+from typing import Any
+
+from ..schema import get_collection_schema
+from ..typesense_client import get_async_typesense_client
+from ..utils.batch import build_exact_filter
+
+logger = logging.getLogger(__name__)
+
+# Dimensões aceitas e seus rótulos
+PIVOT_FIELDS = {
+    "agency": "Agência",
+    "published_year": "Ano",
+    "theme_1_level_1": "Tema",
+    "category": "Categoria",
+}
+
+# Nome curto de cada dimensão nos campos compostos (ex: "agency_year")
+COMPOUND_ALIASES = {
+    "agency": "agency",
+    "published_year": "year",
+    "theme_1_level_1": "theme",
+    "category": "category",
+}
+
+# Separador entre os dois valores de um campo composto (ex: "mec|2024")
+COMPOUND_SEPARATOR = "|"
+
+
+async def get_pivot(
+    rows: str,
+    columns: str,
+    query: str = "*",
+    top_k: int = 10
+) -> str:
+    """
+    Cruza dois campos em uma tabela de contingência (ex: agência × ano).
+
+    Quando o índice tem um campo composto com facet (ex: `agency_year`, com
+    valores "agência|ano"), as células saem de uma única consulta, depois
+    da consulta dos totais. Caso contrário, as `top_k` linhas mais
+    frequentes são consultadas em um único multi_search, cada uma agregando
+    o campo das colunas. Em ambos os casos as células são contagens exatas.
+
+    Args:
+        rows: Campo das linhas: "agency", "published_year",
+              "theme_1_level_1" ou "category"
+        columns: Campo das colunas (mesmas opções, diferente de `rows`)
+        query: Query opcional para filtrar notícias (padrão: "*")
+        top_k: Máximo de linhas e de colunas exibidas (1-25, padrão: 10)
+
+    Returns:
+        String formatada em Markdown com a tabela, totais por linha e coluna
+
+    Examples:
+        >>> await get_pivot("agency", "published_year")
+        # Notícias por agência e ano
+
+        >>> await get_pivot("theme_1_level_1", "agency", query="saúde", top_k=5)
+        # Top 5 temas × top 5 agências em notícias sobre saúde
+    """
+    invalid = [field for field in (rows, columns) if field not in PIVOT_FIELDS]
+    if invalid or rows == columns:
+        return f"""# Erro
+
+Campos inválidos para a tabela: `{rows}` × `{columns}`
+
+**Campos válidos (dois campos diferentes):**
+- `agency` - Agências governamentais
+- `published_year` - Ano de publicação
+- `theme_1_level_1` - Tema principal
+- `category` - Categoria da notícia"""
+
+    top_k = min(max(1, top_k), 25)
+    logger.info(f"Building pivot: rows={rows}, columns={columns}, query='{query}', top_k={top_k}")
+
+    try:
+        compound = await _find_compound_field(rows, columns)
+        if compound:
+            data = await _pivot_from_compound(query, rows, columns, top_k, *compound)
+        else:
+            data = await _pivot_from_batch(query, rows, columns, top_k)
+
+        return _format_pivot(data)
+
+    except Exception as e:
+        logger.error(f"Error building pivot: {e}", exc_info=True)
+        return f"""# Erro ao Gerar Tabela Dinâmica
+
+**Erro:** {str(e)}
+
+**Query:** `{query}`
+**Campos:** `{rows}` × `{columns}`"""
+
+
+async def _find_compound_field(rows: str, columns: str) -> tuple[str, bool] | None:
+    """
+    Procura no schema um campo composto facetável para o par de campos.
+
+    Returns:
+        Tupla (campo, invertido) onde `invertido` indica valores
+        "coluna|linha", ou None se não houver campo composto
+    """
+    schema = get_collection_schema("news")
+    row_alias, column_alias = COMPOUND_ALIASES[rows], COMPOUND_ALIASES[columns]
+
+    for name, inverted in ((f"{row_alias}_{column_alias}", False), (f"{column_alias}_{row_alias}", True)):
+        if await schema.is_facetable(name):
+            return name, inverted
+    return None
+
+
+def _facet_counts(results: dict[str, Any], field_name: str) -> dict[str, int]:
+    """Contagens de um campo de facet como dicionário valor → contagem."""
+    for facet in results.get("facet_counts", []):
+        if facet.get("field_name") == field_name:
+            return {str(count["value"]): count["count"] for count in facet.get("counts", [])}
+    return {}
+
+
+def _top_values(field: str, counts: dict[str, int], top_k: int) -> list[str]:
+    """Os `top_k` valores mais frequentes (anos em ordem cronológica)."""
+    values = sorted(counts, key=lambda value: -counts[value])[:top_k]
+    if field == "published_year":
+        values.sort()
+    return values
+
+
+def _value_filter(field: str, values: str | list[str]) -> str:
+    """Filtro de igualdade para um valor (ou lista de valores) de dimensão."""
+    if field == "published_year":
+        if isinstance(values, str):
+            return f"published_year:={int(values)}"
+        return f"published_year:[{','.join(str(int(value)) for value in values)}]"
+    return build_exact_filter(field, values)
+
+
+async def _pivot_totals(client, query: str, rows: str, columns: str, top_k: int) -> dict[str, Any]:
+    """
+    Consulta os totais das duas dimensões.
+
+    Returns:
+        Dicionário com a resposta, os totais e as `top_k` linhas e colunas exibidas
+    """
+    results = await client.search("news", {
+        "q": query,
+        "query_by": "title,content",
+        "facet_by": f"{rows},{columns}",
+        "per_page": 0,
+        "max_facet_values": top_k,
+    })
+
+    row_totals = _facet_counts(results, rows)
+    column_totals = _facet_counts(results, columns)
+    return {
+        "results": results,
+        "row_totals": row_totals,
+        "column_totals": column_totals,
+        "row_values": _top_values(rows, row_totals, top_k),
+        "column_values": _top_values(columns, column_totals, top_k),
+    }
+
+
+async def _pivot_from_compound(
+    query: str,
+    rows: str,
+    columns: str,
+    top_k: int,
+    compound_field: str,
+    inverted: bool
+) -> dict[str, Any]:
+    """
+    Monta a tabela a partir de um campo composto (duas consultas).
+
+    A consulta das células é restrita às linhas e colunas exibidas, de modo
+    que o facet do campo composto tem no máximo top_k × top_k valores e
+    todas as células vêm exatas.
+    """
+    client = get_async_typesense_client()
+    totals = await _pivot_totals(client, query, rows, columns, top_k)
+    row_values, column_values = totals["row_values"], totals["column_values"]
+
+    cells: dict[tuple[str, str], int] = {}
+    if row_values and column_values:
+        results = await client.search("news", {
+            "q": query,
+            "query_by": "title,content",
+            "filter_by": (
+                f"{_value_filter(rows, row_values)} && {_value_filter(columns, column_values)}"
+            ),
+            "facet_by": compound_field,
+            "per_page": 0,
+            "max_facet_values": len(row_values) * len(column_values),
+        })
+        for value, count in _facet_counts(results, compound_field).items():
+            first, _, second = value.partition(COMPOUND_SEPARATOR)
+            cells[(second, first) if inverted else (first, second)] = count
+
+    return {
+        "query": query,
+        "rows": rows,
+        "columns": columns,
+        "row_values": row_values,
+        "column_values": column_values,
+        "row_totals": totals["row_totals"],
+        "column_totals": totals["column_totals"],
+        "cells": cells,
+        "total_found": totals["results"].get("found", 0),
+        "method": f"campo composto `{compound_field}` (2 consultas)",
+    }
+
+
+async def _pivot_from_batch(
+    query: str,
+    rows: str,
+    columns: str,
+    top_k: int
+) -> dict[str, Any]:
+    """
+    Monta a tabela com uma consulta por linha, enviadas em um único lote.
+
+    Cada linha é restrita às colunas exibidas, de modo que o facet da linha
+    tem no máximo `top_k` valores e todas as células vêm exatas.
+    """
+    client = get_async_typesense_client()
+
+    # Totais das duas dimensões definem as linhas e colunas exibidas
+    totals = await _pivot_totals(client, query, rows, columns, top_k)
+    row_values, column_values = totals["row_values"], totals["column_values"]
+
+    searches = [
+        {
+            "collection": "news",
+            "q": query,
+            "query_by": "title,content",
+            "filter_by": f"{_value_filter(rows, row)} && {_value_filter(columns, column_values)}",
+            "facet_by": columns,
+            "per_page": 0,
+            "max_facet_values": len(column_values),
+        }
+        for row in row_values
+    ] if column_values else []
+    row_results = await client.multi_search(searches) if searches else []
+
+    cells: dict[tuple[str, str], int] = {}
+    failed_rows = []
+    for row, row_result in zip(row_values, row_results):
+        if "error" in row_result:
+            logger.warning(f"Error getting pivot row '{row}': {row_result['error']}")
+            failed_rows.append(row)
+            continue
+        for column, count in _facet_counts(row_result, columns).items():
+            cells[(row, column)] = count
+
+    return {
+        "query": query,
+        "rows": rows,
+        "columns": columns,
+        "row_values": row_values,
+        "column_values": column_values,
+        "row_totals": totals["row_totals"],
+        "column_totals": totals["column_totals"],
+        "cells": cells,
+        "failed_rows": failed_rows,
+        "total_found": totals["results"].get("found", 0),
+        "method": f"{len(searches)} consultas por linha em um único lote",
+    }
+
+
+def _format_pivot(data: dict[str, Any]) -> str:
+    """Formata a tabela dinâmica em Markdown (células vazias para zero)."""
+    rows, columns = data["rows"], data["columns"]
+    row_values, column_values = data["row_values"], data["column_values"]
+    cells = data["cells"]
+    failed_rows = set(data.get("failed_rows", []))
+
+    output = [f"# Tabela Dinâmica: {PIVOT_FIELDS[rows]} × {PIVOT_FIELDS[columns]}", ""]
+    if data["query"] != "*":
+        output.append(f"**Query:** `{data['query']}`")
+    output.append(f"**Total encontrado:** {data['total_found']:,} notícias")
+    output.append(f"*Método: {data['method']}*")
+    output.append("")
+
+    if not row_values or not column_values:
+        output.append("Nenhum dado encontrado.")
+        return "\n".join(output)
+
+    output.append(
+        f"| {PIVOT_FIELDS[rows]} \\ {PIVOT_FIELDS[columns]} | "
+        + " | ".join(column_values) + " | **Total** |"
+    )
+    output.append("|---|" + "---|" * (len(column_values) + 1))
+
+    for row in row_values:
+        if row in failed_rows:
+            row_cells = ["erro"] * len(column_values)
+        else:
+            row_cells = [
+                f"{cells[(row, column)]:,}" if cells.get((row, column)) else ""
+                for column in column_values
+            ]
+        output.append(
+            f"| {row} | " + " | ".join(row_cells) + f" | **{data['row_totals'].get(row, 0):,}** |"
+        )
+
+    output.append(
+        "| **Total** | "
+        + " | ".join(f"**{data['column_totals'].get(column, 0):,}**" for column in column_values)
+        + f" | **{data['total_found']:,}** |"
+    )
+
+    output.append("")
+    filled = sum(1 for count in cells.values() if count)
+    output.append(
+        f"*{filled} de {len(row_values) * len(column_values)} células com notícias "
+        "(células vazias = nenhuma notícia). Os totais incluem valores fora das "
+        "linhas e colunas exibidas.*"
+    )
+    if failed_rows:
+        output.append("")
+        output.append(f"**Linhas com erro:** {', '.join(sorted(failed_rows))}")
+
+    return "\n".join(output)
@@ -0,0 +1,219 @@
+"""
+Tool de relatório consolidado de um tema (plano do prompt analyze_theme).
+"""
+
+import logging
+import time
+from typing import Any
+
+from ..schema import get_collection_schema
+from ..typesense_client import get_async_typesense_client
+from ..utils.batch import multi_search_groups
+from ..utils.formatters import build_projection_params, format_timestamp, get_highlight_snippet
+from ..utils.stats import compute_series_stats
+from ..utils.temporal import build_temporal_plans, plan_temporal_distribution
+
+logger = logging.getLogger(__name__)
+
+# Campos agregados no relatório e seus títulos
+REPORT_FACETS = {
+    "agency": "Principais Agências",
+    "theme_1_level_1": "Temas Relacionados",
+    "category": "Categorias",
+}
+
+
+async def theme_report(
+    theme: str,
+    months: int = 12,
+    weeks: int = 8,
+    top_news: int = 5,
+    top_values: int = 10
+) -> str:
+    """
+    Gera um relatório completo de um tema em uma única chamada.
+
+    Executa todo o roteiro do prompt `analyze_theme` no servidor: volume
+    total, evolução mensal, últimas semanas, principais agências, temas e
+    categorias relacionados e notícias mais relevantes. Todas as consultas
+    são enviadas ao Typesense em um único multi_search.
+
+    Args:
+        theme: Tema a ser analisado (ex: "educação", "meio ambiente")
+        months: Meses na evolução mensal (1-60, padrão: 12)
+        weeks: Semanas na análise recente (1-52, padrão: 8)
+        top_news: Notícias mais relevantes a listar (1-20, padrão: 5)
+        top_values: Máximo de agências/temas/categorias (1-50, padrão: 10)
+
+    Returns:
+        String formatada em Markdown com o relatório consolidado
+
+    Examples:
+        >>> await theme_report("educação")
+        # Relatório dos últimos 12 meses e 8 semanas sobre educação
+
+        >>> await theme_report("saúde", months=24, weeks=12)
+        # Relatório com janela mensal e semanal maiores
+    """
+    months = min(max(1, months), 60)
+    weeks = min(max(1, weeks), 52)
+    top_news = min(max(1, top_news), 20)
+    top_values = min(max(1, top_values), 50)
+
+    logger.info(
+        f"Building theme report: theme='{theme}', months={months}, weeks={weeks}, "
+        f"top_news={top_news}, top_values={top_values}"
+    )
+
+    try:
+        schema = get_collection_schema("news")
+        facet_fields = [
+            field for field in REPORT_FACETS
+            if await schema.is_facetable(field, default=True)
+        ]
+
+        # Uma busca traz volume, notícias mais relevantes e todas as agregações
+        overview_search = {
+            "collection": "news",
+            "q": theme,
+            "query_by": "title,content",
+            "per_page": top_news,
+            **build_projection_params(theme),
+        }
+        if facet_fields:
+            overview_search["facet_by"] = ",".join(facet_fields)
+            overview_search["max_facet_values"] = top_values
+
+        monthly_plan = await plan_temporal_distribution(theme, "monthly", max_periods=months)
+        weekly_plan = await plan_temporal_distribution(theme, "weekly", max_periods=weeks)
+
+        client = get_async_typesense_client()
+        started = time.perf_counter()
+        overview, monthly_results, weekly_results = await multi_search_groups(client, [
+            [overview_search],
+            monthly_plan.searches,
+            weekly_plan.searches,
+        ])
+        overview = overview[0]
+        if "error" in overview:
+            raise RuntimeError(overview["error"])
+
+        # Séries por facet que falharem são refeitas com uma contagem por período
+        monthly, weekly = await build_temporal_plans(
+            client, [monthly_plan, weekly_plan], [monthly_results, weekly_results]
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        return _format_report({
+            "theme": theme,
+            "overview": overview,
+            "monthly": monthly,
+            "weekly": weekly,
+            "queries": 1 + len(monthly_plan.searches) + len(weekly_plan.searches),
+            "elapsed_ms": elapsed_ms,
+        })
+
+    except Exception as e:
+        logger.error(f"Error building theme report: {e}", exc_info=True)
+        return f"""# Erro ao Gerar Relatório
+
+**Erro:** {str(e)}
+**Tema:** `{theme}`
+
+Tente novamente ou use as ferramentas individuais (`search_news`, `analyze_temporal`, `get_facets`)."""
+
+
+def _format_report(data: dict[str, Any]) -> str:
+    """Formata o relatório consolidado em Markdown."""
+    overview = data["overview"]
+    total = overview.get("found", 0)
+
+    output = [f"# Relatório do Tema: {data['theme']}", ""]
+    output.append(f"**Total de notícias:** {total:,}")
+    output.append(
+        f"*{data['queries']} consultas em um único lote | "
+        f"tempo de backend: {data['elapsed_ms']:.0f} ms*"
+    )
+    output.append("")
+
+    output.append("## Evolução Mensal")
+    output.append("")
+    output.extend(_format_series(data["monthly"]))
+
+    output.append("## Últimas Semanas")
+    output.append("")
+    output.extend(_format_series(data["weekly"]))
+
+    for facet in overview.get("facet_counts", []):
+        counts = facet.get("counts", [])
+        title = REPORT_FACETS.get(facet.get("field_name"), facet.get("field_name"))
+        output.append(f"## {title}")
+        output.append("")
+        if not counts:
+            output.append("Nenhum valor encontrado.")
+            output.append("")
+            continue
+
+        output.append("| Item | Quantidade | % do Total |")
+        output.append("|------|------------|------------|")
+        for count in counts:
+            share = count["count"] / total * 100 if total else 0
+            output.append(f"| {count['value']} | {count['count']:,} | {share:.1f}% |")
+
+        listed = sum(count["count"] for count in counts)
+        if total:
+            output.append("")
+            output.append(f"*Os {len(counts)} itens listados concentram {listed / total * 100:.1f}% das notícias.*")
+        output.append("")
+
+    output.append("## Notícias Mais Relevantes")
+    output.append("")
+    hits = overview.get("hits", [])
+    if not hits:
+        output.append("Nenhuma notícia encontrada.")
+    for i, hit in enumerate(hits, 1):
+        doc = hit.get("document", {})
+        metadata = " | ".join(filter(None, [
+            doc.get("agency"),
+            format_timestamp(doc.get("published_at")) if doc.get("published_at") else None,
+            doc.get("url"),
+        ]))
+        output.append(f"{i}. **{doc.get('title', 'Sem título')}**")
+        if metadata:
+            output.append(f"   {metadata}")
+        if snippet := get_highlight_snippet(hit, "content"):
+            output.append(f"   ...{snippet.strip()}...")
+
+    return "\n".join(output)
+
+
+def _format_series(series: dict[str, Any]) -> list[str]:
+    """Formata uma série temporal do relatório como tabela com resumo."""
+    if "error" in series:
+        return [f"Não foi possível calcular a série: {series['error']}", ""]
+
+    distribution = series.get("distribution", [])
+    if not distribution:
+        return ["Nenhum dado encontrado para o período.", ""]
+
+    lines = ["| Período | Quantidade |", "|---------|------------|"]
+    lines.extend(f"| {item['label']} | {item['count']:,} |" for item in distribution)
+    lines.append("")
+
+    stats = compute_series_stats(distribution, series.get("granularity", ""))
+    lines.append(
+        f"- **Média por período:** {stats['mean']:.0f} | "
+        f"**Pico:** {stats['max']['count']:,} ({stats['max']['label']})"
+    )
+    if stats["last_change"] is not None:
+        lines.append(f"- **Último período vs anterior:** {stats['last_change']:+.1f}%")
+    if stats["anomalies"]:
+        lines.append("- **Períodos atípicos:** " + ", ".join(
+            f"{anomaly['label']} ({anomaly['direction']})" for anomaly in stats["anomalies"]
+        ))
+
+    for item in series.get("failed_periods", []):
+        lines.append(f"- {item['label']}: erro ({item['error']})")
+
+    lines.append("")
+    return lines
@@ -1,15 +1,34 @@
 """Search tool for GovBRNews MCP Server."""
 
 import logging
-from typing import Literal
+from datetime import datetime
+from typing import Any, Literal
 
-from ..typesense_client import typesense_client
-from ..utils.formatters import format_search_results
+import numpy as np
+
+from ..config import get_settings
+from ..schema import get_collection_schema
+from ..similarity import (
+    cluster_duplicates,
+    duplicate_text,
+    get_duplicate_index,
+    get_vector_index,
+    minhash_signature,
+)
+from ..typesense_client import MAX_PER_PAGE, get_async_typesense_client
+from ..utils.batch import build_exact_filter
+from ..utils.formatters import add_missing_content, build_projection_params, format_search_results
 
 logger = logging.getLogger(__name__)
 
+# Resultados buscados por resultado exibido ao agrupar duplicatas
+DEDUPE_OVERFETCH = 3
+
+# Constante do Reciprocal Rank Fusion (atenua a diferença entre as primeiras posições)
+RRF_K = 60
 
-def search_news(
+
+async def search_news(
     query: str,
     agencies: list[str] | None = None,
     year_from: int | None = None,
@@ -17,6 +36,8 @@ def search_news(
     themes: list[str] | None = None,
     limit: int = 10,
     sort: Literal["relevant", "newest", "oldest"] = "relevant",
+    dedupe: bool = False,
+    semantic: bool = False,
 ) -> str:
     """
     Busca notícias governamentais brasileiras no dataset GovBRNews.
@@ -32,6 +53,12 @@ def search_news(
             - "relevant": Por relevância (padrão)
             - "newest": Mais recentes primeiro
             - "oldest": Mais antigos primeiro
+        dedupe: Agrupar republicações quase idênticas (ex: o mesmo release
+            em várias agências), mantendo só a publicação mais antiga de
+            cada grupo (padrão: False)
+        semantic: Combinar a busca por palavras-chave com a busca semântica
+            local (embeddings do índice vetorial), que encontra notícias
+            escritas com outras palavras (padrão: False)
 
     Returns:
         Resultados formatados em Markdown com:
@@ -39,21 +66,33 @@ def search_news(
         - Lista de notícias com título, agência, data, resumo e link
 
     Examples:
-        >>> search_news("educação", limit=5)
-        >>> search_news("saúde", agencies=["Ministério da Saúde"], year_from=2024)
-        >>> search_news("tecnologia", sort="newest", limit=20)
+        >>> await search_news("educação", limit=5)
+        >>> await search_news("saúde", agencies=["Ministério da Saúde"], year_from=2024)
+        >>> await search_news("tecnologia", sort="newest", limit=20)
+        >>> await search_news("vacinação", dedupe=True)
+        >>> await search_news("como o governo combate a dengue", semantic=True)
     """
     try:
         logger.info(f"Searching for: '{query}' with filters - agencies: {agencies}, "
                    f"year_from: {year_from}, year_to: {year_to}, themes: {themes}")
 
+        limit = min(max(limit, 1), 100)  # Clamp between 1-100
+
         # Build search parameters
         search_params = {
             "q": query,
             "query_by": "title,content",
-            "per_page": min(max(limit, 1), 100),  # Clamp between 1-100
+            "per_page": limit,
+            # Only metadata and a server-side snippet, not the full article body
+            **build_projection_params(query),
         }
 
+        if dedupe:
+            # Extra results replace hidden copies; the body is needed to compare them
+            search_params["per_page"] = min(limit * DEDUPE_OVERFETCH, MAX_PER_PAGE)
+            if "content" not in search_params["include_fields"].split(","):
+                search_params["include_fields"] += ",content"
+
         # Build filters
         filters = []
 
@@ -63,11 +102,8 @@ def search_news(
             agency_filter = " || ".join([f"agency:={a}" for a in escaped_agencies])
             filters.append(f"({agency_filter})")
 
-        if year_from:
-            filters.append(f"published_year:>={year_from}")
-
-        if year_to:
-            filters.append(f"published_year:<={year_to}")
+        if year_from or year_to:
+            filters.extend(await _build_year_filters(year_from, year_to))
 
         if themes:
             escaped_themes = [t.replace(":", "\\:") for t in themes]
@@ -85,12 +121,34 @@ def search_news(
         # "relevant" uses default Typesense ranking
 
         # Execute search
-        results = typesense_client.search("news", search_params)
+        client = get_async_typesense_client()
+        notes = []
+        if semantic:
+            results, note = await _hybrid_search(client, query, search_params, sort)
+            notes.append(note)
+        else:
+            results = await client.search("news", search_params)
 
         logger.info(f"Search completed: found {results.get('found', 0)} results")
 
+        if dedupe:
+            hits, hidden = _collapse_duplicates(results.get("hits", []))
+            results = {**results, "hits": hits}
+            if hidden:
+                notes.append(
+                    f"*{hidden} cópias quase idênticas ocultadas "
+                    "(mantida a publicação mais antiga de cada grupo).*"
+                )
+
+        # Title-only matches have no content snippet: fetch the body for the summary
+        hits = await add_missing_content(client, results.get("hits", [])[:limit])
+        results = {**results, "hits": hits}
+
         # Format results for LLM
-        return format_search_results(results)
+        formatted = format_search_results(results)
+        for note in notes:
+            formatted += f"\n{note}\n"
+        return formatted
 
     except Exception as e:
         logger.error(f"Search failed: {e}", exc_info=True)
@@ -98,3 +156,150 @@ def search_news(
             f"Erro ao buscar notícias: {str(e)}\n\n"
             f"Verifique se o servidor Typesense está rodando e acessível."
         )
+
+
+async def _build_year_filters(year_from: int | None, year_to: int | None) -> list[str]:
+    """
+    Build year range filters.
+
+    Uses the indexed `published_year` field when the schema has it, and falls
+    back to a `published_at` timestamp range otherwise.
+    """
+    schema = get_collection_schema("news")
+    filters = []
+
+    if await schema.has_field("published_year", default=True):
+        if year_from:
+            filters.append(f"published_year:>={year_from}")
+        if year_to:
+            filters.append(f"published_year:<={year_to}")
+    else:
+        if year_from:
+            filters.append(f"published_at:>={int(datetime(year_from, 1, 1).timestamp())}")
+        if year_to:
+            filters.append(f"published_at:<{int(datetime(year_to + 1, 1, 1).timestamp())}")
+
+    return filters
+
+
+async def _hybrid_search(
+    client,
+    query: str,
+    search_params: dict[str, Any],
+    sort: str
+) -> tuple[dict[str, Any], str]:
+    """
+    Busca por palavras-chave combinada com a busca semântica local.
+
+    Os vizinhos da consulta no índice vetorial são buscados no Typesense com
+    os mesmos filtros, no mesmo multi_search da busca por palavras-chave. As
+    duas listas são combinadas por Reciprocal Rank Fusion (ou por data, se a
+    ordenação pedida for por data).
+
+    Returns:
+        Tupla (resposta com os hits combinados, nota sobre a busca semântica)
+    """
+    index = get_vector_index()
+    if index is None:
+        results = await client.search("news", search_params)
+        return results, "*Busca semântica indisponível: índice vetorial não configurado.*"
+
+    neighbors = index.most_similar(
+        query, search_params["per_page"], nprobe=get_settings().vector_nprobe
+    )
+    if not neighbors:
+        results = await client.search("news", search_params)
+        return results, "*Busca semântica: nenhuma notícia próxima da consulta.*"
+
+    id_filter = build_exact_filter("id", [doc_id for doc_id, _ in neighbors])
+    filter_by = search_params.get("filter_by")
+    semantic_search = {
+        "collection": "news",
+        "q": "*",
+        "query_by": "title,content",
+        "filter_by": f"{id_filter} && {filter_by}" if filter_by else id_filter,
+        "per_page": len(neighbors),
+        **build_projection_params("*"),
+    }
+
+    keyword, semantic = await client.multi_search(
+        [{"collection": "news", **search_params}, semantic_search]
+    )
+    if "error" in keyword:
+        raise RuntimeError(keyword["error"])
+    if "error" in semantic:
+        logger.warning(f"Semantic search failed: {semantic['error']}")
+        return keyword, "*Busca semântica indisponível nesta consulta.*"
+
+    # Hits semânticos na ordem de similaridade, não na ordem do Typesense
+    rank = {doc_id: i for i, (doc_id, _) in enumerate(neighbors)}
+    semantic_hits = sorted(
+        semantic.get("hits", []), key=lambda hit: rank[str(hit["document"].get("id"))]
+    )
+
+    hits = _fuse_rankings([keyword.get("hits", []), semantic_hits])
+    if sort != "relevant":
+        hits.sort(
+            key=lambda hit: hit["document"].get("published_at") or 0,
+            reverse=sort == "newest",
+        )
+
+    added = len(hits) - len(keyword.get("hits", []))
+    note = (
+        f"*Busca híbrida: {len(semantic_hits)} resultados semânticos (índice vetorial local), "
+        f"{added} não encontrados por palavras-chave.*"
+    )
+    return {**keyword, "hits": hits}, note
+
+
+def _fuse_rankings(rankings: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """
+    Combina listas de hits por Reciprocal Rank Fusion.
+
+    Cada hit soma 1 / (RRF_K + posição) em cada lista em que aparece; hits
+    repetidos mantêm a versão da primeira lista (com o trecho destacado).
+    """
+    scores: dict[str, float] = {}
+    hits: dict[str, dict[str, Any]] = {}
+    for ranking in rankings:
+        for position, hit in enumerate(ranking, 1):
+            doc_id = str(hit["document"].get("id"))
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1 / (RRF_K + position)
+            hits.setdefault(doc_id, hit)
+
+    return [hits[doc_id] for doc_id in sorted(scores, key=scores.__getitem__, reverse=True)]
+
+
+def _collapse_duplicates(hits: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], int]:
+    """
+    Agrupa hits quase idênticos e mantém a publicação mais antiga de cada grupo.
+
+    Usa as assinaturas do índice de duplicatas quando disponível e, para os
+    demais hits, calcula a assinatura do título e do conteúdo.
+
+    Returns:
+        Tupla (hits mantidos na posição do primeiro hit de cada grupo,
+        quantidade de hits ocultados)
+    """
+    if len(hits) < 2:
+        return hits, 0
+
+    index = get_duplicate_index()
+    signatures = []
+    for hit in hits:
+        doc = hit.get("document", {})
+        signature = index.signature_of(str(doc.get("id"))) if index is not None else None
+        signatures.append(signature if signature is not None else minhash_signature(duplicate_text(doc)))
+
+    groups = cluster_duplicates(np.stack(signatures), get_settings().duplicate_threshold)
+
+    # Grupos na ordem do seu hit mais bem ranqueado
+    members: dict[int, list[int]] = {}
+    for i, group in enumerate(groups):
+        members.setdefault(group, []).append(i)
+
+    def published_at(i: int) -> float:
+        return hits[i].get("document", {}).get("published_at") or float("inf")
+
+    kept = [hits[min(group, key=published_at)] for group in members.values()]
+    return kept, len(hits) - len(kept)
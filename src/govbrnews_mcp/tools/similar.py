@@ -3,25 +3,43 @@ Tool para encontrar notícias similares do dataset GovBRNews.
 """
 
 import logging
+import time
 from typing import Any
 
-from ..typesense_client import get_typesense_client
-from ..utils.formatters import format_search_results
+from ..config import get_settings
+from ..similarity import TfidfIndex, document_text, get_similarity_index
+from ..similarity.candidates import build_candidate_search, parse_candidates, search_candidates
+from ..similarity.rerank import rerank_candidates
+from ..typesense_client import get_async_typesense_client
+from ..utils.batch import build_exact_filter
+from ..utils.formatters import build_projection_params, format_search_results, format_timestamp
 
 logger = logging.getLogger(__name__)
 
+# Vizinhos do índice do corpus reranqueados por resultado pedido
+INDEX_POOL_FACTOR = 10
 
-def similar_news(
+# Máximo de notícias de referência por chamada de similar_news_batch
+MAX_BATCH_REFERENCES = 50
+
+
+async def similar_news(
     reference_id: str,
     limit: int = 5
 ) -> str:
     """
     Encontra notícias similares a uma notícia de referência.
 
-    A similaridade é determinada por:
-    1. Mesma agência governamental
-    2. Mesmo tema principal
-    3. Período temporal próximo
+    Funciona em dois estágios:
+    1. Candidatos: com o índice do corpus configurado
+       (`SIMILARITY_INDEX_PATH`), os vizinhos de conteúdo em todo o acervo;
+       sem índice, uma busca no Typesense pelos termos do título, restrita a
+       uma janela de datas em torno da referência
+    2. Reranqueamento local: similaridade de conteúdo (vetores TF-IDF em
+       português, cosseno) combinada com mesma agência, mesmo tema e
+       proximidade de data
+
+    Se nenhuma notícia tiver conteúdo similar, usa mesma agência e tema.
 
     Args:
         reference_id: ID da notícia de referência no Typesense
@@ -31,10 +49,10 @@ def similar_news(
         String formatada em Markdown com notícias similares
 
     Examples:
-        >>> similar_news("254647")
+        >>> await similar_news("254647")
         # Retorna 5 notícias similares à notícia 254647
 
-        >>> similar_news("254647", limit=10)
+        >>> await similar_news("254647", limit=10)
         # Retorna 10 notícias similares
     """
     # Validar limit
@@ -42,14 +60,14 @@ def similar_news(
         limit = min(max(1, limit), 20)
         logger.warning(f"limit ajustado para {limit}")
 
-    client = get_typesense_client()
+    client = get_async_typesense_client()
 
     try:
         # 1. Buscar notícia de referência
         logger.info(f"Fetching reference document: {reference_id}")
 
         try:
-            reference_doc = client.get_document("news", reference_id)
+            reference_doc = await client.get_document("news", reference_id)
         except Exception as e:
             logger.error(f"Failed to get reference document {reference_id}: {e}")
             return f"""# Erro
@@ -58,7 +76,6 @@ Notícia com ID `{reference_id}` não encontrada.
 
 Verifique se o ID está correto e tente novamente."""
 
-        # 2. Extrair características para similaridade
         agency = reference_doc.get("agency")
         theme = reference_doc.get("theme_1_level_1")
         year = reference_doc.get("published_year")
@@ -66,45 +83,46 @@ Verifique se o ID está correto e tente novamente."""
 
         logger.info(f"Reference doc: agency={agency}, theme={theme}, year={year}")
 
-        # 3. Construir query de similaridade
-        # Prioridade: mesmo tema e agência > mesmo tema > mesma agência
-        filter_parts = []
-
-        if agency:
-            filter_parts.append(f"agency:={agency}")
-
-        if theme:
-            filter_parts.append(f"theme_1_level_1:={theme}")
-
-        # Se não tiver filtros, usa período temporal
-        if not filter_parts and year:
-            # Busca no mesmo ano ou próximo
-            year_range = f"published_year:>={year - 1} && published_year:<={year + 1}"
-            filter_parts.append(year_range)
-
-        filter_query = " && ".join(filter_parts) if filter_parts else None
-
-        # 4. Buscar notícias similares
-        search_params: dict[str, Any] = {
-            "q": "*",
-            "query_by": "title,content",
-            "per_page": limit + 1,  # +1 para excluir a própria notícia
-            "sort_by": "published_at:desc"
-        }
-
-        if filter_query:
-            search_params["filter_by"] = filter_query
-
-        logger.info(f"Searching similar news with filter: {filter_query}")
-
-        results = client.search("news", search_params)
-
-        # 5. Filtrar a própria notícia de referência
-        hits = results.get("hits", [])
-        similar_hits = [
-            hit for hit in hits
-            if hit["document"].get("id") != reference_id
-        ][:limit]
+        # 2. Candidatos: vizinhos no índice do corpus ou busca no Typesense
+        started = time.perf_counter()
+        index = get_similarity_index()
+        if index is not None:
+            text_scores, documents = await _index_candidates(client, index, reference_doc, limit)
+            source = f"índice do corpus ({len(index):,} notícias)"
+        else:
+            documents = await _typesense_candidates(client, reference_doc)
+            text_scores = None
+            source = f"{len(documents):,} candidatos do Typesense"
+        candidates_ms = (time.perf_counter() - started) * 1000
+
+        # 3. Reranqueamento local: conteúdo, agência, tema e data
+        started = time.perf_counter()
+        if text_scores is None:
+            text_scores = _candidate_text_scores(reference_doc, documents)
+        ranked = rerank_candidates(reference_doc, documents, text_scores, limit)
+        rerank_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"similar_news {reference_id}: {len(documents)} candidates in "
+            f"{candidates_ms:.1f} ms, rerank in {rerank_ms:.1f} ms"
+        )
+
+        if index is None and ranked:
+            # Candidatos do Typesense vêm só com um trecho: texto completo dos exibidos
+            full = await client.get_documents("news", [doc_id for doc_id, _ in ranked])
+            documents = {**documents, **full}
+
+        similar_hits = [{"document": documents[doc_id]} for doc_id, _ in ranked]
+        scores = [score for _, score in ranked]
+
+        if similar_hits:
+            criterion = (
+                "Conteúdo (TF-IDF, cosseno), agência, tema e proximidade temporal "
+                f"sobre {source}"
+            )
+        else:
+            # 4. Sem conteúdo similar: mesma agência e/ou tema
+            similar_hits = await _metadata_neighbors(client, reference_doc, limit)
+            criterion = "Mesma agência e/ou tema"
 
         if not similar_hits:
             return f"""# Notícias Similares
@@ -113,11 +131,12 @@ Verifique se o ID está correto e tente novamente."""
 **ID:** `{reference_id}`
 
 Nenhuma notícia similar encontrada com os critérios:
+- Conteúdo similar (TF-IDF)
 - Agência: {agency or 'N/A'}
 - Tema: {theme or 'N/A'}
 - Ano: {year or 'N/A'}"""
 
-        # 6. Formatar resultados
+        # 5. Formatar resultados
         similar_results = {
             "found": len(similar_hits),
             "hits": similar_hits
@@ -125,6 +144,12 @@ Nenhuma notícia similar encontrada com os critérios:
 
         formatted = format_search_results(similar_results)
 
+        score_line = ""
+        if scores:
+            score_line = "**Pontuação:** " + " | ".join(
+                f"{i}. {score:.2f}" for i, score in enumerate(scores, 1)
+            ) + f"\n*Candidatos: {candidates_ms:.0f} ms | Reranqueamento: {rerank_ms:.0f} ms*\n"
+
         # Adicionar cabeçalho com informações da referência
         header = f"""# Notícias Similares
 
@@ -134,9 +159,9 @@ Nenhuma notícia similar encontrada com os critérios:
 **Tema:** {theme or 'N/A'}
 **Ano:** {year or 'N/A'}
 
-**Critério de similaridade:** Mesma agência e/ou tema
+**Critério de similaridade:** {criterion}
 **Encontrado:** {len(similar_hits)} notícias similares
-
+{score_line}
 ---
 
 """
@@ -151,3 +176,356 @@ Nenhuma notícia similar encontrada com os critérios:
 **ID de referência:** `{reference_id}`
 
 Ocorreu um erro ao buscar notícias similares. Tente novamente."""
+
+
+async def similar_news_batch(
+    reference_ids: list[str],
+    limit: int = 5
+) -> str:
+    """
+    Encontra notícias similares a várias notícias de referência em uma chamada.
+
+    Usa o mesmo critério de similar_news, mas busca todas as referências em
+    uma única consulta e envia as buscas de candidatos de todas elas em um
+    único multi_search, em vez de duas requisições por referência.
+
+    Args:
+        reference_ids: IDs das notícias de referência (1-50)
+        limit: Máximo de notícias similares por referência (1-20, padrão: 5)
+
+    Returns:
+        String formatada em Markdown com uma tabela de notícias similares
+        por referência
+
+    Examples:
+        >>> await similar_news_batch(["254647", "254650", "254701"])
+        # 5 notícias similares para cada uma das três referências
+    """
+    reference_ids = list(dict.fromkeys(
+        str(reference_id).strip() for reference_id in reference_ids if str(reference_id).strip()
+    ))
+    if not 1 <= len(reference_ids) <= MAX_BATCH_REFERENCES:
+        return f"""# Erro
+
+Informe de 1 a {MAX_BATCH_REFERENCES} IDs de notícias de referência."""
+
+    limit = min(max(1, limit), 20)
+
+    try:
+        data = await find_similar_batch(reference_ids, limit)
+        return _format_batch(data)
+
+    except Exception as e:
+        logger.error(f"Error finding similar news in batch: {e}", exc_info=True)
+        return f"""# Erro ao Buscar Notícias Similares
+
+**Erro:** {str(e)}
+
+**IDs de referência:** {', '.join(f'`{reference_id}`' for reference_id in reference_ids)}
+
+Ocorreu um erro ao buscar notícias similares. Tente novamente."""
+
+
+async def find_similar_batch(
+    reference_ids: list[str],
+    limit: int = 5
+) -> dict[str, Any]:
+    """
+    Notícias similares a várias referências, agrupadas por referência.
+
+    Requisições ao Typesense, independentemente do número de referências:
+    1. Uma busca filtrada por ID com todas as referências
+    2. Candidatos: um multi_search com as buscas de todas as referências
+       (ou, com o índice do corpus, uma busca por ID de todos os vizinhos)
+    3. Só para referências sem vizinhos de conteúdo: um multi_search com o
+       critério de mesma agência e tema
+
+    Args:
+        reference_ids: IDs das notícias de referência
+        limit: Máximo de notícias similares por referência
+
+    Returns:
+        Dicionário com:
+        - "references": referências encontradas, na ordem pedida
+        - "missing": IDs não encontrados
+        - "similar": por ID de referência, pares (documento, pontuação);
+          a pontuação é None no critério de mesma agência e tema
+        - "criteria": por ID de referência, "content" ou "metadata"
+        - "candidates_ms" e "rerank_ms": tempo de cada estágio
+    """
+    client = get_async_typesense_client()
+    found = await client.get_documents("news", reference_ids)
+    references = {
+        reference_id: found[reference_id] for reference_id in reference_ids if reference_id in found
+    }
+    missing = [reference_id for reference_id in reference_ids if reference_id not in found]
+
+    # 1. Candidatos de todas as referências de uma vez
+    started = time.perf_counter()
+    index = get_similarity_index()
+    pools: dict[str, dict[str, float]] = {}
+    if index is not None:
+        pools = {
+            reference_id: dict(_index_pool(index, reference_doc, limit))
+            for reference_id, reference_doc in references.items()
+        }
+        neighbor_ids = [doc_id for pool in pools.values() for doc_id in pool]
+        documents = await client.get_documents("news", neighbor_ids) if neighbor_ids else {}
+        candidates = {
+            reference_id: {doc_id: documents[doc_id] for doc_id in pool if doc_id in documents}
+            for reference_id, pool in pools.items()
+        }
+    else:
+        settings = get_settings()
+        searches = {}
+        for reference_id, reference_doc in references.items():
+            search = build_candidate_search(
+                reference_doc, settings.similarity_candidates, settings.similarity_window_days
+            )
+            if search is not None:
+                searches[reference_id] = search
+        results = await client.multi_search(list(searches.values())) if searches else []
+        candidates = {
+            reference_id: parse_candidates(result, references[reference_id])
+            for reference_id, result in zip(searches, results)
+        }
+    candidates_ms = (time.perf_counter() - started) * 1000
+
+    # 2. Reranqueamento local de cada referência
+    started = time.perf_counter()
+    similar: dict[str, list[tuple[dict[str, Any], float | None]]] = {}
+    for reference_id, reference_doc in references.items():
+        documents = candidates.get(reference_id, {})
+        text_scores = (
+            pools[reference_id] if index is not None
+            else _candidate_text_scores(reference_doc, documents)
+        )
+        similar[reference_id] = [
+            (documents[doc_id], score)
+            for doc_id, score in rerank_candidates(reference_doc, documents, text_scores, limit)
+        ]
+    rerank_ms = (time.perf_counter() - started) * 1000
+    criteria = {reference_id: "content" for reference_id in references}
+
+    # 3. Sem conteúdo similar: mesma agência e/ou tema
+    fallback = [reference_id for reference_id in references if not similar[reference_id]]
+    if fallback:
+        results = await client.multi_search([
+            _metadata_search(references[reference_id], limit) for reference_id in fallback
+        ])
+        for reference_id, result in zip(fallback, results):
+            similar[reference_id] = [
+                (hit["document"], None)
+                for hit in _metadata_hits(result, references[reference_id], limit)
+            ]
+            criteria[reference_id] = "metadata"
+
+    logger.info(
+        f"similar_news_batch: {len(references)} references, candidates in "
+        f"{candidates_ms:.1f} ms, rerank in {rerank_ms:.1f} ms, "
+        f"{len(fallback)} metadata fallbacks"
+    )
+
+    return {
+        "references": references,
+        "missing": missing,
+        "similar": similar,
+        "criteria": criteria,
+        "candidates_ms": candidates_ms,
+        "rerank_ms": rerank_ms,
+    }
+
+
+def _format_batch(data: dict[str, Any]) -> str:
+    """Formata os resultados em lote com uma tabela por referência."""
+    references = data["references"]
+
+    output = ["# Notícias Similares em Lote", ""]
+    output.append(f"**Referências:** {len(references)}")
+    if data["missing"]:
+        output.append(
+            "**Não encontradas:** " + ", ".join(f"`{doc_id}`" for doc_id in data["missing"])
+        )
+    output.append(
+        f"*Candidatos: {data['candidates_ms']:.0f} ms | "
+        f"Reranqueamento: {data['rerank_ms']:.0f} ms*"
+    )
+
+    for i, (reference_id, reference_doc) in enumerate(references.items(), 1):
+        output.append("")
+        output.append(f"## {i}. {reference_doc.get('title', 'Sem título')}")
+        output.append("")
+        output.append(f"**ID:** `{reference_id}`")
+
+        similar = data["similar"][reference_id]
+        if not similar:
+            output.append("")
+            output.append("Nenhuma notícia similar encontrada.")
+            continue
+
+        criterion = (
+            "Conteúdo, agência, tema e proximidade temporal"
+            if data["criteria"][reference_id] == "content" else "Mesma agência e/ou tema"
+        )
+        output.append(f"**Critério:** {criterion}")
+        output.append("")
+        output.append("| # | ID | Título | Agência | Publicado | Pontuação |")
+        output.append("|---|----|--------|---------|-----------|-----------|")
+        for j, (doc, score) in enumerate(similar, 1):
+            output.append(
+                f"| {j} | `{doc.get('id')}` | {doc.get('title', 'Sem título')} | "
+                f"{doc.get('agency') or 'N/A'} | {format_timestamp(doc.get('published_at'))} | "
+                f"{'—' if score is None else f'{score:.2f}'} |"
+            )
+
+    return "\n".join(output)
+
+
+async def _index_candidates(
+    client,
+    index: TfidfIndex,
+    reference_doc: dict[str, Any],
+    limit: int
+) -> tuple[dict[str, float], dict[str, dict[str, Any]]]:
+    """
+    Vizinhos da referência no índice em disco, com os documentos buscados.
+
+    Traz INDEX_POOL_FACTOR candidatos por resultado pedido (até
+    `similarity_candidates`), para que o reranqueamento tenha o que reordenar.
+
+    Returns:
+        Tupla (cosseno por ID, documentos por ID)
+    """
+    ranked = _index_pool(index, reference_doc, limit)
+    if not ranked:
+        return {}, {}
+
+    documents = await client.get_documents("news", [doc_id for doc_id, _ in ranked])
+    # Documentos removidos do Typesense depois da indexação ficam de fora
+    return dict(ranked), documents
+
+
+def _index_pool(
+    index: TfidfIndex,
+    reference_doc: dict[str, Any],
+    limit: int
+) -> list[tuple[str, float]]:
+    """Vizinhos da referência no índice em disco: pares (id, cosseno)."""
+    pool_size = min(limit * INDEX_POOL_FACTOR, max(limit, get_settings().similarity_candidates))
+    return index.most_similar(
+        document_text(reference_doc), pool_size, exclude={str(reference_doc.get("id"))}
+    )
+
+
+async def _typesense_candidates(
+    client,
+    reference_doc: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    """
+    Notícias do Typesense que compartilham termos com a referência.
+
+    Uma única busca pelos termos do título (o Typesense descarta termos até
+    reunir candidatos suficientes), restrita à janela de datas configurada.
+    Os candidatos trazem só os campos do reranqueamento e um trecho do
+    conteúdo.
+
+    Returns:
+        Candidatos por ID
+    """
+    settings = get_settings()
+    return await search_candidates(
+        client, reference_doc, settings.similarity_candidates, settings.similarity_window_days
+    )
+
+
+def _candidate_text_scores(
+    reference_doc: dict[str, Any],
+    documents: dict[str, dict[str, Any]]
+) -> dict[str, float]:
+    """
+    Cosseno TF-IDF entre a referência e cada candidato.
+
+    O índice é montado só sobre os candidatos (e a referência), de forma que
+    o IDF reflete o vocabulário do conjunto comparado.
+
+    Returns:
+        Cosseno por ID (candidatos sem termos em comum ficam de fora)
+    """
+    if not documents:
+        return {}
+
+    reference_id = str(reference_doc.get("id"))
+    index = TfidfIndex.build(
+        [(reference_id, document_text(reference_doc))]
+        + [(doc_id, document_text(doc)) for doc_id, doc in documents.items()]
+    )
+    return dict(index.most_similar(
+        document_text(reference_doc), len(documents), exclude={reference_id}
+    ))
+
+
+async def _metadata_neighbors(
+    client,
+    reference_doc: dict[str, Any],
+    limit: int
+) -> list[dict[str, Any]]:
+    """
+    Notícias mais recentes da mesma agência e tema (critério sem conteúdo).
+
+    Returns:
+        Hits de busca, sem a própria notícia de referência
+    """
+    search = _metadata_search(reference_doc, limit)
+    logger.info(f"Searching similar news with filter: {search.get('filter_by')}")
+
+    results = await client.search(search.pop("collection"), search)
+    return _metadata_hits(results, reference_doc, limit)
+
+
+def _metadata_search(reference_doc: dict[str, Any], limit: int) -> dict[str, Any]:
+    """Busca de _metadata_neighbors() no formato multi_search (com `collection`)."""
+    agency = reference_doc.get("agency")
+    theme = reference_doc.get("theme_1_level_1")
+    year = reference_doc.get("published_year")
+
+    # Prioridade: mesmo tema e agência > mesmo tema > mesma agência
+    filter_parts = []
+
+    if agency:
+        filter_parts.append(build_exact_filter("agency", agency))
+
+    if theme:
+        filter_parts.append(build_exact_filter("theme_1_level_1", theme))
+
+    # Se não tiver filtros, usa período temporal
+    if not filter_parts and year:
+        # Busca no mesmo ano ou próximo
+        year_range = f"published_year:>={year - 1} && published_year:<={year + 1}"
+        filter_parts.append(year_range)
+
+    search: dict[str, Any] = {
+        "collection": "news",
+        "q": "*",
+        "query_by": "title,content",
+        "per_page": limit + 1,  # +1 para excluir a própria notícia
+        "sort_by": "published_at:desc",
+        **build_projection_params("*")
+    }
+
+    if filter_parts:
+        search["filter_by"] = " && ".join(filter_parts)
+
+    return search
+
+
+def _metadata_hits(
+    results: dict[str, Any],
+    reference_doc: dict[str, Any],
+    limit: int
+) -> list[dict[str, Any]]:
+    """Hits de _metadata_search(), sem a própria notícia de referência."""
+    reference_id = str(reference_doc.get("id"))
+    return [
+        hit for hit in results.get("hits", [])
+        if str(hit["document"].get("id")) != reference_id
+    ][:limit]
@@ -3,13 +3,45 @@ Tool para análise temporal de notícias com diferentes granularidades.
 """
 
 import logging
+import time
+from datetime import datetime
+from typing import Any
 
-from ..utils.temporal import get_temporal_distribution, format_temporal_distribution
+from ..typesense_client import get_async_typesense_client
+from ..utils.batch import build_exact_filter
+from ..utils.temporal import (
+    get_temporal_distribution,
+    format_temporal_distribution,
+    plan_temporal_distribution,
+    run_temporal_plans,
+)
+from ..utils.stats import compute_series_stats
 
 logger = logging.getLogger(__name__)
 
+# Máximo de períodos por granularidade
+MAX_PERIODS = {
+    "yearly": 50,
+    "monthly": 60,
+    "weekly": 52,
+    "daily": 366,
+}
 
-def analyze_temporal(
+# Máximo de séries em uma análise comparativa
+MAX_SERIES = 10
+
+INVALID_GRANULARITY = """# Erro
+
+Granularidade inválida: `{granularity}`
+
+**Granularidades válidas:**
+- `yearly` - Distribuição anual
+- `monthly` - Distribuição mensal (recomendado)
+- `weekly` - Distribuição semanal (máx 52 semanas)
+- `daily` - Distribuição diária (máx 366 dias)"""
+
+
+async def analyze_temporal(
     query: str,
     granularity: str = "monthly",
     year_from: int | None = None,
@@ -23,6 +55,7 @@ def analyze_temporal(
     - **Anual (yearly)**: Distribuição por ano
     - **Mensal (monthly)**: Distribuição por mês [RECOMENDADO]
     - **Semanal (weekly)**: Distribuição por semana (máx 52 semanas/1 ano)
+    - **Diária (daily)**: Distribuição por dia (máx 366 dias), para detectar picos
 
     Args:
         query: Termo de busca para filtrar notícias
@@ -30,50 +63,48 @@ def analyze_temporal(
                      - "yearly": Distribuição anual
                      - "monthly": Distribuição mensal (padrão)
                      - "weekly": Distribuição semanal
+                     - "daily": Distribuição diária (dias sem notícias com zero)
         year_from: Filtrar a partir deste ano (opcional)
         year_to: Filtrar até este ano (opcional)
         max_periods: Máximo de períodos para retornar (padrão: 24)
                      - yearly: máx 50 anos
                      - monthly: máx 60 meses (5 anos)
                      - weekly: máx 52 semanas (1 ano)
+                     - daily: máx 366 dias
 
     Returns:
-        String formatada em Markdown com distribuição temporal e estatísticas
+        String formatada em Markdown com distribuição temporal, média móvel e
+        estatísticas (crescimento, períodos atípicos, sazonalidade e
+        comparação com o ano anterior, quando a série permite; a semanal,
+        limitada a 52 semanas, não tem comparação anual)
 
     Examples:
-        >>> analyze_temporal("educação", "monthly", 2024, 2025)
+        >>> await analyze_temporal("educação", "monthly", 2024, 2025)
         # Distribuição mensal de notícias sobre educação em 2024-2025
 
-        >>> analyze_temporal("saúde", "weekly", max_periods=12)
+        >>> await analyze_temporal("saúde", "weekly", max_periods=12)
         # Últimas 12 semanas de notícias sobre saúde
 
-        >>> analyze_temporal("meio ambiente", "yearly")
+        >>> await analyze_temporal("vacinação", "daily", max_periods=90)
+        # Últimos 90 dias, dia a dia, para identificar picos de anúncios
+
+        >>> await analyze_temporal("meio ambiente", "yearly")
         # Distribuição anual de notícias sobre meio ambiente
 
     Notes:
         - Granularidade MENSAL é a mais recomendada (balance entre detalhe e performance)
         - Granularidade SEMANAL limitada a 52 semanas (1 ano) por performance
         - Use year_from/year_to para focar em períodos específicos
+        - Períodos atípicos (picos e quedas) são marcados pelo escore robusto
+          baseado no desvio absoluto mediano, a partir de 6 períodos
     """
     try:
         # Validar granularity
-        if granularity not in ["yearly", "monthly", "weekly"]:
-            return f"""# Erro
-
-Granularidade inválida: `{granularity}`
-
-**Granularidades válidas:**
-- `yearly` - Distribuição anual
-- `monthly` - Distribuição mensal (recomendado)
-- `weekly` - Distribuição semanal (máx 52 semanas)"""
+        if granularity not in MAX_PERIODS:
+            return INVALID_GRANULARITY.format(granularity=granularity)
 
         # Validar max_periods por granularidade
-        if granularity == "yearly" and max_periods > 50:
-            max_periods = 50
-        elif granularity == "monthly" and max_periods > 60:
-            max_periods = 60
-        elif granularity == "weekly" and max_periods > 52:
-            max_periods = 52
+        max_periods = min(max_periods, MAX_PERIODS[granularity])
 
         logger.info(
             f"Analyzing temporal distribution: query='{query}', "
@@ -82,7 +113,7 @@ Granularidade inválida: `{granularity}`
         )
 
         # Obter distribuição temporal
-        data = get_temporal_distribution(
+        data = await get_temporal_distribution(
             query=query,
             granularity=granularity,
             year_from=year_from,
@@ -103,3 +134,191 @@ Granularidade inválida: `{granularity}`
 **Granularidade:** {granularity}
 
 Tente novamente com parâmetros diferentes."""
+
+
+async def analyze_temporal_multi(
+    queries: list[str] | None = None,
+    agencies: list[str] | None = None,
+    themes: list[str] | None = None,
+    granularity: str = "monthly",
+    query: str = "*",
+    year_from: int | None = None,
+    year_to: int | None = None,
+    max_periods: int = 24
+) -> str:
+    """
+    Compara a evolução temporal de várias séries em uma única chamada.
+
+    Cada série é uma query, uma agência ou um tema (informe apenas uma das
+    listas). Todas as consultas de todas as séries são enviadas em um único
+    multi_search e as séries são alinhadas em um eixo de períodos comum.
+
+    Args:
+        queries: Termos de busca, um por série (ex: ["educação", "saúde"])
+        agencies: Agências, uma por série (ex: ["mec", "saude"])
+        themes: Temas principais (theme_1_level_1), um por série
+        granularity: "yearly", "monthly" (padrão), "weekly" ou "daily"
+        query: Termo de busca aplicado a todas as séries de agências ou
+               temas (padrão: "*")
+        year_from: Filtrar a partir deste ano (opcional)
+        year_to: Filtrar até este ano (opcional)
+        max_periods: Máximo de períodos (padrão: 24, com os mesmos limites
+                     de analyze_temporal)
+
+    Returns:
+        String formatada em Markdown com uma tabela (um período por linha,
+        uma série por coluna) e estatísticas por série
+
+    Examples:
+        >>> await analyze_temporal_multi(queries=["educação", "saúde", "segurança"])
+        # Evolução mensal das três queries lado a lado
+
+        >>> await analyze_temporal_multi(agencies=["mec", "capes"], granularity="weekly", query="bolsas")
+        # Evolução semanal de notícias sobre bolsas no MEC e na CAPES
+    """
+    given = [
+        (field, values) for field, values in
+        (("q", queries), ("agency", agencies), ("theme_1_level_1", themes))
+        if values
+    ]
+    if len(given) != 1:
+        return """# Erro
+
+Informe exatamente uma das listas: `queries`, `agencies` ou `themes`."""
+
+    field, values = given[0]
+    values = list(dict.fromkeys(value.strip() for value in values if value.strip()))
+    if not 1 <= len(values) <= MAX_SERIES:
+        return f"""# Erro
+
+Informe de 1 a {MAX_SERIES} séries distintas para comparar."""
+
+    if granularity not in MAX_PERIODS:
+        return INVALID_GRANULARITY.format(granularity=granularity)
+
+    max_periods = min(max(1, max_periods), MAX_PERIODS[granularity])
+
+    logger.info(
+        f"Analyzing temporal series: {field}={values}, query='{query}', "
+        f"granularity={granularity}, year_from={year_from}, "
+        f"year_to={year_to}, max_periods={max_periods}"
+    )
+
+    try:
+        # Mesma data de referência para que todas as séries tenham os mesmos períodos
+        now = datetime.now()
+        plans = []
+        for value in values:
+            if field == "q":
+                plan = await plan_temporal_distribution(
+                    value, granularity, year_from, year_to, max_periods, now=now
+                )
+            else:
+                plan = await plan_temporal_distribution(
+                    query, granularity, year_from, year_to, max_periods,
+                    filter_by=build_exact_filter(field, value), now=now
+                )
+            plans.append(plan)
+
+        client = get_async_typesense_client()
+        started = time.perf_counter()
+        # Séries por facet que falharem são refeitas com uma contagem por período
+        series = await run_temporal_plans(client, plans)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        return _format_multi_series({
+            "field": field,
+            "query": query,
+            "granularity": granularity,
+            "series": dict(zip(values, series)),
+            "queries": sum(len(plan.searches) for plan in plans),
+            "elapsed_ms": elapsed_ms,
+        })
+
+    except Exception as e:
+        logger.error(f"Error in multi-series temporal analysis: {e}", exc_info=True)
+        return f"""# Erro na Análise Temporal Comparativa
+
+**Erro:** {str(e)}
+**Séries:** {', '.join(values)}
+**Granularidade:** {granularity}
+
+Tente novamente com menos séries ou menos períodos."""
+
+
+def _format_multi_series(data: dict[str, Any]) -> str:
+    """Formata as séries alinhadas em uma tabela com estatísticas por série."""
+    series = data["series"]
+    names = list(series)
+    field_labels = {"q": "Query", "agency": "Agência", "theme_1_level_1": "Tema"}
+
+    output = [f"# Análise Temporal Comparativa ({data['granularity']})", ""]
+    output.append(f"**Séries ({field_labels[data['field']]}):** {', '.join(names)}")
+    if data["field"] != "q" and data["query"] != "*":
+        output.append(f"**Query:** `{data['query']}`")
+    output.append(
+        f"*{data['queries']} consultas em um único lote | "
+        f"tempo de backend: {data['elapsed_ms']:.0f} ms*"
+    )
+    output.append("")
+
+    # Eixo de períodos comum: a união dos períodos de todas as séries
+    rows: dict[str, dict[str, Any]] = {}
+    for name in names:
+        for item in series[name].get("distribution", []):
+            rows.setdefault(item["period"], {"label": item["label"]})[name] = item["count"]
+        for item in series[name].get("failed_periods", []):
+            rows.setdefault(item["period"], {"label": item["label"]})[name] = "erro"
+
+    output.append("## Evolução")
+    output.append("")
+    if rows:
+        output.append("| Período | " + " | ".join(names) + " |")
+        output.append("|---|" + "---|" * len(names))
+        for period in sorted(rows):
+            row = rows[period]
+            cells = []
+            for name in names:
+                value = row.get(name, 0 if "error" not in series[name] else "erro")
+                cells.append(f"{value:,}" if isinstance(value, int) else value)
+            output.append(f"| {row['label']} | " + " | ".join(cells) + " |")
+    else:
+        output.append("Nenhum dado encontrado para o período.")
+    output.append("")
+
+    output.append("## Estatísticas por Série")
+    output.append("")
+    output.append("| Série | Total | Média | Pico | Último vs Anterior | Períodos Atípicos |")
+    output.append("|-------|-------|-------|------|--------------------|-------------------|")
+    periods = sorted(rows)
+    for name in names:
+        if "error" in series[name]:
+            output.append(f"| {name} | erro | — | — | — | — |")
+            continue
+
+        # Períodos com erro ficam fora das estatísticas
+        points = [
+            {"period": period, "label": rows[period]["label"], "count": rows[period].get(name, 0)}
+            for period in periods
+            if isinstance(rows[period].get(name, 0), int)
+        ]
+        if not points:
+            output.append(f"| {name} | 0 | — | — | — | — |")
+            continue
+
+        stats = compute_series_stats(points, data["granularity"])
+        change = f"{stats['last_change']:+.1f}%" if stats["last_change"] is not None else "—"
+        anomalies = ", ".join(
+            f"{anomaly['label']} ({anomaly['direction']})" for anomaly in stats["anomalies"]
+        ) or "—"
+        output.append(
+            f"| {name} | {sum(point['count'] for point in points):,} | {stats['mean']:.0f} | "
+            f"{stats['max']['count']:,} ({stats['max']['label']}) | {change} | {anomalies} |"
+        )
+
+    errors = [name for name in names if "error" in series[name]]
+    for name in errors:
+        output.append("")
+        output.append(f"**Erro na série {name}:** {series[name]['error']}")
+
+    return "\n".join(output)
@@ -1,57 +1,217 @@
 """Typesense client wrapper for GovBRNews MCP Server."""
 
+import asyncio
+import json
 import logging
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, TypeVar
+from urllib.parse import quote
+
+import httpx
+from typesense.api_call import ApiCall
+from typesense.exceptions import (
+    HTTPStatus0Error,
+    ObjectNotFound,
+    RequestUnauthorized,
+    TypesenseClientError,
+)
+
+from .cache import ResponseCache, make_cache_key
+from .config import get_settings
 
-import typesense
-from typesense.exceptions import ObjectNotFound, RequestUnauthorized, TypesenseClientError
+logger = logging.getLogger(__name__)
 
-from .config import settings
+# Typesense rejects multi_search requests with more than `limit_multi_searches`
+# searches (default: 50), so larger batches are split into chunks of this size.
+MULTI_SEARCH_CHUNK_SIZE = 50
+
+# Maximum per_page accepted by Typesense, used to chunk batch document fetches
+MAX_PER_PAGE = 250
+
+T = TypeVar("T")
 
-logger = logging.getLogger(__name__)
 
+class SingleFlight:
+    """
+    Coalesce concurrent identical async calls into a single execution.
 
-class TypesenseClient:
-    """Wrapper around Typesense client with error handling."""
+    While a call for a given key is in flight, later callers with the same key
+    await the same task instead of starting a new one, and all of them receive
+    the same result (or exception). Cancelling one caller does not cancel the
+    shared task for the others.
+    """
 
     def __init__(self):
-        """Initialize Typesense client."""
-        self.client = typesense.Client(
-            {
-                "nodes": [
-                    {
-                        "host": settings.typesense_host,
-                        "port": str(settings.typesense_port),
-                        "protocol": settings.typesense_protocol,
-                    }
-                ],
-                "api_key": settings.typesense_api_key,
-                "connection_timeout_seconds": 10,
-            }
-        )
-        logger.info(
-            f"Typesense client initialized: {settings.typesense_protocol}://"
+        """Initialize with no calls in flight."""
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `func` unless an identical call is already in flight.
+
+        Args:
+            key: Identity of the call (see make_cache_key)
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            Result of the (possibly shared) call
+        """
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            logger.debug("Coalescing identical in-flight Typesense request")
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished call and mark its exception as retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._inflight)
+
+
+class AsyncTypesenseClient:
+    """
+    Async Typesense client backed by a pooled, keep-alive HTTP connection.
+
+    Talks to the Typesense REST API directly through `httpx.AsyncClient`, so
+    requests never block the event loop. Identical concurrent requests are
+    coalesced into one HTTP call through SingleFlight. Errors are raised as
+    the `typesense.exceptions` type matching the HTTP status code.
+    """
+
+    def __init__(self):
+        """Initialize the pooled HTTP client."""
+        settings = get_settings()
+        self.base_url = (
+            f"{settings.typesense_protocol}://"
             f"{settings.typesense_host}:{settings.typesense_port}"
         )
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"X-TYPESENSE-API-KEY": settings.typesense_api_key},
+            timeout=settings.typesense_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.typesense_max_connections,
+                max_keepalive_connections=settings.typesense_max_keepalive_connections,
+                keepalive_expiry=settings.typesense_keepalive_expiry,
+            ),
+        )
+        self.cache = _build_response_cache()
+        self.documents = ResponseCache(
+            ttl=settings.document_cache_ttl,
+            max_entries=settings.document_cache_max_entries,
+            max_bytes=settings.document_cache_max_bytes,
+        )
+        self.inflight = SingleFlight()
+        logger.info(f"Async Typesense client initialized: {self.base_url}")
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+    ) -> httpx.Response:
+        """
+        Send a request to Typesense and check its status.
 
-    def search(self, collection: str, params: dict[str, Any]) -> dict[str, Any]:
+        Raises:
+            TypesenseClientError: Subclass matching the HTTP status code, or
+                HTTPStatus0Error if the server could not be reached
+        """
+        try:
+            response = await self._http.request(
+                method, path, params=_encode_params(params), json=json
+            )
+        except httpx.HTTPError as e:
+            raise HTTPStatus0Error(f"Error connecting to Typesense: {e}") from e
+
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            exception_class = ApiCall.get_exception(response.status_code)
+            raise exception_class(f"[Errno {response.status_code}] {message}")
+
+        return response
+
+    async def _fetch(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+    ) -> tuple[Any, int]:
+        """
+        Send a request and decode it, sharing the call with identical requests.
+
+        Returns:
+            Tuple of (decoded JSON response, response size in bytes)
+        """
+        async def send() -> tuple[Any, int]:
+            response = await self._send(method, path, params=params, json=json)
+            return response.json(), len(response.content)
+
+        key = make_cache_key(method, path, params, json)
+        return await self.inflight.run(key, send)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+    ) -> Any:
+        """Send a request to Typesense and decode the JSON response."""
+        data, _ = await self._fetch(method, path, params=params, json=json)
+        return data
+
+    async def search(self, collection: str, params: dict[str, Any]) -> dict[str, Any]:
         """
         Execute search query on a collection.
 
+        Results are served from the response cache when the same
+        (collection, params) pair was searched within `cache_ttl` seconds.
+
         Args:
             collection: Collection name to search
             params: Search parameters (query, filters, etc.)
 
         Returns:
-            Search results dictionary
+            Search results dictionary (shared with the cache; do not mutate)
 
         Raises:
             TypesenseClientError: If search fails
         """
+        cache_key = make_cache_key(collection, params)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Cache hit for search on '{collection}'")
+            return cached
+
         try:
             logger.debug(f"Searching collection '{collection}' with params: {params}")
-            results = self.client.collections[collection].documents.search(params)
+            results, size = await self._fetch(
+                "GET", f"/collections/{quote(collection, safe='')}/documents/search",
+                params=params,
+            )
             logger.debug(f"Search returned {results.get('found', 0)} results")
+            self.cache.set(cache_key, results, size=size)
             return results
 
         except ObjectNotFound as e:
@@ -70,7 +230,66 @@ class TypesenseClient:
             logger.error(f"Unexpected error during search: {e}")
             raise
 
-    def get_collection_info(self, collection: str) -> dict[str, Any]:
+    async def multi_search(
+        self,
+        searches: list[dict[str, Any]],
+        common_params: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Execute several searches in as few round-trips as possible.
+
+        Searches already in the response cache are answered locally; the rest
+        are split into chunks of MULTI_SEARCH_CHUNK_SIZE and the chunks are
+        sent concurrently over the connection pool.
+
+        Args:
+            searches: List of search parameter dictionaries
+            common_params: Parameters shared by every search (optional)
+
+        Returns:
+            List of search results, in the same order as `searches`. A search
+            that failed individually is returned as a dict with `error` and
+            `code` keys instead of raising.
+
+        Raises:
+            TypesenseClientError: If the multi_search request itself fails
+        """
+        results, pending = _lookup_cached_searches(self.cache, searches, common_params)
+        chunks = [
+            pending[start:start + MULTI_SEARCH_CHUNK_SIZE]
+            for start in range(0, len(pending), MULTI_SEARCH_CHUNK_SIZE)
+        ]
+
+        try:
+            logger.debug(
+                f"Multi-search with {len(pending)}/{len(searches)} uncached searches "
+                f"in {len(chunks)} chunks"
+            )
+            responses = await asyncio.gather(*(
+                self._request(
+                    "POST", "/multi_search", params=common_params,
+                    json={"searches": [searches[index] for index, _ in chunk]},
+                )
+                for chunk in chunks
+            ))
+            for chunk, response in zip(chunks, responses):
+                _store_search_results(self.cache, results, chunk, response.get("results", []))
+
+            return results
+
+        except RequestUnauthorized as e:
+            logger.error(f"Unauthorized access to Typesense: {e}")
+            raise
+
+        except TypesenseClientError as e:
+            logger.error(f"Typesense multi_search error: {e}")
+            raise
+
+        except Exception as e:
+            logger.error(f"Unexpected error during multi_search: {e}")
+            raise
+
+    async def get_collection_info(self, collection: str) -> dict[str, Any]:
         """
         Get collection metadata.
 
@@ -85,8 +304,7 @@ class TypesenseClient:
         """
         try:
             logger.debug(f"Getting info for collection '{collection}'")
-            info = self.client.collections[collection].retrieve()
-            return info
+            return await self._request("GET", f"/collections/{quote(collection, safe='')}")
 
         except ObjectNotFound as e:
             logger.error(f"Collection '{collection}' not found: {e}")
@@ -100,24 +318,39 @@ class TypesenseClient:
             logger.error(f"Unexpected error getting collection info: {e}")
             raise
 
-    def get_document(self, collection: str, document_id: str) -> dict[str, Any]:
+    async def get_document(self, collection: str, document_id: str) -> dict[str, Any]:
         """
         Retrieve a single document by ID.
 
+        Documents are kept in an LRU cache bounded by
+        `document_cache_max_bytes`, so repeated lookups of the same ID do not
+        reach Typesense.
+
         Args:
             collection: Collection name
             document_id: Document unique ID
 
         Returns:
-            Document dictionary
+            Document dictionary (shared with the cache; do not mutate)
 
         Raises:
             ObjectNotFound: If document doesn't exist
             TypesenseClientError: If retrieval fails
         """
+        cache_key = make_cache_key(collection, document_id)
+        cached = self.documents.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Cache hit for document '{document_id}'")
+            return cached
+
         try:
             logger.debug(f"Getting document '{document_id}' from '{collection}'")
-            doc = self.client.collections[collection].documents[document_id].retrieve()
+            doc, size = await self._fetch(
+                "GET",
+                f"/collections/{quote(collection, safe='')}/documents/"
+                f"{quote(document_id, safe='')}",
+            )
+            self.documents.set(cache_key, doc, size=size)
             return doc
 
         except ObjectNotFound:
@@ -128,7 +361,128 @@ class TypesenseClient:
             logger.error(f"Error retrieving document: {e}")
             raise
 
-    def health_check(self) -> bool:
+    async def get_documents(
+        self, collection: str, document_ids: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Retrieve many documents by ID.
+
+        IDs found in the document cache are answered locally; the rest are
+        fetched with `filter_by: id:[...]` searches of up to MAX_PER_PAGE IDs.
+        The filters go in POST /multi_search bodies rather than a GET query
+        string, so long ID lists never hit URL length limits.
+
+        Args:
+            collection: Collection name
+            document_ids: Document unique IDs
+
+        Returns:
+            Dictionary of documents by ID. IDs that do not exist are omitted.
+
+        Raises:
+            TypesenseClientError: If retrieval fails
+        """
+        documents: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+
+        for document_id in dict.fromkeys(document_ids):
+            cached = self.documents.get(make_cache_key(collection, document_id))
+            if cached is not None:
+                documents[document_id] = cached
+            else:
+                missing.append(document_id)
+
+        if not missing:
+            return documents
+
+        searches = [
+            {
+                "collection": collection,
+                "q": "*",
+                "filter_by": _build_id_filter(missing[start:start + MAX_PER_PAGE]),
+                "per_page": len(missing[start:start + MAX_PER_PAGE]),
+            }
+            for start in range(0, len(missing), MAX_PER_PAGE)
+        ]
+        batches = [
+            searches[start:start + MULTI_SEARCH_CHUNK_SIZE]
+            for start in range(0, len(searches), MULTI_SEARCH_CHUNK_SIZE)
+        ]
+
+        try:
+            logger.debug(
+                f"Getting {len(missing)}/{len(document_ids)} uncached documents "
+                f"from '{collection}'"
+            )
+            responses = await asyncio.gather(*(
+                self._request("POST", "/multi_search", json={"searches": batch})
+                for batch in batches
+            ))
+            results = [
+                result for response in responses for result in response.get("results", [])
+            ]
+            for result in results:
+                if "error" in result:
+                    raise TypesenseClientError(f"[Errno {result.get('code')}] {result['error']}")
+
+        except TypesenseClientError as e:
+            logger.error(f"Error retrieving documents: {e}")
+            raise
+
+        for result in results:
+            for hit in result.get("hits", []):
+                doc = hit["document"]
+                documents[doc["id"]] = doc
+                self.documents.set(make_cache_key(collection, doc["id"]), doc)
+
+        return documents
+
+    async def export_documents(
+        self,
+        collection: str,
+        include_fields: str | None = None,
+        filter_by: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream every document of a collection through the export endpoint.
+
+        Documents are decoded one JSONL line at a time, so exporting the
+        whole corpus never holds more than one document in memory. Exported
+        documents bypass the document cache.
+
+        Args:
+            collection: Collection name
+            include_fields: Comma-separated fields to export (default: all)
+            filter_by: Typesense filter restricting the export (optional)
+
+        Yields:
+            Document dictionaries
+
+        Raises:
+            TypesenseClientError: If the export fails
+        """
+        params = {
+            key: value for key, value in
+            (("include_fields", include_fields), ("filter_by", filter_by))
+            if value
+        }
+        path = f"/collections/{quote(collection, safe='')}/documents/export"
+
+        try:
+            async with self._http.stream("GET", path, params=params or None) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    exception_class = ApiCall.get_exception(response.status_code)
+                    raise exception_class(f"[Errno {response.status_code}] {response.text}")
+
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        yield json.loads(line)
+
+        except httpx.HTTPError as e:
+            raise HTTPStatus0Error(f"Error connecting to Typesense: {e}") from e
+
+    async def health_check(self) -> bool:
         """
         Check if Typesense server is healthy.
 
@@ -136,7 +490,7 @@ class TypesenseClient:
             True if healthy, False otherwise
         """
         try:
-            health = self.client.operations.health()
+            health = await self._request("GET", "/health")
             is_healthy = health.get("ok", False)
             logger.debug(f"Health check: {'OK' if is_healthy else 'FAILED'}")
             return is_healthy
@@ -145,16 +499,102 @@ class TypesenseClient:
             logger.error(f"Health check failed: {e}")
             return False
 
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        await self._http.aclose()
+
 
-# Singleton instance
-typesense_client = TypesenseClient()
+def _build_response_cache() -> ResponseCache:
+    """Create a response cache sized from settings."""
+    settings = get_settings()
+    return ResponseCache(
+        ttl=settings.cache_ttl,
+        max_entries=settings.cache_max_entries,
+        max_bytes=settings.cache_max_bytes,
+    )
 
 
-def get_typesense_client() -> TypesenseClient:
+def _lookup_cached_searches(
+    cache: ResponseCache,
+    searches: list[dict[str, Any]],
+    common_params: dict[str, Any] | None,
+) -> tuple[list[dict[str, Any] | None], list[tuple[int, str]]]:
     """
-    Get the singleton Typesense client instance.
+    Resolve multi_search entries from the response cache.
 
     Returns:
-        TypesenseClient instance
+        Tuple of (results with None for misses, list of (index, cache key)
+        for the searches that still have to be sent)
+    """
+    results: list[dict[str, Any] | None] = []
+    pending: list[tuple[int, str]] = []
+
+    for index, search in enumerate(searches):
+        params = {**(common_params or {}), **search}
+        collection = params.pop("collection", None)
+        cache_key = make_cache_key(collection, params)
+        cached = cache.get(cache_key)
+        results.append(cached)
+        if cached is None:
+            pending.append((index, cache_key))
+
+    return results, pending
+
+
+def _store_search_results(
+    cache: ResponseCache,
+    results: list[dict[str, Any] | None],
+    chunk: list[tuple[int, str]],
+    chunk_results: list[dict[str, Any]],
+) -> None:
+    """Place a chunk's results at their original positions and cache successes."""
+    for (index, cache_key), result in zip(chunk, chunk_results):
+        results[index] = result
+        if "error" not in result:
+            cache.set(cache_key, result)
+
+
+def _build_id_filter(document_ids: list[str]) -> str:
+    """Build an `id:[...]` filter with backtick-quoted IDs."""
+    quoted = [f"`{document_id}`" for document_id in document_ids]
+    return f"id:[{','.join(quoted)}]"
+
+
+def _encode_params(params: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Convert search parameters to query-string values Typesense accepts."""
+    if params is None:
+        return None
+
+    return {
+        key: str(value).lower() if isinstance(value, bool) else value
+        for key, value in params.items()
+    }
+
+
+# Singleton instance, created on first use
+_async_typesense_client: AsyncTypesenseClient | None = None
+
+
+def get_async_typesense_client() -> AsyncTypesenseClient:
+    """
+    Get the singleton async Typesense client instance, creating it on first use.
+
+    Returns:
+        AsyncTypesenseClient instance
+    """
+    global _async_typesense_client
+    if _async_typesense_client is None:
+        _async_typesense_client = AsyncTypesenseClient()
+    return _async_typesense_client
+
+
+async def reset_typesense_clients() -> None:
+    """
+    Drop the singleton client so the next access builds it from the
+    current settings. Its pooled connections are closed.
     """
-    return typesense_client
+    global _async_typesense_client
+    client = _async_typesense_client
+    _async_typesense_client = None
+    if client is not None:
+        await client.aclose()
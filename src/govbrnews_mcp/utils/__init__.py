@@ -3,21 +3,39 @@ Utilidades do servidor MCP GovBRNews.
 """
 
 from .formatters import (
+    SEARCH_RESULT_FIELDS,
+    add_missing_content,
+    build_projection_params,
+    get_highlight_snippet,
     format_timestamp,
     format_search_results,
     format_facets_results,
     format_document_full,
+    format_snapshot_info,
 )
 from .temporal import (
+    TemporalPlan,
     get_temporal_distribution,
+    plan_temporal_distribution,
     format_temporal_distribution,
 )
+from .batch import multi_search_groups
+from .stats import compute_series_stats
 
 __all__ = [
+    "SEARCH_RESULT_FIELDS",
+    "add_missing_content",
+    "build_projection_params",
+    "get_highlight_snippet",
     "format_timestamp",
     "format_search_results",
     "format_facets_results",
     "format_document_full",
+    "format_snapshot_info",
+    "TemporalPlan",
     "get_temporal_distribution",
+    "plan_temporal_distribution",
     "format_temporal_distribution",
+    "multi_search_groups",
+    "compute_series_stats",
 ]
@@ -0,0 +1,61 @@
+"""
+Execução em lote de grupos de buscas em um único multi_search.
+"""
+
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+async def multi_search_groups(
+    client,
+    groups: list[list[dict[str, Any]]]
+) -> list[list[dict[str, Any]]]:
+    """
+    Executa vários grupos de buscas em um único multi_search.
+
+    Cada análise (uma série temporal, um conjunto de facets, ...) contribui
+    com um grupo de buscas; todas são enviadas juntas e as respostas são
+    devolvidas separadas por grupo, na mesma ordem.
+
+    Args:
+        client: Cliente Typesense assíncrono
+        groups: Listas de buscas (formato multi_search)
+
+    Returns:
+        Respostas de cada grupo, na mesma ordem das buscas
+    """
+    searches = [search for group in groups for search in group]
+    logger.debug(f"Batching {len(searches)} searches from {len(groups)} groups")
+
+    results = await client.multi_search(searches) if searches else []
+
+    grouped = []
+    offset = 0
+    for group in groups:
+        grouped.append(results[offset:offset + len(group)])
+        offset += len(group)
+
+    return grouped
+
+
+def build_exact_filter(field: str, values: str | list[str]) -> str:
+    """
+    Monta um filtro de igualdade exata com valores entre crases.
+
+    As crases fazem o Typesense tratar vírgulas, dois-pontos e parênteses
+    (comuns em nomes de agências) como parte do valor.
+
+    Args:
+        field: Campo filtrado
+        values: Valor ou lista de valores aceitos
+
+    Returns:
+        Filtro Typesense (ex: "agency:=`mec`" ou "agency:=[`mec`,`capes`]")
+    """
+    if isinstance(values, str):
+        return f"{field}:=`{values.replace('`', '')}`"
+
+    quoted = ",".join(f"`{value.replace('`', '')}`" for value in values)
+    return f"{field}:=[{quoted}]"
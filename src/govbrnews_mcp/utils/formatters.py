@@ -3,6 +3,105 @@
 from datetime import datetime
 from typing import Any
 
+# Document fields used by format_search_results (everything but the article body)
+SEARCH_RESULT_FIELDS = "id,title,agency,published_at,category,theme_1_level_1,url"
+
+# Tokens kept on each side of a match in server-side content snippets
+SNIPPET_AFFIX_TOKENS = 40
+
+
+def build_projection_params(query: str) -> dict[str, Any]:
+    """
+    Build search parameters that avoid transferring full article bodies.
+
+    Keyword queries request only the metadata fields plus a server-side
+    snippet of `content` around the matched terms. Wildcard queries have no
+    matches to highlight, so `content` is still included for the summary.
+    Hits that matched only in the title get no snippet; see
+    add_missing_content() to fill in their summary.
+
+    Args:
+        query: Search query (`*` for wildcard)
+
+    Returns:
+        Parameters to merge into a Typesense search
+    """
+    if query.strip() == "*":
+        return {"include_fields": f"{SEARCH_RESULT_FIELDS},content"}
+
+    return {
+        "include_fields": SEARCH_RESULT_FIELDS,
+        "highlight_fields": "content",
+        "highlight_affix_num_tokens": SNIPPET_AFFIX_TOKENS,
+        "snippet_threshold": SNIPPET_AFFIX_TOKENS * 2,
+        "highlight_start_tag": "**",
+        "highlight_end_tag": "**",
+    }
+
+
+async def add_missing_content(client, hits: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Fetch `content` for hits that have neither a snippet nor the body.
+
+    With build_projection_params(), a hit that matched only in the title
+    has no content highlight and would be shown without a summary. Their
+    bodies are fetched with one get_documents call (only for the hits
+    shown, usually few or none).
+
+    The hits come from a (possibly cached) search response and are not
+    mutated: hits that got a body are returned as new dictionaries.
+
+    Args:
+        client: Async Typesense client
+        hits: Search hits to be formatted
+
+    Returns:
+        Hits in the same order, with `content` added where it was fetched
+    """
+    missing = [
+        str(hit["document"]["id"]) for hit in hits
+        if not get_highlight_snippet(hit, "content")
+        and "content" not in hit.get("document", {})
+        and hit.get("document", {}).get("id") is not None
+    ]
+    if not missing:
+        return hits
+
+    documents = await client.get_documents("news", missing)
+    filled = []
+    for hit in hits:
+        doc = hit.get("document", {})
+        content = documents.get(str(doc.get("id")), {}).get("content")
+        if content and "content" not in doc:
+            hit = {**hit, "document": {**doc, "content": content}}
+        filled.append(hit)
+    return filled
+
+
+def get_highlight_snippet(hit: dict[str, Any], field: str) -> str | None:
+    """
+    Extract the server-side snippet of a field from a search hit.
+
+    Supports both the `highlights` list and the newer `highlight` object
+    returned by Typesense.
+
+    Args:
+        hit: Search hit
+        field: Highlighted field name
+
+    Returns:
+        Snippet text, or None if the field was not highlighted
+    """
+    for highlight in hit.get("highlights", []):
+        if highlight.get("field") == field and highlight.get("snippet"):
+            return highlight["snippet"]
+
+    highlight = hit.get("highlight", {}).get(field)
+    if isinstance(highlight, dict) and highlight.get("snippet"):
+        return highlight["snippet"]
+
+    return None
+
 
 def format_timestamp(timestamp: int | None) -> str:
     """
@@ -24,6 +123,33 @@ def format_timestamp(timestamp: int | None) -> str:
         return "N/A"
 
 
+def format_snapshot_info(snapshot: dict[str, Any] | None) -> str:
+    """
+    Format snapshot age and watermark as a Markdown footer line.
+
+    Args:
+        snapshot: Snapshot metadata with `age_seconds` and `num_documents`
+
+    Returns:
+        Footer line, or an empty string if there is no snapshot metadata
+    """
+    if not snapshot:
+        return ""
+
+    age = int(snapshot.get("age_seconds") or 0)
+    if age < 60:
+        age_str = f"{age}s"
+    elif age < 3600:
+        age_str = f"{age // 60}min"
+    else:
+        age_str = f"{age // 3600}h{(age % 3600) // 60:02d}"
+
+    num_documents = snapshot.get("num_documents")
+    watermark = f" | {num_documents:,} documentos indexados" if num_documents is not None else ""
+
+    return f"\n*Snapshot atualizado há {age_str}{watermark}*"
+
+
 def format_search_results(results: dict[str, Any]) -> str:
     """
     Format Typesense search results for LLM consumption.
@@ -77,8 +203,11 @@ def format_search_results(results: dict[str, Any]) -> str:
             output.append(" | ".join(metadata))
             output.append("\n\n")
 
-        # Content snippet
-        if content := doc.get("content"):
+        # Content snippet (server-side highlight when available)
+        if snippet := get_highlight_snippet(hit, "content"):
+            output.append(f"**Resumo:**\n...{snippet.strip()}...\n\n")
+
+        elif content := doc.get("content"):
             snippet = content[:500].strip()
             if len(content) > 500:
                 # Try to break at word boundary
@@ -0,0 +1,246 @@
+"""
+Estatísticas vetorizadas (NumPy) para séries temporais de contagens.
+
+Todas as medidas são calculadas sobre arrays inteiros, sem laços por
+período, para que o custo continue baixo mesmo em séries diárias longas.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Janela da média móvel por granularidade
+ROLLING_WINDOWS = {
+    "yearly": 3,
+    "monthly": 3,
+    "weekly": 4,
+    "daily": 7,
+}
+
+# Defasagem (em períodos) da comparação com o ano anterior.
+# Na diária, 364 dias mantém o mesmo dia da semana. A semanal fica de fora:
+# a série tem no máximo 52 semanas e anos ISO têm 52 ou 53 semanas.
+YEAR_LAGS = {
+    "yearly": 1,
+    "monthly": 12,
+    "daily": 364,
+}
+
+# Ciclo do índice de sazonalidade: mês do ano ou dia da semana
+SEASONAL_CYCLES = {
+    "monthly": 12,
+    "daily": 7,
+}
+
+# Limiar do escore robusto (MAD) e do z-score comum para marcar anomalias
+MAD_THRESHOLD = 3.5
+ZSCORE_THRESHOLD = 3.0
+
+# Mínimo de períodos para procurar anomalias
+MIN_ANOMALY_PERIODS = 6
+
+WEEKDAY_NAMES = ["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]
+MONTH_ABBREVIATIONS = [
+    "Jan", "Fev", "Mar", "Abr", "Mai", "Jun",
+    "Jul", "Ago", "Set", "Out", "Nov", "Dez",
+]
+
+
+def compute_series_stats(
+    distribution: list[dict[str, Any]],
+    granularity: str
+) -> dict[str, Any]:
+    """
+    Calcula tendência, média móvel, anomalias, sazonalidade e variação anual.
+
+    Args:
+        distribution: Distribuição em ordem cronológica (itens com "period",
+                      "label" e "count"), como em get_temporal_distribution()
+        granularity: "yearly", "monthly", "weekly" ou "daily"
+
+    Returns:
+        Dicionário com:
+        - mean, max, min: média e extremos (max/min como {"label", "count"})
+        - last_change: variação % do último período sobre o anterior (ou None)
+        - mean_growth: variação % média entre períodos consecutivos (ou None)
+        - rolling_window, rolling_mean: janela e média móvel por período
+          (None nos primeiros períodos, sem janela completa)
+        - anomalies: períodos atípicos (label, count, score, direction)
+        - anomaly_method: "mad" ou "zscore" (ou None)
+        - seasonality: índice por posição do ciclo (mês ou dia da semana),
+          1.0 = média, ou None se a série não cobre dois ciclos
+        - yoy: variações sobre o mesmo período do ano anterior
+          (label, count, previous, delta, change); vazio na semanal
+    """
+    counts = np.array([item["count"] for item in distribution], dtype=np.float64)
+    labels = [item.get("label", item["period"]) for item in distribution]
+
+    if counts.size == 0:
+        return {"periods": 0}
+
+    max_index = int(np.argmax(counts))
+    min_index = int(np.argmin(counts))
+    growth = _growth_rates(counts)
+    finite_growth = growth[np.isfinite(growth)]
+
+    window = ROLLING_WINDOWS.get(granularity, 3)
+    rolling = _rolling_mean(counts, window)
+
+    anomaly_method, scores, flagged = _anomaly_scores(counts)
+
+    ordinals = _period_ordinals([item["period"] for item in distribution], granularity)
+    contiguous = ordinals is not None and bool(np.all(np.diff(ordinals) == 1))
+
+    return {
+        "periods": int(counts.size),
+        "mean": float(counts.mean()),
+        "max": {"label": labels[max_index], "count": int(counts[max_index])},
+        "min": {"label": labels[min_index], "count": int(counts[min_index])},
+        "last_change": float(growth[-1]) if growth.size and np.isfinite(growth[-1]) else None,
+        "mean_growth": float(finite_growth.mean()) if finite_growth.size else None,
+        "rolling_window": window,
+        "rolling_mean": [None if np.isnan(value) else float(value) for value in rolling],
+        "anomaly_method": anomaly_method,
+        "anomalies": [
+            {
+                "label": labels[i],
+                "count": int(counts[i]),
+                "score": float(scores[i]),
+                "direction": "pico" if scores[i] > 0 else "queda",
+            }
+            for i in np.flatnonzero(flagged)
+        ],
+        "seasonality": (
+            _seasonality_index(counts, ordinals, granularity) if contiguous else None
+        ),
+        "yoy": _year_over_year(counts, labels, granularity) if contiguous else [],
+    }
+
+
+def _growth_rates(counts: np.ndarray) -> np.ndarray:
+    """Variação % entre períodos consecutivos (NaN quando o anterior é zero)."""
+    previous = counts[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous > 0, (counts[1:] - previous) / previous * 100, np.nan)
+
+
+def _rolling_mean(counts: np.ndarray, window: int) -> np.ndarray:
+    """Média móvel simples (NaN até haver `window` períodos)."""
+    rolling = np.full(counts.size, np.nan)
+    if counts.size >= window:
+        cumulative = np.cumsum(np.insert(counts, 0, 0.0))
+        rolling[window - 1:] = (cumulative[window:] - cumulative[:-window]) / window
+    return rolling
+
+
+def _anomaly_scores(counts: np.ndarray) -> tuple[str | None, np.ndarray, np.ndarray]:
+    """
+    Escores de anomalia por período.
+
+    Usa o escore robusto baseado na mediana e no desvio absoluto mediano
+    (MAD), pouco sensível aos próprios picos. Se mais da metade dos
+    períodos tem o mesmo valor (MAD zero), usa o z-score comum.
+
+    Returns:
+        Tupla (método, escores, máscara dos períodos marcados)
+    """
+    no_anomalies = (None, np.zeros(counts.size), np.zeros(counts.size, dtype=bool))
+    if counts.size < MIN_ANOMALY_PERIODS:
+        return no_anomalies
+
+    median = np.median(counts)
+    mad = np.median(np.abs(counts - median))
+    if mad > 0:
+        scores = 0.6745 * (counts - median) / mad
+        return "mad", scores, np.abs(scores) > MAD_THRESHOLD
+
+    std = counts.std()
+    if std > 0:
+        scores = (counts - counts.mean()) / std
+        return "zscore", scores, np.abs(scores) > ZSCORE_THRESHOLD
+
+    return no_anomalies
+
+
+def _period_ordinals(periods: list[str], granularity: str) -> np.ndarray | None:
+    """
+    Posição absoluta de cada período (anos, meses, semanas ou dias).
+
+    Returns:
+        Array de inteiros, ou None se algum período não puder ser lido
+    """
+    try:
+        if granularity == "yearly":
+            return np.array([int(period) for period in periods], dtype=np.int64)
+        if granularity == "monthly":
+            return np.array(periods, dtype="datetime64[M]").astype(np.int64)
+        if granularity == "daily":
+            return np.array(periods, dtype="datetime64[D]").astype(np.int64)
+        if granularity == "weekly":
+            # Semanas ISO 8601 ("2025-W01" começa em 30/12/2024)
+            mondays = [datetime.strptime(f"{period}-1", "%G-W%V-%u").date() for period in periods]
+            return np.array(mondays, dtype="datetime64[D]").astype(np.int64) // 7
+    except ValueError as e:
+        logger.warning(f"Could not parse periods for statistics: {e}")
+    return None
+
+
+def _seasonality_index(
+    counts: np.ndarray,
+    ordinals: np.ndarray,
+    granularity: str
+) -> list[dict[str, Any]] | None:
+    """
+    Índice sazonal: média de cada posição do ciclo dividida pela média geral.
+
+    Só é calculado quando a série cobre ao menos dois ciclos completos
+    (24 meses ou 14 dias).
+    """
+    cycle = SEASONAL_CYCLES.get(granularity)
+    overall = counts.mean()
+    if not cycle or counts.size < 2 * cycle or overall == 0:
+        return None
+
+    if granularity == "monthly":
+        positions = ordinals % 12  # 0 = janeiro
+        names = MONTH_ABBREVIATIONS
+    else:
+        positions = (ordinals + 3) % 7  # 1970-01-01 foi uma quinta-feira; 0 = segunda
+        names = WEEKDAY_NAMES
+
+    sums = np.bincount(positions, weights=counts, minlength=cycle)
+    sizes = np.bincount(positions, minlength=cycle)
+    index = sums / sizes / overall
+
+    return [{"label": names[i], "index": float(index[i])} for i in range(cycle)]
+
+
+def _year_over_year(
+    counts: np.ndarray,
+    labels: list[str],
+    granularity: str
+) -> list[dict[str, Any]]:
+    """Variação de cada período sobre o mesmo período do ano anterior."""
+    lag = YEAR_LAGS.get(granularity)
+    if not lag or counts.size <= lag:
+        return []
+
+    current, previous = counts[lag:], counts[:-lag]
+    delta = current - previous
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = np.where(previous > 0, delta / previous * 100, np.nan)
+
+    return [
+        {
+            "label": labels[lag + i],
+            "count": int(current[i]),
+            "previous": int(previous[i]),
+            "delta": int(delta[i]),
+            "change": None if np.isnan(change[i]) else float(change[i]),
+        }
+        for i in range(current.size)
+    ]
@@ -3,15 +3,24 @@ Utilidades para análise temporal com diferentes granularidades.
 """
 
 import logging
-from datetime import datetime, timedelta
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
 from typing import Any
 
-from ..typesense_client import get_typesense_client
+from ..cache import ResponseCache, make_cache_key
+from ..config import get_settings
+from ..schema import get_collection_schema
+from ..typesense_client import get_async_typesense_client
+from .batch import multi_search_groups
+from .stats import compute_series_stats
 
 logger = logging.getLogger(__name__)
 
+# Máximo de dias em uma distribuição diária (um ano)
+MAX_DAILY_PERIODS = 366
 
-def get_temporal_distribution(
+
+async def get_temporal_distribution(
     query: str = "*",
     granularity: str = "monthly",
     year_from: int | None = None,
@@ -21,12 +30,16 @@ def get_temporal_distribution(
     """
     Obtém distribuição temporal de notícias com granularidade configurável.
 
+    Executa o plano de plan_temporal_distribution() para a granularidade,
+    com fallback para uma contagem por período se o facet falhar.
+
     Args:
         query: Query para filtrar notícias (padrão: "*" para todas)
         granularity: Granularidade temporal:
                      - "yearly": Por ano
                      - "monthly": Por mês (recomendado)
                      - "weekly": Por semana (limitado a max_periods semanas)
+                     - "daily": Por dia (série contínua, dias sem notícias com zero)
         year_from: Ano inicial do filtro (opcional)
         year_to: Ano final do filtro (opcional)
         max_periods: Máximo de períodos para retornar (padrão: 24)
@@ -35,23 +48,17 @@ def get_temporal_distribution(
         Dicionário com distribuição temporal e metadados
 
     Examples:
-        >>> get_temporal_distribution("educação", "monthly", 2024, 2025)
+        >>> await get_temporal_distribution("educação", "monthly", 2024, 2025)
         # Retorna distribuição mensal de notícias sobre educação em 2024-2025
 
-        >>> get_temporal_distribution("saúde", "weekly", max_periods=12)
+        >>> await get_temporal_distribution("saúde", "weekly", max_periods=12)
         # Retorna últimas 12 semanas de notícias sobre saúde
     """
-    client = get_typesense_client()
+    client = get_async_typesense_client()
 
     try:
-        if granularity == "yearly":
-            return _get_yearly_distribution(client, query, year_from, year_to, max_periods)
-        elif granularity == "monthly":
-            return _get_monthly_distribution(client, query, year_from, year_to, max_periods)
-        elif granularity == "weekly":
-            return _get_weekly_distribution(client, query, year_from, year_to, max_periods)
-        else:
-            raise ValueError(f"Granularidade inválida: {granularity}. Use 'yearly', 'monthly' ou 'weekly'")
+        plan = await plan_temporal_distribution(query, granularity, year_from, year_to, max_periods)
+        return (await run_temporal_plans(client, [plan]))[0]
 
     except Exception as e:
         logger.error(f"Error getting temporal distribution: {e}", exc_info=True)
@@ -62,392 +69,706 @@ def get_temporal_distribution(
         }
 
 
-def _get_yearly_distribution(
+async def run_temporal_plans(client, plans: list["TemporalPlan"]) -> list[dict[str, Any]]:
+    """
+    Executa planos de distribuição temporal em um único multi_search.
+
+    Planos baseados em facet cuja consulta falha (ex: campo removido do
+    schema) são refeitos com uma contagem por período, em um segundo
+    multi_search com todos os planos que falharam.
+
+    Args:
+        client: Cliente Typesense assíncrono
+        plans: Planos de plan_temporal_distribution()
+
+    Returns:
+        Distribuição de cada plano, na mesma ordem
+    """
+    grouped = await multi_search_groups(client, [plan.searches for plan in plans])
+    return await build_temporal_plans(client, plans, grouped)
+
+
+async def build_temporal_plans(
     client,
-    query: str,
-    year_from: int | None,
-    year_to: int | None,
-    max_periods: int
-) -> dict[str, Any]:
-    """Obtém distribuição anual."""
+    plans: list["TemporalPlan"],
+    grouped: list[list[dict[str, Any]]]
+) -> list[dict[str, Any]]:
+    """
+    Monta as distribuições de planos já executados, com fallback de facet.
 
-    # Construir filtro de anos
-    filter_parts = []
-    if year_from:
-        filter_parts.append(f"published_year:>={year_from}")
-    if year_to:
-        filter_parts.append(f"published_year:<={year_to}")
+    Para quem envia as buscas dos planos junto com outras (ex: a visão geral
+    de um relatório) em um único multi_search: monta cada plano com suas
+    respostas e refaz, como em run_temporal_plans(), os planos por facet que
+    falharam.
 
-    filter_by = " && ".join(filter_parts) if filter_parts else None
+    Args:
+        client: Cliente Typesense assíncrono
+        plans: Planos de plan_temporal_distribution()
+        grouped: Respostas das buscas de cada plano, na mesma ordem
 
-    # Query Typesense
-    search_params = {
+    Returns:
+        Distribuição de cada plano, na mesma ordem
+    """
+    data = [plan.build(results) for plan, results in zip(plans, grouped)]
+
+    failed = [i for i, plan in enumerate(plans) if "error" in data[i] and plan.fallback]
+    if failed:
+        for i in failed:
+            logger.warning(
+                f"{plans[i].facet_field} facet query failed, using range queries: {data[i]['error']}"
+            )
+        fallbacks = [await plans[i].fallback() for i in failed]
+        grouped = await multi_search_groups(client, [plan.searches for plan in fallbacks])
+        for i, plan, results in zip(failed, fallbacks, grouped):
+            data[i] = plan.build(results)
+
+    return data
+
+
+def _count_search(query: str, filter_by: str | None) -> dict[str, Any]:
+    """Monta uma busca que retorna apenas a contagem de notícias."""
+    search = {
+        "collection": "news",
         "q": query,
         "query_by": "title,content",
-        "facet_by": "published_year",
-        "per_page": 0,
-        "max_facet_values": max_periods
+        "per_page": 0
     }
-
     if filter_by:
-        search_params["filter_by"] = filter_by
-
-    results = client.client.collections["news"].documents.search(search_params)
-
-    # Processar resultados
-    distribution = []
-    if "facet_counts" in results:
-        for facet in results["facet_counts"]:
-            if facet["field_name"] == "published_year":
-                for count in facet["counts"]:
-                    distribution.append({
-                        "period": str(count["value"]),
-                        "label": str(count["value"]),
-                        "count": count["count"]
-                    })
-
-    # Ordenar por período
-    distribution.sort(key=lambda x: x["period"])
+        search["filter_by"] = filter_by
+    return search
 
-    return {
-        "granularity": "yearly",
-        "query": query,
-        "total_found": results.get("found", 0),
-        "distribution": distribution,
-        "filters": {
-            "year_from": year_from,
-            "year_to": year_to
-        }
-    }
 
+def _combine_filters(*parts: str | None) -> str | None:
+    """Combina filtros Typesense com `&&`, ignorando os vazios."""
+    filters = [part for part in parts if part]
+    return " && ".join(filters) if filters else None
 
-def _get_monthly_distribution(
-    client,
-    query: str,
-    year_from: int | None,
-    year_to: int | None,
-    max_periods: int
-) -> dict[str, Any]:
-    """Obtém distribuição mensal."""
 
-    # Construir filtro de anos
+def _year_range_filter(year_from: int | None, year_to: int | None) -> str | None:
+    """Filtro de intervalo de anos sobre published_year."""
     filter_parts = []
     if year_from:
         filter_parts.append(f"published_year:>={year_from}")
     if year_to:
         filter_parts.append(f"published_year:<={year_to}")
+    return _combine_filters(*filter_parts)
 
-    filter_by = " && ".join(filter_parts) if filter_parts else None
 
-    # Query Typesense com facets de ano e mês
-    search_params = {
-        "q": query,
-        "query_by": "title,content",
-        "facet_by": "published_year,published_month",
-        "per_page": 0,
-        "max_facet_values": 50  # Máximo para capturar todos os anos e meses
-    }
+def _time_range_filter(start: datetime, end: datetime) -> str:
+    """Filtro de uma janela [início, fim) sobre published_at."""
+    return (
+        f"published_at:>={int(start.timestamp())} && "
+        f"published_at:<{int(end.timestamp())}"
+    )
 
-    if filter_by:
-        search_params["filter_by"] = filter_by
-
-    results = client.client.collections["news"].documents.search(search_params)
-
-    # Criar mapa de contagens por ano/mês
-    year_counts = {}
-    month_counts = {}
-
-    if "facet_counts" in results:
-        for facet in results["facet_counts"]:
-            if facet["field_name"] == "published_year":
-                for count in facet["counts"]:
-                    year_counts[int(count["value"])] = count["count"]
-            elif facet["field_name"] == "published_month":
-                for count in facet["counts"]:
-                    month_counts[int(count["value"])] = count["count"]
-
-    # Para obter contagens exatas por ano+mês, precisamos fazer queries individuais
-    # Determinar range de anos
-    if year_counts:
-        years = sorted(year_counts.keys())
-        if year_from:
-            years = [y for y in years if y >= year_from]
-        if year_to:
-            years = [y for y in years if y <= year_to]
-
-        # Limitar a últimos N meses se especificado
-        if len(years) * 12 > max_periods:
-            years = years[-(max_periods // 12 + 1):]
-    else:
-        # Se não há dados, usar ano atual
-        current_year = datetime.now().year
-        years = [current_year]
-
-    # Buscar contagens por ano/mês
-    distribution = []
-    total_queries = 0
-
-    for year in years:
-        for month in range(1, 13):
-            if total_queries >= max_periods:
-                break
-
-            try:
-                # Query para este ano/mês específico
-                month_filter = f"published_year:={year} && published_month:={month}"
-                if filter_by:
-                    month_filter = f"{filter_by} && published_month:={month}"
-
-                month_results = client.client.collections["news"].documents.search({
-                    "q": query,
-                    "query_by": "title,content",
-                    "filter_by": month_filter,
-                    "per_page": 0
-                })
 
-                count = month_results.get("found", 0)
-
-                # Só incluir meses com notícias
-                if count > 0:
-                    month_name = _get_month_name(month)
-                    distribution.append({
-                        "period": f"{year}-{month:02d}",
-                        "label": f"{month_name}/{year}",
-                        "year": year,
-                        "month": month,
-                        "count": count
-                    })
+def _recent_weeks(
+    year_from: int | None,
+    year_to: int | None,
+    max_periods: int,
+    now: datetime | None = None
+) -> tuple[datetime, datetime, list[tuple[datetime, datetime]]]:
+    """
+    Gera as janelas semanais das últimas `max_periods` semanas.
 
-                total_queries += 1
+    As janelas começam na segunda-feira, de modo que uma semana encerrada
+    tem sempre os mesmos limites (e pode ser reaproveitada do cache). A
+    última janela é a semana em andamento, até `now`.
 
-            except Exception as e:
-                logger.warning(f"Error getting count for {year}-{month:02d}: {e}")
-                continue
+    Returns:
+        Tupla (início, fim, janelas) com as janelas como pares (início, fim)
+    """
+    end_date = now or datetime.now()
 
-        if total_queries >= max_periods:
-            break
+    # Ajustar por year_to se fornecido
+    if year_to and end_date.year > year_to:
+        end_date = datetime(year_to + 1, 1, 1)
 
-    # Ordenar por período e limitar
-    distribution.sort(key=lambda x: x["period"])
-    distribution = distribution[-max_periods:]
+    last_monday = datetime(end_date.year, end_date.month, end_date.day) - timedelta(
+        days=end_date.weekday()
+    )
+    if last_monday == end_date:
+        last_monday -= timedelta(weeks=1)
+    start_date = last_monday - timedelta(weeks=max_periods - 1)
 
-    return {
-        "granularity": "monthly",
-        "query": query,
-        "total_found": results.get("found", 0),
-        "distribution": distribution,
-        "filters": {
-            "year_from": year_from,
-            "year_to": year_to
-        },
-        "note": f"Distribuição mensal limitada a {max_periods} períodos mais recentes"
-    }
+    # Ajustar por year_from se fornecido
+    if year_from and start_date.year < year_from:
+        start_date = datetime(year_from, 1, 1)
 
+    weeks = []
+    current = start_date
 
-def _get_weekly_distribution_optimized(
-    client,
-    query: str,
+    while current < end_date and len(weeks) < max_periods:
+        next_monday = datetime(current.year, current.month, current.day) + timedelta(
+            days=7 - current.weekday()
+        )
+        week_end = min(next_monday, end_date)
+        weeks.append((current, week_end))
+        current = week_end
+
+    return start_date, end_date, weeks
+
+
+def _recent_days(
     year_from: int | None,
     year_to: int | None,
-    max_periods: int
-) -> dict[str, Any]:
+    max_periods: int,
+    now: datetime | None = None
+) -> list[date]:
     """
-    Obtém distribuição semanal usando published_week facets (OTIMIZADO).
+    Gera os últimos `max_periods` dias do calendário, em ordem cronológica.
 
-    Performance ~20x melhor que range queries.
-    Requer campo published_week no schema Typesense.
-    """
+    A janela termina hoje (ou em 31 de dezembro de `year_to`, se anterior)
+    e não começa antes de 1º de janeiro de `year_from`.
 
-    # Construir filtro de anos se necessário
-    filter_parts = []
-    if year_from or year_to:
-        # Calcular range de semanas ISO (YYYYWW)
-        if year_from:
-            week_from = year_from * 100 + 1  # Primeira semana do ano
-            filter_parts.append(f"published_week:>={week_from}")
-        if year_to:
-            week_to = year_to * 100 + 53  # Última semana possível
-            filter_parts.append(f"published_week:<={week_to}")
-
-    filter_by = " && ".join(filter_parts) if filter_parts else None
-
-    # Query com facet semanal (1 ÚNICA QUERY!)
-    search_params = {
-        "q": query,
-        "query_by": "title,content",
-        "facet_by": "published_week",
-        "per_page": 0,
-        "max_facet_values": max_periods
-    }
+    Returns:
+        Lista de datas
+    """
+    last_day = (now or datetime.now()).date()
+    if year_to and year_to < last_day.year:
+        last_day = date(year_to, 12, 31)
 
-    if filter_by:
-        search_params["filter_by"] = filter_by
-
-    results = client.client.collections["news"].documents.search(search_params)
-
-    # Processar resultados
-    distribution = []
-
-    if "facet_counts" in results:
-        for facet in results["facet_counts"]:
-            if facet["field_name"] == "published_week":
-                for count in facet["counts"]:
-                    week_iso = int(count["value"])  # YYYYWW
-
-                    # Decompor em ano e semana
-                    year = week_iso // 100
-                    week = week_iso % 100
-
-                    # Calcular data da segunda-feira desta semana
-                    # Formato ISO: YYYY-WW-D onde D=1 é segunda-feira
-                    try:
-                        week_start = datetime.strptime(f"{year}-W{week:02d}-1", "%Y-W%W-%w")
-
-                        distribution.append({
-                            "period": f"{year}-W{week:02d}",
-                            "label": f"Semana de {week_start.strftime('%d/%m/%Y')}",
-                            "week_iso": week_iso,
-                            "year": year,
-                            "week": week,
-                            "count": count["count"]
-                        })
-                    except Exception as e:
-                        logger.warning(f"Error parsing week {week_iso}: {e}")
-                        continue
-
-    # Ordenar por período
-    distribution.sort(key=lambda x: x["week_iso"])
-
-    # Limitar resultados (últimas N semanas)
-    distribution = distribution[-max_periods:]
+    days = []
+    day = last_day
+    while len(days) < max_periods and not (year_from and day.year < year_from):
+        days.append(day)
+        day -= timedelta(days=1)
 
-    return {
-        "granularity": "weekly",
-        "query": query,
-        "total_found": results.get("found", 0),
-        "distribution": distribution,
-        "filters": {
-            "year_from": year_from,
-            "year_to": year_to
-        },
-        "note": f"Distribuição semanal (ISO 8601) usando facets otimizados - {max_periods} períodos"
-    }
+    return days[::-1]
 
 
-def _get_weekly_distribution(
-    client,
-    query: str,
+def _recent_months(
     year_from: int | None,
     year_to: int | None,
-    max_periods: int
-) -> dict[str, Any]:
+    max_periods: int,
+    now: datetime | None = None
+) -> list[tuple[int, int]]:
     """
-    Obtém distribuição semanal usando facets (OTIMIZADO).
+    Gera os últimos `max_periods` meses do calendário, em ordem cronológica.
 
-    Se o campo published_week estiver disponível no schema Typesense,
-    usa facets para performance ~20x melhor. Caso contrário, fallback
-    para range queries.
+    A janela termina no mês atual (ou em dezembro de `year_to`, se anterior)
+    e não começa antes de janeiro de `year_from`.
 
-    Nota: Limitado a max_periods semanas por questões de performance.
-    Recomendado: max_periods <= 52 (ou até 104 com published_week field)
+    Returns:
+        Lista de pares (ano, mês)
     """
+    now = now or datetime.now()
+    year, month = now.year, now.month
+    if year_to and year_to < year:
+        year, month = year_to, 12
 
-    # Limitar max_periods
-    if max_periods > 52:
-        max_periods = 52
-        logger.warning(f"max_periods ajustado para 52 semanas para performance")
+    months = []
+    while len(months) < max_periods and not (year_from and year < year_from):
+        months.append((year, month))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
 
-    # Try to use optimized facet-based approach if published_week field exists
-    try:
-        # Test if published_week field is available
-        test_result = client.client.collections["news"].documents.search({
-            "q": "*",
-            "query_by": "title",
-            "facet_by": "published_week",
-            "per_page": 0,
-            "max_facet_values": 1
-        })
-
-        # If we got here, published_week field exists - use optimized approach!
-        return _get_weekly_distribution_optimized(client, query, year_from, year_to, max_periods)
+    return months[::-1]
 
-    except Exception as e:
-        # Field doesn't exist or query failed, fallback to range-based approach
-        logger.info(f"published_week field not available, using range queries (slower): {e}")
 
-    # Fallback: Original range-based implementation
-    # Determinar range de datas
-    end_date = datetime.now()
-    start_date = end_date - timedelta(weeks=max_periods)
+_period_cache: ResponseCache | None = None
 
-    # Ajustar por year_from/year_to se fornecido
-    if year_from and start_date.year < year_from:
-        start_date = datetime(year_from, 1, 1)
-    if year_to and end_date.year > year_to:
-        end_date = datetime(year_to, 12, 31, 23, 59, 59)
 
-    # Construir filtro base
-    filter_parts = []
-    start_timestamp = int(start_date.timestamp())
-    end_timestamp = int(end_date.timestamp())
+def get_period_cache() -> ResponseCache:
+    """
+    Obtém o cache compartilhado de contagens de períodos encerrados.
 
-    filter_parts.append(f"published_at:>={start_timestamp}")
-    filter_parts.append(f"published_at:<={end_timestamp}")
+    Returns:
+        ResponseCache dimensionado pelas configurações period_cache_*
+    """
+    global _period_cache
+    if _period_cache is None:
+        settings = get_settings()
+        _period_cache = ResponseCache(
+            ttl=settings.period_cache_ttl,
+            max_entries=settings.period_cache_max_entries,
+            max_bytes=settings.period_cache_max_bytes,
+        )
+    return _period_cache
 
-    # Gerar semanas
-    distribution = []
-    current = start_date
-    week_num = 0
 
-    while current < end_date and week_num < max_periods:
-        week_start = current
-        week_end = current + timedelta(days=7)
+def reset_period_cache() -> None:
+    """Descarta o cache de contagens de períodos (principalmente para testes)."""
+    global _period_cache
+    _period_cache = None
 
-        if week_end > end_date:
-            week_end = end_date
 
-        try:
-            # Query para esta semana
-            week_filter = f"published_at:>={int(week_start.timestamp())} && published_at:<{int(week_end.timestamp())}"
-
-            week_results = client.client.collections["news"].documents.search({
-                "q": query,
-                "query_by": "title,content",
-                "filter_by": week_filter,
-                "per_page": 0
-            })
-
-            count = week_results.get("found", 0)
-
-            # Incluir semana mesmo se count = 0 para manter continuidade
-            week_label = f"Semana de {week_start.strftime('%d/%m/%Y')}"
-            distribution.append({
-                "period": week_start.strftime("%Y-W%W"),
-                "label": week_label,
-                "start_date": week_start.isoformat(),
-                "end_date": week_end.isoformat(),
-                "count": count
-            })
+class PeriodCounts:
+    """
+    Contagens de uma série por período, reaproveitando períodos encerrados.
+
+    Contagens de meses e semanas passados praticamente não mudam depois que
+    a ingestão os alcança. Um período é considerado encerrado quando terminou
+    há mais de `period_settle_seconds`; sua contagem fica no cache por
+    (query, filtro, granularidade, período, fim do período) e só os períodos
+    em aberto ou ausentes do cache são consultados. O fim faz parte da chave
+    porque uma janela pode ser cortada (ex: a última semana antes de 1º de
+    janeiro de `year_to + 1`) e não deve responder pela semana inteira.
+    """
 
-        except Exception as e:
-            logger.warning(f"Error getting count for week {week_start}: {e}")
+    def __init__(
+        self,
+        query: str,
+        granularity: str,
+        periods: list[tuple[str, datetime, dict[str, Any]]],
+        filter_by: str | None = None,
+        now: datetime | None = None
+    ):
+        """
+        Separa os períodos em cache dos que precisam ser consultados.
+
+        Args:
+            query: Query da série
+            granularity: Granularidade da série
+            periods: Tuplas (período, fim do período, busca de contagem)
+            filter_by: Filtro adicional da série (parte da chave do cache)
+            now: Data de referência (padrão: agora)
+        """
+        now = now or datetime.now()
+        settle = timedelta(seconds=get_settings().period_settle_seconds)
+        self._cache = get_period_cache()
+        self._keys: list[str | None] = []
+        self._results: list[dict[str, Any] | None] = []
+        self._pending: list[int] = []
+        self.searches: list[dict[str, Any]] = []
+
+        for index, (period, period_end, search) in enumerate(periods):
+            closed = period_end + settle <= now
+            key = (
+                make_cache_key(
+                    "period", query, filter_by, granularity, period, period_end.isoformat()
+                )
+                if closed else None
+            )
+            count = self._cache.get(key) if key else None
+
+            self._keys.append(key)
+            if count is not None:
+                self._results.append({"found": count})
+            else:
+                self._results.append(None)
+                self._pending.append(index)
+                self.searches.append(search)
+
+    def resolve(self, results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Combina as respostas das buscas pendentes com as contagens em cache.
+
+        Args:
+            results: Respostas de `searches`, na mesma ordem
+
+        Returns:
+            Uma resposta por período, na ordem original
+        """
+        resolved = list(self._results)
+        for index, result in zip(self._pending, results):
+            resolved[index] = result
+            key = self._keys[index]
+            if key and "error" not in result:
+                self._cache.set(key, result.get("found", 0), size=len(key))
+        return resolved
+
+
+def _month_end(year: int, month: int) -> datetime:
+    """Início do mês seguinte (fim exclusivo do mês)."""
+    return datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+
+
+def _month_entry(year: int, month: int, count: int) -> dict[str, Any]:
+    """Entrada de distribuição para um mês."""
+    return {
+        "period": f"{year}-{month:02d}",
+        "label": f"{_get_month_name(month)}/{year}",
+        "year": year,
+        "month": month,
+        "count": count
+    }
 
-        current = week_end
-        week_num += 1
 
+def _day_start(day: date) -> datetime:
+    """Início (meia-noite) de um dia."""
+    return datetime(day.year, day.month, day.day)
+
+
+def _day_entry(day: date, count: int) -> dict[str, Any]:
+    """Entrada de distribuição para um dia."""
     return {
-        "granularity": "weekly",
-        "query": query,
-        "total_found": sum(d["count"] for d in distribution),
-        "distribution": distribution,
-        "filters": {
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat()
-        },
-        "note": f"Distribuição semanal limitada a {max_periods} semanas. Recomendado: <= 26 semanas"
+        "period": day.isoformat(),
+        "label": day.strftime("%d/%m/%Y"),
+        "date": day.isoformat(),
+        "count": count
     }
 
 
+def _week_entry(week_iso: int, count: int) -> dict[str, Any] | None:
+    """Entrada de distribuição para uma semana ISO (YYYYWW), ou None se inválida."""
+    # Decompor em ano e semana
+    year = week_iso // 100
+    week = week_iso % 100
+
+    # Calcular data da segunda-feira desta semana
+    # Formato ISO: YYYY-WW-D onde D=1 é segunda-feira
+    try:
+        week_start = datetime.strptime(f"{year}-W{week:02d}-1", "%G-W%V-%u")
+    except ValueError as e:
+        logger.warning(f"Error parsing week {week_iso}: {e}")
+        return None
+
+    return {
+        "period": f"{year}-W{week:02d}",
+        "label": f"Semana de {week_start.strftime('%d/%m/%Y')}",
+        "week_iso": week_iso,
+        "year": year,
+        "week": week,
+        "count": count
+    }
+
+
+def _iso_week(day: datetime) -> int:
+    """Semana ISO (YYYYWW) que contém um dia."""
+    iso_year, iso_week, _ = day.isocalendar()
+    return iso_year * 100 + iso_week
+
+
+def _facet_counts(results: dict[str, Any], field_name: str) -> list[dict[str, Any]]:
+    """Contagens de um campo de facet em uma resposta de busca."""
+    for facet in results.get("facet_counts", []):
+        if facet["field_name"] == field_name:
+            return facet["counts"]
+    return []
+
+
+class TemporalPlan:
+    """
+    Consultas de uma série temporal e como montar a série a partir delas.
+
+    Separar o planejamento da execução permite enviar as consultas de várias
+    séries (e de outras análises) em um único multi_search.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        granularity: str,
+        searches: list[dict[str, Any]],
+        assemble: Callable[[list[dict[str, Any]]], dict[str, Any]],
+        facet_field: str | None = None,
+        fallback: Callable[[], Awaitable["TemporalPlan"]] | None = None
+    ):
+        """
+        Inicializa o plano.
+
+        Args:
+            query: Query da série
+            granularity: Granularidade ("yearly", "monthly", "weekly" ou "daily")
+            searches: Buscas a enviar (formato multi_search)
+            assemble: Monta a distribuição a partir das respostas, na mesma ordem
+            facet_field: Campo de facet usado no lugar de uma busca por período
+            fallback: Planeja a mesma série com uma busca por período, caso
+                      a consulta ao facet falhe
+        """
+        self.query = query
+        self.granularity = granularity
+        self.searches = searches
+        self.facet_field = facet_field
+        self.fallback = fallback
+        self._assemble = assemble
+
+    def build(self, results: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Monta a distribuição temporal.
+
+        Args:
+            results: Respostas das buscas do plano, na mesma ordem
+
+        Returns:
+            Dicionário no formato de get_temporal_distribution()
+        """
+        try:
+            return self._assemble(results)
+        except Exception as e:
+            logger.error(f"Error assembling temporal distribution: {e}", exc_info=True)
+            return {"error": str(e), "granularity": self.granularity, "query": self.query}
+
+
+async def plan_temporal_distribution(
+    query: str = "*",
+    granularity: str = "monthly",
+    year_from: int | None = None,
+    year_to: int | None = None,
+    max_periods: int = 24,
+    filter_by: str | None = None,
+    now: datetime | None = None,
+    use_facets: bool = True
+) -> TemporalPlan:
+    """
+    Planeja uma distribuição temporal sem executá-la.
+
+    Nenhuma consulta depende de outra, de modo que as buscas de vários planos
+    podem ir juntas em um multi_search (ver run_temporal_plans()): a
+    distribuição mensal cobre os últimos `max_periods` meses do
+    calendário (com meses sem notícias), a semanal as últimas semanas e a
+    diária os últimos dias.
+
+    Args:
+        query: Query para filtrar notícias
+        granularity: "yearly", "monthly", "weekly" ou "daily"
+        year_from: Ano inicial do filtro (opcional)
+        year_to: Ano final do filtro (opcional)
+        max_periods: Máximo de períodos
+        filter_by: Filtro Typesense adicional (ex: agência)
+        now: Data de referência (padrão: agora)
+        use_facets: Usar campos de facet por período (published_year_month,
+                    published_week, published_date) quando o schema os tiver
+
+    Returns:
+        TemporalPlan com as buscas a executar
+
+    Raises:
+        ValueError: Se a granularidade for inválida
+    """
+    filters = {"year_from": year_from, "year_to": year_to}
+    if filter_by:
+        filters["filter_by"] = filter_by
+
+    async def range_plan() -> TemporalPlan:
+        return await plan_temporal_distribution(
+            query, granularity, year_from, year_to, max_periods, filter_by, now, use_facets=False
+        )
+
+    def result(distribution: list[dict[str, Any]], total_found: int, **extra: Any) -> dict[str, Any]:
+        return {
+            "granularity": granularity,
+            "query": query,
+            "total_found": total_found,
+            "distribution": distribution,
+            "filters": filters,
+            **extra
+        }
+
+    if granularity == "yearly":
+        search = _count_search(query, _combine_filters(_year_range_filter(year_from, year_to), filter_by))
+        search.update({"facet_by": "published_year", "max_facet_values": max_periods})
+
+        def assemble_yearly(results: list[dict[str, Any]]) -> dict[str, Any]:
+            if "error" in results[0]:
+                raise RuntimeError(results[0]["error"])
+            distribution = sorted(
+                (
+                    {"period": str(c["value"]), "label": str(c["value"]), "count": c["count"]}
+                    for c in _facet_counts(results[0], "published_year")
+                ),
+                key=lambda x: x["period"]
+            )
+            return result(distribution, results[0].get("found", 0))
+
+        return TemporalPlan(query, granularity, [search], assemble_yearly, "published_year")
+
+    if granularity == "monthly":
+        months = _recent_months(year_from, year_to, max_periods, now)
+        schema = get_collection_schema("news")
+
+        if use_facets and months and await schema.is_facetable("published_year_month"):
+            (first_year, first_month), (last_year, last_month) = months[0], months[-1]
+            search = _count_search(query, _combine_filters(
+                f"published_year_month:>={first_year * 100 + first_month}",
+                f"published_year_month:<={last_year * 100 + last_month}",
+                filter_by
+            ))
+            search.update({"facet_by": "published_year_month", "max_facet_values": len(months)})
+
+            def assemble_monthly_facet(results: list[dict[str, Any]]) -> dict[str, Any]:
+                if "error" in results[0]:
+                    schema.invalidate()
+                    raise RuntimeError(results[0]["error"])
+                counts = {
+                    int(c["value"]): c["count"]
+                    for c in _facet_counts(results[0], "published_year_month")
+                }
+                distribution = [
+                    _month_entry(year, month, counts.get(year * 100 + month, 0))
+                    for year, month in months
+                ]
+                return result(
+                    distribution,
+                    results[0].get("found", 0),
+                    note=f"Distribuição mensal dos últimos {len(months)} meses do calendário"
+                )
+
+            return TemporalPlan(
+                query, granularity, [search], assemble_monthly_facet, "published_year_month", range_plan
+            )
+
+        counts = PeriodCounts(query, granularity, [
+            (
+                f"{y}-{m:02d}",
+                _month_end(y, m),
+                _count_search(
+                    query, _combine_filters(f"published_year:={y} && published_month:={m}", filter_by)
+                )
+            )
+            for y, m in months
+        ], filter_by=filter_by, now=now)
+
+        def assemble_monthly(results: list[dict[str, Any]]) -> dict[str, Any]:
+            distribution = []
+            failed_periods = []
+            for (year, month), month_result in zip(months, counts.resolve(results)):
+                entry = _month_entry(year, month, month_result.get("found", 0))
+                if "error" in month_result:
+                    failed_periods.append({
+                        "period": entry["period"],
+                        "label": entry["label"],
+                        "error": month_result["error"]
+                    })
+                    continue
+                distribution.append(entry)
+
+            extra = {"failed_periods": failed_periods} if failed_periods else {}
+            return result(
+                distribution,
+                sum(d["count"] for d in distribution),
+                note=f"Distribuição mensal dos últimos {len(months)} meses do calendário",
+                **extra
+            )
+
+        return TemporalPlan(query, granularity, counts.searches, assemble_monthly)
+
+    if granularity == "weekly":
+        max_periods = min(max_periods, 52)
+        schema = get_collection_schema("news")
+        start_date, end_date, weeks = _recent_weeks(year_from, year_to, max_periods, now)
+
+        if use_facets and weeks and await schema.is_facetable("published_week"):
+            # Mesmas janelas das range queries: o intervalo de published_at
+            # corta semanas parciais (year_from/year_to) e o facet só agrupa
+            week_keys = [_iso_week(week_start) for week_start, _ in weeks]
+            search = _count_search(query, _combine_filters(
+                _time_range_filter(weeks[0][0], weeks[-1][1]), filter_by
+            ))
+            search.update({"facet_by": "published_week", "max_facet_values": len(weeks)})
+
+            def assemble_weekly_facet(results: list[dict[str, Any]]) -> dict[str, Any]:
+                if "error" in results[0]:
+                    schema.invalidate()
+                    raise RuntimeError(results[0]["error"])
+                counts = {
+                    int(c["value"]): c["count"]  # YYYYWW
+                    for c in _facet_counts(results[0], "published_week")
+                }
+                entries = (_week_entry(key, counts.get(key, 0)) for key in week_keys)
+                return result(
+                    list(filter(None, entries)),
+                    results[0].get("found", 0),
+                    note=f"Distribuição semanal (ISO 8601) das últimas {len(weeks)} semanas"
+                )
+
+            return TemporalPlan(
+                query, granularity, [search], assemble_weekly_facet, "published_week", range_plan
+            )
+
+        counts = PeriodCounts(query, granularity, [
+            (
+                start.isoformat(),
+                end,
+                _count_search(query, _combine_filters(_time_range_filter(start, end), filter_by))
+            )
+            for start, end in weeks
+        ], filter_by=filter_by, now=now)
+
+        def assemble_weekly_ranges(results: list[dict[str, Any]]) -> dict[str, Any]:
+            distribution = []
+            failed_periods = []
+            for (week_start, week_end), week_result in zip(weeks, counts.resolve(results)):
+                iso_week = _iso_week(week_start)
+                period = f"{iso_week // 100}-W{iso_week % 100:02d}"
+                label = f"Semana de {week_start.strftime('%d/%m/%Y')}"
+                if "error" in week_result:
+                    failed_periods.append({"period": period, "label": label, "error": week_result["error"]})
+                    continue
+                distribution.append({
+                    "period": period,
+                    "label": label,
+                    "start_date": week_start.isoformat(),
+                    "end_date": week_end.isoformat(),
+                    "count": week_result.get("found", 0)
+                })
+
+            extra = {"failed_periods": failed_periods} if failed_periods else {}
+            return result(
+                distribution,
+                sum(d["count"] for d in distribution),
+                note=f"Distribuição semanal das últimas {len(weeks)} semanas",
+                **extra
+            )
+
+        return TemporalPlan(query, granularity, counts.searches, assemble_weekly_ranges)
+
+    if granularity == "daily":
+        days = _recent_days(year_from, year_to, min(max_periods, MAX_DAILY_PERIODS), now)
+        schema = get_collection_schema("news")
+        note = f"Distribuição diária dos últimos {len(days)} dias (dias sem notícias com zero)"
+
+        if use_facets and days and await schema.is_facetable("published_date"):
+            search = _count_search(query, _combine_filters(
+                f"published_date:>={int(days[0].strftime('%Y%m%d'))}",
+                f"published_date:<={int(days[-1].strftime('%Y%m%d'))}",
+                filter_by
+            ))
+            search.update({"facet_by": "published_date", "max_facet_values": len(days)})
+
+            def assemble_daily_facet(results: list[dict[str, Any]]) -> dict[str, Any]:
+                if "error" in results[0]:
+                    schema.invalidate()
+                    raise RuntimeError(results[0]["error"])
+                counts = {
+                    int(c["value"]): c["count"]  # YYYYMMDD
+                    for c in _facet_counts(results[0], "published_date")
+                }
+                distribution = [
+                    _day_entry(day, counts.get(int(day.strftime("%Y%m%d")), 0)) for day in days
+                ]
+                return result(distribution, results[0].get("found", 0), note=note)
+
+            return TemporalPlan(
+                query, granularity, [search], assemble_daily_facet, "published_date", range_plan
+            )
+
+        counts = PeriodCounts(query, granularity, [
+            (
+                day.isoformat(),
+                _day_start(day + timedelta(days=1)),
+                _count_search(query, _combine_filters(
+                    _time_range_filter(_day_start(day), _day_start(day + timedelta(days=1))),
+                    filter_by
+                ))
+            )
+            for day in days
+        ], filter_by=filter_by, now=now)
+
+        def assemble_daily_ranges(results: list[dict[str, Any]]) -> dict[str, Any]:
+            distribution = []
+            failed_periods = []
+            for day, day_result in zip(days, counts.resolve(results)):
+                entry = _day_entry(day, day_result.get("found", 0))
+                if "error" in day_result:
+                    failed_periods.append({
+                        "period": entry["period"],
+                        "label": entry["label"],
+                        "error": day_result["error"]
+                    })
+                    continue
+                distribution.append(entry)
+
+            extra = {"failed_periods": failed_periods} if failed_periods else {}
+            return result(distribution, sum(d["count"] for d in distribution), note=note, **extra)
+
+        return TemporalPlan(query, granularity, counts.searches, assemble_daily_ranges)
+
+    raise ValueError(
+        f"Granularidade inválida: {granularity}. Use 'yearly', 'monthly', 'weekly' ou 'daily'"
+    )
+
+
 def _get_month_name(month: int) -> str:
     """Retorna nome do mês em português."""
     months = [
@@ -504,26 +825,81 @@ def format_temporal_distribution(data: dict[str, Any]) -> str:
         output.append("Nenhum dado encontrado para o período especificado.")
         return "\n".join(output)
 
+    stats = compute_series_stats(distribution, data.get("granularity", ""))
+    window = stats["rolling_window"]
+
     output.append("## Distribuição")
     output.append("")
-    output.append("| Período | Quantidade |")
-    output.append("|---------|------------|")
+    output.append(f"| Período | Quantidade | Média Móvel ({window}) |")
+    output.append("|---------|------------|----------------|")
 
-    for item in distribution:
+    for item, rolling in zip(distribution, stats["rolling_mean"]):
         label = item.get("label", item["period"])
         count = item["count"]
-        output.append(f"| {label} | {count:,} |")
+        rolling_cell = f"{rolling:,.1f}" if rolling is not None else ""
+        output.append(f"| {label} | {count:,} | {rolling_cell} |")
 
     # Estatísticas resumidas
     output.append("")
     output.append("## Estatísticas")
     output.append("")
+    output.append(f"- **Total de períodos:** {stats['periods']}")
+    output.append(f"- **Média por período:** {stats['mean']:.0f}")
+    output.append(f"- **Máximo:** {stats['max']['count']:,} ({stats['max']['label']})")
+    output.append(f"- **Mínimo:** {stats['min']['count']:,} ({stats['min']['label']})")
+    if stats["last_change"] is not None:
+        output.append(f"- **Último período vs anterior:** {stats['last_change']:+.1f}%")
+    if stats["mean_growth"] is not None:
+        output.append(f"- **Crescimento médio por período:** {stats['mean_growth']:+.1f}%")
+
+    # Anomalias
+    if stats["anomalies"]:
+        method = "desvio absoluto mediano" if stats["anomaly_method"] == "mad" else "z-score"
+        output.append("")
+        output.append("## Anomalias")
+        output.append("")
+        output.append(f"*Períodos atípicos pelo escore robusto ({method}).*")
+        output.append("")
+        output.append("| Período | Quantidade | Tipo | Escore |")
+        output.append("|---------|------------|------|--------|")
+        for anomaly in stats["anomalies"]:
+            output.append(
+                f"| {anomaly['label']} | {anomaly['count']:,} | "
+                f"{anomaly['direction']} | {anomaly['score']:+.1f} |"
+            )
+
+    # Sazonalidade (1.0 = média da série)
+    if stats["seasonality"]:
+        output.append("")
+        output.append("## Sazonalidade")
+        output.append("")
+        output.append("*Índice sazonal: média da posição no ciclo ÷ média geral (1.00 = média).*")
+        output.append("")
+        output.append("| " + " | ".join(item["label"] for item in stats["seasonality"]) + " |")
+        output.append("|" + "---|" * len(stats["seasonality"]))
+        output.append("| " + " | ".join(f"{item['index']:.2f}" for item in stats["seasonality"]) + " |")
 
-    counts = [item["count"] for item in distribution]
-    if counts:
-        output.append(f"- **Total de períodos:** {len(distribution)}")
-        output.append(f"- **Média por período:** {sum(counts) / len(counts):.0f}")
-        output.append(f"- **Máximo:** {max(counts):,} ({distribution[counts.index(max(counts))]['label']})")
-        output.append(f"- **Mínimo:** {min(counts):,} ({distribution[counts.index(min(counts))]['label']})")
+    # Comparação com o ano anterior (últimos 12 períodos comparáveis)
+    if stats["yoy"]:
+        output.append("")
+        output.append("## Comparação com o Ano Anterior")
+        output.append("")
+        output.append("| Período | Quantidade | Ano Anterior | Diferença | Variação |")
+        output.append("|---------|------------|--------------|-----------|----------|")
+        for item in stats["yoy"][-12:]:
+            change = f"{item['change']:+.1f}%" if item["change"] is not None else "—"
+            output.append(
+                f"| {item['label']} | {item['count']:,} | {item['previous']:,} | "
+                f"{item['delta']:+,} | {change} |"
+            )
+
+    # Períodos que falharam (não entram nas estatísticas)
+    failed_periods = data.get("failed_periods", [])
+    if failed_periods:
+        output.append("")
+        output.append("## Períodos com Erro")
+        output.append("")
+        for item in failed_periods:
+            output.append(f"- {item.get('label', item['period'])}: {item['error']}")
 
     return "\n".join(output)
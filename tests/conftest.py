@@ -1,7 +1,7 @@
 """Pytest configuration and fixtures for GovBRNews MCP Server tests."""
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 
 @pytest.fixture
@@ -46,21 +46,68 @@ def mock_typesense_search_response():
     }
 
 
-@pytest.fixture
-def mock_typesense_collection_info():
-    """Mock collection info response."""
-    return {
+@pytest.fixture(autouse=True)
+def test_settings(monkeypatch):
+    """Settings with test values, installed without reading the environment."""
+    from govbrnews_mcp import config
+
+    settings = config.Settings(
+        _env_file=None,
+        typesense_host="localhost",
+        typesense_port=8108,
+        typesense_protocol="http",
+        typesense_api_key="test_api_key",
+        cache_ttl=300,
+        log_level="INFO",
+    )
+    monkeypatch.setattr(config, "_settings", settings)
+    yield settings
+    config.reset_settings()
+
+
+@pytest.fixture(autouse=True)
+def collection_schema(test_settings):
+    """Preloaded `news` schema, so capability checks never reach Typesense."""
+    from govbrnews_mcp.schema import get_collection_schema, reset_collection_schemas
+
+    reset_collection_schemas()
+    schema = get_collection_schema("news")
+    schema.update({
         "name": "news",
         "num_documents": 295511,
         "fields": [
-            {"name": "unique_id", "type": "string"},
             {"name": "title", "type": "string"},
+            {"name": "content", "type": "string"},
             {"name": "agency", "type": "string", "facet": True},
+            {"name": "category", "type": "string", "facet": True},
+            {"name": "theme_1_level_1", "type": "string", "facet": True},
             {"name": "published_at", "type": "int64"},
             {"name": "published_year", "type": "int32", "facet": True},
+            {"name": "published_month", "type": "int32", "facet": True},
         ],
-        "default_sorting_field": "published_at",
-    }
+    })
+    yield schema
+    reset_collection_schemas()
+
+
+@pytest.fixture(autouse=True)
+def period_cache(test_settings):
+    """Empty temporal period cache, so cached counts never leak between tests."""
+    from govbrnews_mcp.utils.temporal import get_period_cache, reset_period_cache
+
+    reset_period_cache()
+    yield get_period_cache()
+    reset_period_cache()
+
+
+@pytest.fixture(autouse=True)
+def similarity_index(test_settings):
+    """No similarity, duplicate or vector index loaded, so tools use Typesense only."""
+    from govbrnews_mcp.similarity import reset_similarity_index
+
+    reset_similarity_index()
+    yield
+    reset_similarity_index()
 
 
 @pytest.fixture
@@ -83,32 +130,6 @@ def mock_typesense_facets_response():
 
 
 @pytest.fixture
-def mock_typesense_client(
-    mock_typesense_search_response, mock_typesense_collection_info
-):
-    """Mock Typesense client."""
-    mock_client = MagicMock()
-
-    # Mock search method
-    mock_client.search.return_value = mock_typesense_search_response
-
-    # Mock get_collection_info
-    mock_client.get_collection_info.return_value = mock_typesense_collection_info
-
-    # Mock health_check
-    mock_client.health_check.return_value = True
-
-    return mock_client
-
-
-@pytest.fixture
-def mock_settings():
-    """Mock settings with test values."""
-    with patch("govbrnews_mcp.config.settings") as mock:
-        mock.typesense_host = "localhost"
-        mock.typesense_port = 8108
-        mock.typesense_protocol = "http"
-        mock.typesense_api_key = "test_api_key"
-        mock.cache_ttl = 300
-        mock.log_level = "INFO"
-        yield mock
+def mock_settings(test_settings):
+    """Settings with test values (see test_settings)."""
+    return test_settings
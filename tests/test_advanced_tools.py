@@ -1,7 +1,7 @@
 """Tests for advanced tools (facets and similar)."""
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from govbrnews_mcp.tools.facets import get_facets
 from govbrnews_mcp.tools.similar import similar_news
@@ -10,13 +10,14 @@ from govbrnews_mcp.tools.similar import similar_news
 class TestGetFacetsTool:
     """Tests for get_facets tool."""
 
-    @patch("govbrnews_mcp.tools.facets.get_typesense_client")
-    def test_get_facets_success(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.facets.get_async_typesense_client")
+    async def test_get_facets_success(self, mock_get_client):
         """Test getting facets successfully."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.search.return_value = {
             "found": 50211,
             "facet_counts": [
                 {
@@ -29,19 +30,20 @@ class TestGetFacetsTool:
             ]
         }
 
-        result = get_facets(["agency"], query="educação")
+        result = await get_facets(["agency"], query="educação")
 
         assert "# Agregações" in result
         assert "mec" in result
         assert "5,326" in result
 
-    @patch("govbrnews_mcp.tools.facets.get_typesense_client")
-    def test_get_facets_multiple_fields(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.facets.get_async_typesense_client")
+    async def test_get_facets_multiple_fields(self, mock_get_client):
         """Test getting facets for multiple fields."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.search.return_value = {
             "found": 10000,
             "facet_counts": [
                 {
@@ -55,70 +57,90 @@ class TestGetFacetsTool:
             ]
         }
 
-        result = get_facets(["agency", "published_year"])
+        result = await get_facets(["agency", "published_year"])
 
         assert "Agências" in result
         assert "Anos" in result
         assert "mec" in result
         assert "2025" in result
 
-    def test_get_facets_invalid_fields(self):
+    @pytest.mark.asyncio
+    async def test_get_facets_invalid_fields(self):
         """Test get_facets with invalid fields."""
-        result = get_facets(["invalid_field"])
+        result = await get_facets(["invalid_field"])
 
         assert "# Erro" in result
         assert "invalid_field" in result
         assert "Campos válidos" in result
 
-    def test_get_facets_empty_fields(self):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.facets.get_async_typesense_client")
+    async def test_get_facets_field_not_facetable(self, mock_get_client, collection_schema):
+        """Test fields without facet support are rejected before querying."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        collection_schema.update({"fields": [{"name": "agency", "type": "string"}]})
+
+        result = await get_facets(["agency"])
+
+        assert "# Erro" in result
+        assert "agency" in result
+        mock_client.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_facets_empty_fields(self):
         """Test get_facets with empty field list."""
-        result = get_facets([])
+        result = await get_facets([])
 
         assert "# Erro" in result
         assert "Nenhum campo de facet especificado" in result
 
-    @patch("govbrnews_mcp.tools.facets.get_typesense_client")
-    def test_get_facets_limit_adjustment(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.facets.get_async_typesense_client")
+    async def test_get_facets_limit_adjustment(self, mock_get_client):
         """Test that max_values is adjusted if out of range."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.search.return_value = {
             "found": 1000,
             "facet_counts": []
         }
 
         # Should adjust to 100
-        result = get_facets(["agency"], max_values=500)
+        result = await get_facets(["agency"], max_values=500)
 
         # Verify it was called with max 100
-        call_args = mock_client.client.collections.__getitem__.return_value.documents.search.call_args
-        assert call_args[0][0]["max_facet_values"] == 100
+        call_args = mock_client.search.call_args
+        assert call_args[0][1]["max_facet_values"] == 100
 
-    @patch("govbrnews_mcp.tools.facets.get_typesense_client")
-    def test_get_facets_no_results(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.facets.get_async_typesense_client")
+    async def test_get_facets_no_results(self, mock_get_client):
         """Test get_facets when no aggregations found."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.search.return_value = {
             "found": 0,
             "facet_counts": []
         }
 
-        result = get_facets(["agency"])
+        result = await get_facets(["agency"])
 
         assert "Nenhuma agregação encontrada" in result
 
-    @patch("govbrnews_mcp.tools.facets.get_typesense_client")
-    def test_get_facets_error_handling(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.facets.get_async_typesense_client")
+    async def test_get_facets_error_handling(self, mock_get_client):
         """Test get_facets error handling."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.side_effect = Exception("API error")
+        mock_client.search.side_effect = Exception("API error")
 
-        result = get_facets(["agency"])
+        result = await get_facets(["agency"])
 
         assert "# Erro ao Obter Agregações" in result
         assert "API error" in result
@@ -127,10 +149,11 @@ class TestGetFacetsTool:
 class TestSimilarNewsTool:
     """Tests for similar_news tool."""
 
-    @patch("govbrnews_mcp.tools.similar.get_typesense_client")
-    def test_similar_news_success(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_similar_news_success(self, mock_get_client):
         """Test finding similar news successfully."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         # Mock reference document
@@ -163,32 +186,37 @@ class TestSimilarNewsTool:
                 }
             ]
         }
+        mock_client.get_documents.return_value = {
+            "124": {"id": "124", "title": "Similar News 1", "agency": "mec", "published_at": 1609459200}
+        }
 
-        result = similar_news("123", limit=5)
+        result = await similar_news("123", limit=5)
 
         assert "# Notícias Similares" in result
         assert "Test News" in result
         assert "Similar News 1" in result
         assert "123" not in result.split("---")[1]  # Reference should be excluded from results
 
-    @patch("govbrnews_mcp.tools.similar.get_typesense_client")
-    def test_similar_news_reference_not_found(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_similar_news_reference_not_found(self, mock_get_client):
         """Test similar_news when reference document not found."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         mock_client.get_document.side_effect = Exception("Not found")
 
-        result = similar_news("999")
+        result = await similar_news("999")
 
         assert "# Erro" in result
         assert "999" in result
         assert "não encontrada" in result
 
-    @patch("govbrnews_mcp.tools.similar.get_typesense_client")
-    def test_similar_news_no_similar_found(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_similar_news_no_similar_found(self, mock_get_client):
         """Test similar_news when no similar documents found."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         # Mock reference document
@@ -213,14 +241,15 @@ class TestSimilarNewsTool:
             ]
         }
 
-        result = similar_news("123")
+        result = await similar_news("123")
 
         assert "Nenhuma notícia similar encontrada" in result
 
-    @patch("govbrnews_mcp.tools.similar.get_typesense_client")
-    def test_similar_news_limit_adjustment(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_similar_news_limit_adjustment(self, mock_get_client):
         """Test that limit is adjusted if out of range."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         mock_client.get_document.return_value = {
@@ -235,16 +264,17 @@ class TestSimilarNewsTool:
         }
 
         # Should adjust to 20
-        result = similar_news("123", limit=100)
+        result = await similar_news("123", limit=100)
 
         # Verify it was called with max 21 (20 + 1 for reference)
         call_args = mock_client.search.call_args
         assert call_args[0][1]["per_page"] == 21
 
-    @patch("govbrnews_mcp.tools.similar.get_typesense_client")
-    def test_similar_news_without_filters(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_similar_news_without_filters(self, mock_get_client):
         """Test similar_news with minimal reference data."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         # Reference with only year
@@ -267,14 +297,15 @@ class TestSimilarNewsTool:
             ]
         }
 
-        result = similar_news("123")
+        result = await similar_news("123")
 
         assert "# Notícias Similares" in result
 
-    @patch("govbrnews_mcp.tools.similar.get_typesense_client")
-    def test_similar_news_error_handling(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_similar_news_error_handling(self, mock_get_client):
         """Test similar_news error handling."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         mock_client.get_document.return_value = {
@@ -284,7 +315,7 @@ class TestSimilarNewsTool:
 
         mock_client.search.side_effect = Exception("Search error")
 
-        result = similar_news("123")
+        result = await similar_news("123")
 
         assert "# Erro ao Buscar Notícias Similares" in result
         assert "Search error" in result
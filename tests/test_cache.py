@@ -0,0 +1,94 @@
+"""Tests for the Typesense response cache."""
+
+import pytest
+
+from govbrnews_mcp.cache import ResponseCache, estimate_size, make_cache_key
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_cache_key_ignores_dict_order():
+    """Test keys are canonical regardless of parameter order."""
+    key_a = make_cache_key("news", {"q": "educação", "per_page": 0})
+    key_b = make_cache_key("news", {"per_page": 0, "q": "educação"})
+
+    assert key_a == key_b
+    assert key_a != make_cache_key("news", {"q": "saúde", "per_page": 0})
+
+
+def test_cache_hit_and_miss_counters():
+    """Test hits and misses are counted."""
+    cache = ResponseCache(ttl=60, max_entries=10, max_bytes=10_000)
+
+    assert cache.get("a") is None
+    cache.set("a", {"found": 1})
+    assert cache.get("a") == {"found": 1}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_ttl_expiration():
+    """Test entries expire after the TTL."""
+    timer = FakeTimer()
+    cache = ResponseCache(ttl=60, max_entries=10, max_bytes=10_000, timer=timer)
+
+    cache.set("a", {"found": 1})
+    timer.now = 59
+    assert cache.get("a") is not None
+
+    timer.now = 61
+    assert cache.get("a") is None
+
+
+def test_cache_max_entries_evicts_lru():
+    """Test the entry bound evicts the least recently used entry."""
+    cache = ResponseCache(ttl=60, max_entries=2, max_bytes=10_000)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_byte_budget():
+    """Test the byte budget evicts entries and skips oversized values."""
+    cache = ResponseCache(ttl=60, max_entries=100, max_bytes=100)
+
+    cache.set("a", "x", size=60)
+    cache.set("b", "y", size=60)
+    assert cache.get("a") is None
+    assert cache.get("b") == "y"
+
+    cache.set("big", "z", size=1000)
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] == 60
+
+
+def test_cache_disabled_with_zero_ttl():
+    """Test cache_ttl=0 disables caching."""
+    cache = ResponseCache(ttl=0, max_entries=10, max_bytes=10_000)
+
+    cache.set("a", 1)
+
+    assert cache.enabled is False
+    assert cache.get("a") is None
+
+
+def test_estimate_size():
+    """Test size estimation uses the UTF-8 JSON encoding."""
+    assert estimate_size({"q": "é"}) == len('{"q":"é"}'.encode())
@@ -0,0 +1,137 @@
+"""Tests for the compare_agencies_data tool."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from govbrnews_mcp.tools.compare import compare_agencies_data
+from govbrnews_mcp.utils.batch import build_exact_filter
+
+
+def _multi_search_response(searches):
+    """Answer overview searches with facets and monthly counts with 'found'."""
+    results = []
+    for search in searches:
+        agency = "mec" if "`mec`" in search["filter_by"] else "capes"
+        if "facet_by" in search:
+            results.append({
+                "found": 300 if agency == "mec" else 100,
+                "facet_counts": [
+                    {"field_name": "theme_1_level_1", "counts": [
+                        {"value": "Educação", "count": 200 if agency == "mec" else 80},
+                        *([{"value": "Ciência", "count": 20}] if agency == "capes" else []),
+                    ]},
+                    {"field_name": "category", "counts": []},
+                ],
+            })
+        else:
+            results.append({"found": 10 if agency == "mec" else 5})
+    return results
+
+
+class TestCompareAgenciesTool:
+    """Tests for compare_agencies_data tool."""
+
+    def test_build_exact_filter(self):
+        """Test values are backtick-quoted so separators stay in the value."""
+        assert build_exact_filter("agency", "Ministério: Saúde") == "agency:=`Ministério: Saúde`"
+        assert build_exact_filter("agency", ["a", "b`c"]) == "agency:=[`a`,`bc`]"
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.compare.get_async_typesense_client")
+    async def test_compare_agencies_runs_one_batch(self, mock_get_client):
+        """Test every per-agency query goes out in a single multi_search."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.multi_search.side_effect = _multi_search_response
+
+        result = await compare_agencies_data(["mec", "capes"], theme="bolsas", months=3)
+
+        mock_client.multi_search.assert_called_once()
+        searches = mock_client.multi_search.call_args[0][0]
+        # (visão geral + 3 meses) por agência
+        assert len(searches) == 2 * (1 + 3)
+        assert all(s["q"] == "bolsas" for s in searches)
+        assert searches[0]["filter_by"] == "agency:=`mec`"
+        assert searches[1]["filter_by"].endswith("&& agency:=`mec`")
+
+        assert "# Comparação entre Agências" in result
+        assert "| mec | 300 | 75.0% |" in result
+        assert "| Período | mec | capes |" in result
+        assert "| **Total** | 30 | 15 |" in result
+        # Temas alinhados: "Ciência" só aparece entre os mais frequentes da CAPES
+        assert "| Educação | 200 | 80 |" in result
+        assert "| Ciência | — | 20 |" in result
+
+    @pytest.mark.asyncio
+    async def test_compare_agencies_requires_two_agencies(self):
+        """Test fewer than two distinct agencies is rejected."""
+        result = await compare_agencies_data(["mec", "mec"])
+
+        assert "# Erro" in result
+        assert "2 a 10" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.compare.get_async_typesense_client")
+    async def test_compare_agencies_partial_failure(self, mock_get_client):
+        """Test a failed agency overview is shown as an error cell."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        def side_effect(searches):
+            results = _multi_search_response(searches)
+            results[0] = {"error": "timeout", "code": 408}
+            return results
+
+        mock_client.multi_search.side_effect = side_effect
+
+        result = await compare_agencies_data(["mec", "capes"], months=1)
+
+        assert "| mec | erro | — |" in result
+        assert "| capes | 100 | 100.0% |" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.compare.get_async_typesense_client")
+    async def test_compare_agencies_facet_failure_uses_ranges(
+        self, mock_get_client, collection_schema
+    ):
+        """Test a failed monthly facet is retried with per-month counts for every agency."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        collection_schema.update({"fields": [
+            {"name": "theme_1_level_1", "type": "string", "facet": True},
+            {"name": "category", "type": "string", "facet": True},
+            {"name": "published_year_month", "type": "int32", "facet": True},
+        ]})
+
+        def side_effect(searches):
+            return [
+                {"error": "Could not find a facet field named `published_year_month`", "code": 404}
+                if s.get("facet_by") == "published_year_month" else result
+                for s, result in zip(searches, _multi_search_response(searches))
+            ]
+
+        mock_client.multi_search.side_effect = side_effect
+
+        result = await compare_agencies_data(["mec", "capes"], months=3)
+
+        assert mock_client.multi_search.call_count == 2
+        retry = mock_client.multi_search.call_args_list[1][0][0]
+        # Só as séries mensais são refeitas: 3 meses por agência
+        assert len(retry) == 2 * 3
+        assert all("published_month:=" in s["filter_by"] for s in retry)
+        assert "| **Total** | 30 | 15 |" in result
+        assert "| mec | 300 | 75.0% |" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.compare.get_async_typesense_client")
+    async def test_compare_agencies_error_handling(self, mock_get_client):
+        """Test backend errors return an error report."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.multi_search.side_effect = Exception("Connection error")
+
+        result = await compare_agencies_data(["mec", "capes"])
+
+        assert "# Erro na Comparação de Agências" in result
+        assert "Connection error" in result
@@ -59,3 +59,19 @@ def test_settings_custom_values(monkeypatch):
     assert settings.typesense_api_key == "custom_key"
     assert settings.cache_ttl == 600
     assert settings.log_level == "DEBUG"
+
+
+def test_get_settings_is_lazy_and_resettable(monkeypatch):
+    """Test settings are loaded on first access and reloaded after reset."""
+    from govbrnews_mcp import config
+
+    config.reset_settings()
+    monkeypatch.setenv("TYPESENSE_API_KEY", "first_key")
+    settings = config.get_settings()
+    assert config.get_settings() is settings
+    assert config.settings is settings
+
+    monkeypatch.setenv("TYPESENSE_API_KEY", "second_key")
+    config.reset_settings()
+    assert config.get_settings().typesense_api_key == "second_key"
+    config.reset_settings()
@@ -0,0 +1,237 @@
+"""Tests for MinHash/LSH near-duplicate detection."""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from govbrnews_mcp.similarity import (
+    MinHashIndex,
+    cluster_duplicates,
+    get_duplicate_index,
+    minhash_signature,
+)
+from govbrnews_mcp.similarity.build import update_duplicate_index
+from govbrnews_mcp.similarity.minhash import estimate_similarity
+from govbrnews_mcp.tools.duplicates import find_duplicates
+from govbrnews_mcp.tools.search import search_news
+
+RELEASE = (
+    "O Ministério da Saúde inicia nesta segunda-feira a campanha nacional de "
+    "vacinação contra a gripe em todas as unidades básicas de saúde do país, "
+    "com prioridade para idosos, crianças, gestantes e profissionais de saúde"
+)
+REPUBLISHED = RELEASE + ", informou o governo federal"
+UNRELATED = (
+    "O leilão de energia eólica realizado pela agência reguladora bateu recorde "
+    "de investimentos e vai ampliar a capacidade instalada no Nordeste"
+)
+
+DOCUMENTS = [
+    {"id": "1", "title": "Vacinação contra a gripe", "content": RELEASE, "published_at": 1704067200},
+    {"id": "2", "title": "Vacinação contra a gripe", "content": REPUBLISHED,
+     "published_at": 1704153600},
+    {"id": "3", "title": "Leilão de energia", "content": UNRELATED, "published_at": 1704240000},
+]
+
+
+class TestMinHash:
+    """Tests for MinHash signatures and clustering."""
+
+    def test_signature_is_deterministic(self):
+        """Test signatures do not depend on the process (saved indexes stay valid)."""
+        signature = minhash_signature(RELEASE)
+
+        assert signature.dtype == np.uint32
+        np.testing.assert_array_equal(signature, minhash_signature(RELEASE))
+
+    def test_similarity_separates_copies_from_other_news(self):
+        """Test a republished release scores high and unrelated news low."""
+        reference = minhash_signature(RELEASE)
+        signatures = np.stack([minhash_signature(REPUBLISHED), minhash_signature(UNRELATED)])
+
+        copy, other = estimate_similarity(signatures, reference)
+
+        assert copy >= 0.8
+        assert other < 0.2
+
+    def test_cluster_duplicates(self):
+        """Test copies share a group and empty texts never match."""
+        signatures = np.stack([
+            minhash_signature(text) for text in (RELEASE, UNRELATED, REPUBLISHED, "", "")
+        ])
+
+        assert cluster_duplicates(signatures, 0.8) == [0, 1, 0, 3, 4]
+
+
+class TestMinHashIndex:
+    """Tests for MinHashIndex."""
+
+    def test_query_finds_copies(self):
+        """Test the LSH query returns copies and skips excluded IDs."""
+        index = MinHashIndex()
+        assert index.add_documents(DOCUMENTS) == 3
+
+        matches = index.query(index.signature_of("1"), 0.8, exclude={"1"})
+
+        assert [doc_id for doc_id, _ in matches] == ["2"]
+        assert index.watermark == 1704240000
+
+    def test_add_ignores_indexed_ids(self):
+        """Test re-exported documents are not indexed twice."""
+        index = MinHashIndex()
+        index.add_documents(DOCUMENTS)
+
+        assert index.add_documents(DOCUMENTS[:1]) == 0
+        assert len(index) == 3
+
+    def test_save_and_load_memory_mapped(self, tmp_path):
+        """Test a saved index reopens memory-mapped with the same results."""
+        index = MinHashIndex()
+        index.add_documents(DOCUMENTS)
+        index.save(tmp_path)
+
+        loaded = MinHashIndex.load(tmp_path)
+
+        assert loaded.ids == index.ids
+        assert loaded.watermark == index.watermark
+        assert loaded.published_at_of("2") == 1704153600
+        assert loaded.query(loaded.signature_of("2"), 0.8) == index.query(index.signature_of("2"), 0.8)
+
+    def test_get_duplicate_index_from_settings(self, tmp_path, test_settings):
+        """Test the configured index is loaded once, even while still empty."""
+        MinHashIndex().save(tmp_path / "index")
+        test_settings.duplicate_index_path = str(tmp_path / "index")
+
+        index = get_duplicate_index()
+
+        assert index is not None
+        assert get_duplicate_index() is index
+
+    def test_save_keeps_mapped_index_valid(self, tmp_path):
+        """Test saving over an open index leaves its memory-mapped arrays intact."""
+        index = MinHashIndex()
+        index.add_documents(DOCUMENTS[:2])
+        index.save(tmp_path / "index")
+        loaded = MinHashIndex.load(tmp_path / "index")
+        before = np.array(loaded.signature_of("2"))
+
+        index.add_documents(DOCUMENTS[2:])
+        index.save(tmp_path / "index")
+
+        np.testing.assert_array_equal(loaded.signature_of("2"), before)
+        assert len(MinHashIndex.load(tmp_path / "index")) == 3
+        assert [p.name for p in tmp_path.iterdir()] == ["index"]
+
+    def test_get_duplicate_index_reloads_after_save(self, tmp_path, test_settings):
+        """Test a new save on disk replaces the loaded index."""
+        index = MinHashIndex()
+        index.add_documents(DOCUMENTS[:2])
+        index.save(tmp_path / "index")
+        test_settings.duplicate_index_path = str(tmp_path / "index")
+        assert len(get_duplicate_index()) == 2
+
+        index.add_documents(DOCUMENTS[2:])
+        index.save(tmp_path / "index")
+
+        assert len(get_duplicate_index()) == 3
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.similarity.build.get_async_typesense_client")
+    async def test_update_exports_only_new_documents(self, mock_get_client, tmp_path):
+        """Test the second update re-exports the settle window before the watermark."""
+        filters = []
+        # Ingerida depois da primeira atualização, publicada antes do watermark
+        late = {"id": "4", "title": "Atrasada", "content": UNRELATED, "published_at": 1704200000}
+
+        async def export_documents(collection, include_fields=None, filter_by=None):
+            filters.append(filter_by)
+            for doc in DOCUMENTS + ([late] if filter_by else []):
+                yield doc
+
+        mock_client = AsyncMock()
+        mock_client.export_documents = export_documents
+        mock_get_client.return_value = mock_client
+
+        await update_duplicate_index(tmp_path)
+        index = await update_duplicate_index(tmp_path)
+
+        # Watermark (1704240000) menos period_settle_seconds (2 dias)
+        assert filters == [None, "published_at:>=1704067200"]
+        assert len(index) == 4
+
+
+class TestFindDuplicates:
+    """Tests for the find_duplicates tool."""
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.duplicates.get_async_typesense_client")
+    async def test_candidates_are_compared_without_index(self, mock_get_client):
+        """Test Typesense candidates are compared and listed oldest first."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_document.return_value = {**DOCUMENTS[1], "agency": "Agência Gov"}
+        mock_client.search.return_value = {"found": 3, "hits": [
+            {"document": {**doc, "agency": "Ministério da Saúde"}} for doc in DOCUMENTS
+        ]}
+
+        result = await find_duplicates("2")
+
+        # MinHash precisa do texto inteiro dos candidatos
+        assert "content" in mock_client.search.call_args[0][1]["include_fields"].split(",")
+        assert "**Encontrado:** 1 cópias" in result
+        assert "Leilão de energia" not in result
+        assert "Publicação mais antiga: `1` (Ministério da Saúde)" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.duplicates.get_duplicate_index")
+    @patch("govbrnews_mcp.tools.duplicates.get_async_typesense_client")
+    async def test_index_is_used_when_available(self, mock_get_client, mock_get_index):
+        """Test the on-disk index answers without a candidate search."""
+        index = MinHashIndex()
+        index.add_documents(DOCUMENTS)
+        mock_get_index.return_value = index
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_document.return_value = DOCUMENTS[0]
+        mock_client.get_documents.return_value = {"2": DOCUMENTS[1]}
+
+        result = await find_duplicates("1")
+
+        mock_client.search.assert_not_called()
+        mock_client.get_documents.assert_called_once_with("news", ["2"])
+        assert "índice de duplicatas (3 notícias)" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.duplicates.get_async_typesense_client")
+    async def test_missing_reference(self, mock_get_client):
+        """Test an unknown ID returns an error message."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_document.side_effect = Exception("Not found")
+
+        result = await find_duplicates("999")
+
+        assert "não encontrada" in result
+
+
+class TestSearchDedupe:
+    """Tests for search_news(dedupe=True)."""
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+    async def test_copies_collapse_to_earliest(self, mock_get_client):
+        """Test copies collapse to the earliest one and extra results are fetched."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.search.return_value = {"found": 3, "hits": [
+            {"document": DOCUMENTS[1]}, {"document": DOCUMENTS[2]}, {"document": DOCUMENTS[0]},
+        ]}
+
+        result = await search_news("vacinação", limit=5, dedupe=True)
+
+        params = mock_client.search.call_args[0][1]
+        assert params["per_page"] == 15
+        assert "content" in params["include_fields"].split(",")
+        assert "1 cópias quase idênticas ocultadas" in result
+        assert result.count("Vacinação contra a gripe") == 1
+        assert "Leilão de energia" in result
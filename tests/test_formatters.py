@@ -2,6 +2,9 @@
 
 import pytest
 from govbrnews_mcp.utils.formatters import (
+    SEARCH_RESULT_FIELDS,
+    build_projection_params,
+    get_highlight_snippet,
     format_timestamp,
     format_search_results,
     format_facets_results,
@@ -122,3 +125,45 @@ def test_format_document_minimal():
 
     assert "# Título Mínimo" in result
     assert "## Metadados" in result
+
+
+def test_format_search_results_uses_highlight_snippet():
+    """Test server-side snippets are used instead of the content field."""
+    results = {
+        "found": 1,
+        "hits": [
+            {
+                "document": {"id": "1", "title": "Programa de alfabetização"},
+                "highlights": [
+                    {"field": "content", "snippet": "novo programa de **alfabetização** nas escolas"}
+                ],
+            }
+        ],
+    }
+
+    result = format_search_results(results)
+
+    assert "**Resumo:**" in result
+    assert "novo programa de **alfabetização** nas escolas" in result
+
+
+def test_get_highlight_snippet_formats():
+    """Test snippet extraction from both Typesense highlight formats."""
+    legacy = {"highlights": [{"field": "content", "snippet": "a"}]}
+    current = {"highlight": {"content": {"snippet": "b", "matched_tokens": ["b"]}}}
+
+    assert get_highlight_snippet(legacy, "content") == "a"
+    assert get_highlight_snippet(current, "content") == "b"
+    assert get_highlight_snippet({}, "content") is None
+
+
+def test_build_projection_params():
+    """Test keyword queries exclude the article body and wildcards keep it."""
+    keyword = build_projection_params("educação")
+    wildcard = build_projection_params("*")
+
+    assert keyword["include_fields"] == SEARCH_RESULT_FIELDS
+    assert "content" not in keyword["include_fields"].split(",")
+    assert keyword["highlight_fields"] == "content"
+    assert "content" in wildcard["include_fields"].split(",")
+    assert "highlight_fields" not in wildcard
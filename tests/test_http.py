@@ -0,0 +1,111 @@
+"""Tests for the streamable HTTP serving mode."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_server_resources_are_shared_by_nested_holders():
+    """Per-session lifespans must not stop resources held by the app lifespan."""
+    from govbrnews_mcp import server
+
+    snapshot = MagicMock()
+    snapshot.stop = AsyncMock()
+    with patch("govbrnews_mcp.server.get_resource_snapshot", return_value=snapshot), \
+         patch("govbrnews_mcp.server.reset_typesense_clients", new=AsyncMock()) as reset:
+        async with server.server_resources():
+            async with server.lifespan(server.mcp):
+                pass
+            async with server.lifespan(server.mcp):
+                pass
+
+            snapshot.start.assert_called_once()
+            snapshot.stop.assert_not_awaited()
+            reset.assert_not_awaited()
+
+        snapshot.stop.assert_awaited_once()
+        reset.assert_awaited_once()
+
+
+def test_http_app_serves_initialize_statelessly_with_workers(test_settings):
+    """Test the HTTP app answers MCP requests and is stateless with several workers."""
+    from starlette.testclient import TestClient
+    from govbrnews_mcp import server
+
+    test_settings.http_workers = 4
+    test_settings.http_host = "0.0.0.0"
+    test_settings.http_allowed_hosts = ["testserver"]
+    snapshot = MagicMock()
+    snapshot.stop = AsyncMock()
+    original = server.mcp.settings.model_copy()
+
+    try:
+        with patch("govbrnews_mcp.server.get_resource_snapshot", return_value=snapshot), \
+             patch("govbrnews_mcp.server.reset_typesense_clients", new=AsyncMock()):
+            app = server.create_http_app()
+            assert server.mcp.settings.stateless_http is True
+            security = server.mcp.settings.transport_security
+            assert security.enable_dns_rebinding_protection is True
+            assert security.allowed_hosts == ["testserver"]
+
+            with TestClient(app) as client:
+                response = client.post(
+                    "/mcp",
+                    headers={"Accept": "application/json, text/event-stream"},
+                    json={
+                        "jsonrpc": "2.0",
+                        "id": 1,
+                        "method": "initialize",
+                        "params": {
+                            "protocolVersion": "2024-11-05",
+                            "capabilities": {},
+                            "clientInfo": {"name": "test", "version": "0"},
+                        },
+                    },
+                )
+                snapshot.start.assert_called_once()
+
+            snapshot.stop.assert_awaited_once()
+    finally:
+        server.mcp.settings = original
+
+    assert response.status_code == 200
+    assert "mcp-session-id" not in response.headers
+    data = next(
+        line[len("data:"):] for line in response.text.splitlines() if line.startswith("data:")
+    )
+    assert json.loads(data)["result"]["serverInfo"]["name"] == "GovBRNews"
+
+
+def test_transport_security_defaults_to_loopback_and_bind_host(test_settings):
+    """Test DNS rebinding protection stays on for non-loopback hosts."""
+    from govbrnews_mcp.server import transport_security_settings
+
+    test_settings.http_host = "10.0.0.5"
+    security = transport_security_settings(test_settings)
+
+    assert security.enable_dns_rebinding_protection is True
+    assert "10.0.0.5:*" in security.allowed_hosts
+    assert "http://10.0.0.5:*" in security.allowed_origins
+
+    test_settings.http_host = "0.0.0.0"
+    assert "0.0.0.0:*" not in transport_security_settings(test_settings).allowed_hosts
+
+    test_settings.http_allowed_origins = ["https://painel.gov.br"]
+    assert transport_security_settings(test_settings).allowed_origins == ["https://painel.gov.br"]
+
+
+def test_transport_security_rejects_unknown_host(test_settings):
+    """Test Host headers outside the allowed list are refused."""
+    from mcp.server.transport_security import TransportSecurityMiddleware
+    from govbrnews_mcp.server import transport_security_settings
+
+    test_settings.http_host = "0.0.0.0"
+    test_settings.http_allowed_hosts = ["mcp.example.gov.br"]
+    middleware = TransportSecurityMiddleware(transport_security_settings(test_settings))
+
+    assert middleware._validate_host("mcp.example.gov.br")
+    assert not middleware._validate_host("attacker.example")
+    assert not middleware._validate_origin("http://attacker.example")
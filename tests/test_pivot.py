@@ -0,0 +1,164 @@
+"""Tests for the get_pivot tool."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from govbrnews_mcp.tools.pivot import get_pivot
+
+
+def _facet(field, counts):
+    return {"field_name": field, "counts": [{"value": v, "count": c} for v, c in counts]}
+
+
+class TestGetPivotTool:
+    """Tests for get_pivot tool."""
+
+    @pytest.mark.asyncio
+    async def test_get_pivot_invalid_fields(self):
+        """Test invalid or repeated fields are rejected."""
+        assert "# Erro" in await get_pivot("agency", "agency")
+        assert "# Erro" in await get_pivot("agency", "url")
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.pivot.get_async_typesense_client")
+    async def test_get_pivot_uses_compound_field(self, mock_get_client, collection_schema):
+        """Test a compound facet field produces the table in one query."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        collection_schema.update({"fields": [
+            {"name": "agency", "type": "string", "facet": True},
+            {"name": "published_year", "type": "int32", "facet": True},
+            {"name": "agency_year", "type": "string", "facet": True},
+        ]})
+        mock_client.search.side_effect = [
+            {
+                "found": 1000,
+                "facet_counts": [
+                    _facet("agency", [("mec", 600), ("capes", 150)]),
+                    _facet("published_year", [("2024", 550), ("2023", 200)]),
+                ],
+            },
+            {
+                "found": 750,
+                "facet_counts": [
+                    _facet("agency_year", [("mec|2024", 400), ("mec|2023", 200), ("capes|2024", 150)]),
+                ],
+            },
+        ]
+
+        result = await get_pivot("agency", "published_year")
+
+        mock_client.multi_search.assert_not_called()
+        totals, cells = [call[0][1] for call in mock_client.search.call_args_list]
+        assert totals["facet_by"] == "agency,published_year"
+        assert cells["facet_by"] == "agency_year"
+        # Células restritas às linhas e colunas exibidas: facet completo
+        assert cells["filter_by"] == "agency:=[`mec`,`capes`] && published_year:[2023,2024]"
+        assert cells["max_facet_values"] == 4
+
+        assert "| Agência \\ Ano | 2023 | 2024 | **Total** |" in result
+        assert "| mec | 200 | 400 | **600** |" in result
+        # Célula sem notícias fica vazia (saída esparsa)
+        assert "| capes |  | 150 | **150** |" in result
+        assert "| **Total** | **200** | **550** | **1,000** |" in result
+        assert "3 de 4 células" in result
+        assert "`agency_year`" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.pivot.get_async_typesense_client")
+    async def test_get_pivot_inverted_compound_field(self, mock_get_client, collection_schema):
+        """Test a compound field in the opposite order is read inverted."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        collection_schema.update({"fields": [
+            {"name": "agency_year", "type": "string", "facet": True},
+        ]})
+        mock_client.search.side_effect = [
+            {
+                "found": 400,
+                "facet_counts": [
+                    _facet("agency", [("mec", 400)]),
+                    _facet("published_year", [("2024", 400)]),
+                ],
+            },
+            {"found": 400, "facet_counts": [_facet("agency_year", [("mec|2024", 400)])]},
+        ]
+
+        result = await get_pivot("published_year", "agency")
+
+        assert "| 2024 | 400 | **400** |" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.pivot.get_async_typesense_client")
+    async def test_get_pivot_batched_fallback(self, mock_get_client):
+        """Test without a compound field the rows go out in one multi_search."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        mock_client.search.return_value = {
+            "found": 900,
+            "facet_counts": [
+                _facet("theme_1_level_1", [("Saúde", 500), ("Educação", 300)]),
+                _facet("agency", [("saude", 450), ("mec", 350)]),
+            ],
+        }
+        mock_client.multi_search.return_value = [
+            {"found": 450, "facet_counts": [_facet("agency", [("saude", 450)])]},
+            {"error": "timeout", "code": 408},
+        ]
+
+        result = await get_pivot("theme_1_level_1", "agency", query="vacina", top_k=2)
+
+        mock_client.search.assert_called_once()
+        mock_client.multi_search.assert_called_once()
+        searches = mock_client.multi_search.call_args[0][0]
+        assert [s["filter_by"] for s in searches] == [
+            "theme_1_level_1:=`Saúde` && agency:=[`saude`,`mec`]",
+            "theme_1_level_1:=`Educação` && agency:=[`saude`,`mec`]",
+        ]
+        assert all(s["facet_by"] == "agency" and s["max_facet_values"] == 2 for s in searches)
+
+        assert "| Saúde | 450 |  | **500** |" in result
+        assert "| Educação | erro | erro | **300** |" in result
+        assert "**Linhas com erro:** Educação" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.pivot.get_async_typesense_client")
+    async def test_get_pivot_year_rows_use_numeric_filter(self, mock_get_client):
+        """Test year rows are filtered numerically and sorted chronologically."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        mock_client.search.return_value = {
+            "found": 30,
+            "facet_counts": [
+                _facet("published_year", [("2025", 20), ("2024", 10)]),
+                _facet("category", [("Notícias", 30)]),
+            ],
+        }
+        mock_client.multi_search.side_effect = lambda searches: [
+            {"facet_counts": [_facet("category", [("Notícias", 10)])]} for _ in searches
+        ]
+
+        await get_pivot("published_year", "category")
+
+        searches = mock_client.multi_search.call_args[0][0]
+        assert [s["filter_by"] for s in searches] == [
+            "published_year:=2024 && category:=[`Notícias`]",
+            "published_year:=2025 && category:=[`Notícias`]",
+        ]
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.pivot.get_async_typesense_client")
+    async def test_get_pivot_error_handling(self, mock_get_client):
+        """Test backend errors return an error report."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.search.side_effect = Exception("Connection error")
+
+        result = await get_pivot("agency", "category")
+
+        assert "# Erro ao Gerar Tabela Dinâmica" in result
+        assert "Connection error" in result
@@ -40,6 +40,7 @@ class TestAnalyzeThemePrompt:
         assert "search_news" in content_text
         assert "analyze_temporal" in content_text
         assert "get_facets" in content_text
+        assert "theme_report" in content_text
 
     def test_analyze_theme_has_structured_analysis(self):
         """Test that prompt has structured analysis sections."""
@@ -109,6 +110,7 @@ class TestCompareAgenciesPrompt:
         assert "search_news" in content_text
         assert "analyze_temporal" in content_text
         assert "get_facets" in content_text
+        assert "compare_agencies_data" in content_text
 
     def test_compare_agencies_has_structured_comparison(self):
         """Test that prompt has structured comparison sections."""
@@ -0,0 +1,157 @@
+"""Tests for the theme_report tool."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from govbrnews_mcp.tools.report import theme_report
+
+
+def _multi_search_response(searches):
+    """Respond to the report batch: overview first, then count searches."""
+    overview = {
+        "found": 1200,
+        "facet_counts": [
+            {"field_name": "agency", "counts": [
+                {"value": "mec", "count": 600},
+                {"value": "capes", "count": 300},
+            ]},
+            {"field_name": "theme_1_level_1", "counts": [
+                {"value": "Educação", "count": 900},
+            ]},
+            {"field_name": "category", "counts": []},
+        ],
+        "hits": [
+            {
+                "document": {
+                    "id": "1",
+                    "title": "Novo programa de alfabetização",
+                    "agency": "mec",
+                    "published_at": 1704067200,
+                    "url": "https://example.gov.br/1",
+                },
+                "highlights": [{"field": "content", "snippet": "programa de **educação** básica"}],
+            }
+        ],
+    }
+    return [overview] + [{"found": 10 * (i + 1)} for i in range(len(searches) - 1)]
+
+
+class TestThemeReportTool:
+    """Tests for theme_report tool."""
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.report.get_async_typesense_client")
+    async def test_theme_report_runs_one_batch(self, mock_get_client):
+        """Test every query of the report goes out in a single multi_search."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.multi_search.side_effect = _multi_search_response
+
+        result = await theme_report("educação", months=6, weeks=4, top_news=3)
+
+        mock_client.multi_search.assert_called_once()
+        mock_client.search.assert_not_called()
+
+        searches = mock_client.multi_search.call_args[0][0]
+        # Visão geral + 6 meses + 4 semanas (sem published_week no schema)
+        assert len(searches) == 1 + 6 + 4
+        assert searches[0]["facet_by"] == "agency,theme_1_level_1,category"
+        assert searches[0]["per_page"] == 3
+        assert "include_fields" in searches[0]
+
+        assert "# Relatório do Tema: educação" in result
+        assert "1,200" in result
+        assert "## Evolução Mensal" in result
+        assert "## Últimas Semanas" in result
+        assert "| mec | 600 | 50.0% |" in result
+        assert "## Temas Relacionados" in result
+        assert "Novo programa de alfabetização" in result
+        assert "**educação**" in result
+        assert "11 consultas em um único lote" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.report.get_async_typesense_client")
+    async def test_theme_report_skips_unfacetable_fields(self, mock_get_client, collection_schema):
+        """Test fields without facet support are left out of the overview."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.multi_search.side_effect = _multi_search_response
+
+        collection_schema.update({"fields": [
+            {"name": "agency", "type": "string", "facet": True},
+            {"name": "category", "type": "string"},
+        ]})
+
+        await theme_report("educação", months=1, weeks=1)
+
+        searches = mock_client.multi_search.call_args[0][0]
+        assert searches[0]["facet_by"] == "agency"
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.report.get_async_typesense_client")
+    async def test_theme_report_partial_failure(self, mock_get_client):
+        """Test a failed period is reported without failing the whole report."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        def side_effect(searches):
+            results = _multi_search_response(searches)
+            results[1] = {"error": "timeout", "code": 408}
+            return results
+
+        mock_client.multi_search.side_effect = side_effect
+
+        result = await theme_report("educação", months=3, weeks=2)
+
+        assert "# Relatório do Tema" in result
+        assert "erro (timeout)" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.report.get_async_typesense_client")
+    async def test_theme_report_facet_failure_uses_ranges(self, mock_get_client, collection_schema):
+        """Test failed period facets are retried with one count per period."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        collection_schema.update({"fields": [
+            {"name": "agency", "type": "string", "facet": True},
+            {"name": "published_year_month", "type": "int32", "facet": True},
+            {"name": "published_week", "type": "int32", "facet": True},
+        ]})
+
+        def side_effect(searches):
+            if searches[0].get("facet_by") == "agency":
+                overview = _multi_search_response(searches)[0]
+                return [overview] + [
+                    {"error": f"Could not find a facet field named `{s['facet_by']}`", "code": 404}
+                    for s in searches[1:]
+                ]
+            return [{"found": 7} for _ in searches]
+
+        mock_client.multi_search.side_effect = side_effect
+
+        result = await theme_report("educação", months=3, weeks=2)
+
+        first, retry = [call[0][0] for call in mock_client.multi_search.call_args_list]
+        assert [s.get("facet_by") for s in first] == [
+            "agency", "published_year_month", "published_week"
+        ]
+        # Visão geral não é repetida; 3 meses + 2 semanas por contagem
+        assert len(retry) == 3 + 2
+        assert all("facet_by" not in s for s in retry)
+        assert "1,200" in result
+        assert "Could not find a facet field" not in result
+        assert "| 7 |" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.report.get_async_typesense_client")
+    async def test_theme_report_error_handling(self, mock_get_client):
+        """Test a failed overview search returns an error report."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.multi_search.side_effect = Exception("Connection error")
+
+        result = await theme_report("educação")
+
+        assert "# Erro ao Gerar Relatório" in result
+        assert "Connection error" in result
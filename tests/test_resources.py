@@ -1,7 +1,7 @@
 """Tests for MCP resources."""
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from govbrnews_mcp.resources import (
     get_stats,
@@ -12,16 +12,18 @@ from govbrnews_mcp.resources import (
     format_themes,
     get_news_by_id,
     format_news,
+    ResourceSnapshot,
 )
 
 
 class TestStatsResource:
     """Tests for stats resource."""
 
-    @patch("govbrnews_mcp.resources.stats.get_typesense_client")
-    def test_get_stats_success(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.stats.get_async_typesense_client")
+    async def test_get_stats_success(self, mock_get_client):
         """Test getting stats successfully."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         # Mock collection info
@@ -29,21 +31,20 @@ class TestStatsResource:
             "num_documents": 295511
         }
 
-        # Mock year distribution
-        mock_client._client.collections.__getitem__.return_value.documents.search.return_value = {
-            "facet_counts": [
-                {
-                    "field_name": "year",
-                    "counts": [
-                        {"value": "2025", "count": 50000},
-                        {"value": "2024", "count": 100000},
-                    ]
-                }
-            ]
-        }
-
-        # Mock search for coverage period
-        mock_client.search.side_effect = [
+        mock_client.multi_search.return_value = [
+            {  # Year distribution and top agencies
+                "search_time_ms": 3,
+                "facet_counts": [
+                    {
+                        "field_name": "published_year",
+                        "counts": [
+                            {"value": "2025", "count": 50000},
+                            {"value": "2024", "count": 100000},
+                        ]
+                    },
+                    {"field_name": "agency", "counts": [{"value": "MEC", "count": 10000}]}
+                ]
+            },
             {  # Oldest
                 "found": 1,
                 "hits": [{"document": {"published_at": 1609459200}}]
@@ -54,21 +55,68 @@ class TestStatsResource:
             }
         ]
 
-        stats = get_stats()
+        stats = await get_stats()
 
         assert stats["total_documents"] == 295511
         assert "year_distribution" in stats
         assert "top_agencies" in stats
         assert "coverage_period" in stats
+        assert stats["year_distribution"]["2024"] == 100000
+        assert stats["top_agencies"][0]["agency"] == "MEC"
+        assert stats["coverage_period"]["end_date"] == 1735689600
+        assert stats["timings_ms"]["facets"] == 3
+        assert stats["timings_ms"]["multi_search"] is not None
+
+        # Dois round-trips: metadados da coleção e um multi_search
+        mock_client.get_collection_info.assert_called_once()
+        mock_client.multi_search.assert_called_once()
+        mock_client.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.stats.get_async_typesense_client")
+    async def test_get_stats_partial_failure(self, mock_get_client):
+        """Test a failed section does not hide the others."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        mock_client.get_collection_info.return_value = {"num_documents": 10}
+        mock_client.multi_search.return_value = [
+            {"error": "Could not find a facet field", "code": 404},
+            {"found": 1, "hits": [{"document": {"published_at": 1609459200}}]},
+            {"found": 1, "hits": [{"document": {"published_at": 1735689600}}]},
+        ]
+
+        stats = await get_stats()
+
+        assert stats["total_documents"] == 10
+        assert stats["year_distribution"] == {}
+        assert stats["top_agencies"] == []
+        assert stats["coverage_period"]["start_date"] == 1609459200
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.stats.get_async_typesense_client")
+    async def test_get_stats_multi_search_failure(self, mock_get_client):
+        """Test stats still report the total when the multi_search fails."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        mock_client.get_collection_info.return_value = {"num_documents": 10}
+        mock_client.multi_search.side_effect = Exception("timeout")
+
+        stats = await get_stats()
 
-    @patch("govbrnews_mcp.resources.stats.get_typesense_client")
-    def test_get_stats_no_collection_info(self, mock_get_client):
+        assert stats["total_documents"] == 10
+        assert stats["coverage_period"] == {}
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.stats.get_async_typesense_client")
+    async def test_get_stats_no_collection_info(self, mock_get_client):
         """Test getting stats when collection info fails."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
         mock_client.get_collection_info.return_value = None
 
-        stats = get_stats()
+        stats = await get_stats()
 
         assert "error" in stats
         assert stats["total_documents"] == 0
@@ -111,13 +159,14 @@ class TestStatsResource:
 class TestAgenciesResource:
     """Tests for agencies resource."""
 
-    @patch("govbrnews_mcp.resources.agencies.get_typesense_client")
-    def test_get_agencies_success(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.agencies.get_async_typesense_client")
+    async def test_get_agencies_success(self, mock_get_client):
         """Test getting agencies successfully."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.search.return_value = {
             "facet_counts": [
                 {
                     "field_name": "agency",
@@ -130,21 +179,22 @@ class TestAgenciesResource:
             ]
         }
 
-        agencies = get_agencies()
+        agencies = await get_agencies()
 
         assert agencies["total_agencies"] == 3
         assert len(agencies["agencies"]) == 3
         assert agencies["agencies"][0]["agency"] == "MEC"
         assert agencies["agencies"][0]["count"] == 10000
 
-    @patch("govbrnews_mcp.resources.agencies.get_typesense_client")
-    def test_get_agencies_error(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.agencies.get_async_typesense_client")
+    async def test_get_agencies_error(self, mock_get_client):
         """Test getting agencies with error."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
-        mock_client.client.collections.__getitem__.side_effect = Exception("API error")
+        mock_client.search.side_effect = Exception("API error")
 
-        agencies = get_agencies()
+        agencies = await get_agencies()
 
         assert "error" in agencies
         assert agencies["agencies"] == []
@@ -179,13 +229,14 @@ class TestAgenciesResource:
 class TestThemesResource:
     """Tests for themes resource."""
 
-    @patch("govbrnews_mcp.resources.themes.get_typesense_client")
-    def test_get_themes_success(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.themes.get_async_typesense_client")
+    async def test_get_themes_success(self, mock_get_client):
         """Test getting themes successfully."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.search.return_value = {
             "facet_counts": [
                 {
                     "field_name": "theme_1_level_1",
@@ -198,21 +249,22 @@ class TestThemesResource:
             ]
         }
 
-        themes = get_themes()
+        themes = await get_themes()
 
         assert themes["total_themes"] == 3
         assert len(themes["themes"]) == 3
         assert themes["themes"][0]["theme"] == "02 - Educação"
         assert themes["themes"][0]["count"] == 50000
 
-    @patch("govbrnews_mcp.resources.themes.get_typesense_client")
-    def test_get_themes_error(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.themes.get_async_typesense_client")
+    async def test_get_themes_error(self, mock_get_client):
         """Test getting themes with error."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
-        mock_client.client.collections.__getitem__.side_effect = Exception("API error")
+        mock_client.search.side_effect = Exception("API error")
 
-        themes = get_themes()
+        themes = await get_themes()
 
         assert "error" in themes
         assert themes["themes"] == []
@@ -247,10 +299,11 @@ class TestThemesResource:
 class TestNewsResource:
     """Tests for individual news resource."""
 
-    @patch("govbrnews_mcp.resources.news.get_typesense_client")
-    def test_get_news_by_id_success(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.news.get_async_typesense_client")
+    async def test_get_news_by_id_success(self, mock_get_client):
         """Test getting news by ID successfully."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
         mock_document = {
@@ -263,32 +316,34 @@ class TestNewsResource:
         }
         mock_client.get_document.return_value = mock_document
 
-        news = get_news_by_id("123")
+        news = await get_news_by_id("123")
 
         assert news["id"] == "123"
         assert news["title"] == "Test News"
         assert news["agency"] == "MEC"
 
-    @patch("govbrnews_mcp.resources.news.get_typesense_client")
-    def test_get_news_by_id_not_found(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.news.get_async_typesense_client")
+    async def test_get_news_by_id_not_found(self, mock_get_client):
         """Test getting news by ID when not found."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
         mock_client.get_document.return_value = None
 
-        news = get_news_by_id("999")
+        news = await get_news_by_id("999")
 
         assert "error" in news
         assert "999" in news["error"]
 
-    @patch("govbrnews_mcp.resources.news.get_typesense_client")
-    def test_get_news_by_id_error(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.news.get_async_typesense_client")
+    async def test_get_news_by_id_error(self, mock_get_client):
         """Test getting news by ID with error."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
         mock_client.get_document.side_effect = Exception("API error")
 
-        news = get_news_by_id("123")
+        news = await get_news_by_id("123")
 
         assert "error" in news
         assert "API error" in news["error"]
@@ -335,3 +390,120 @@ class TestNewsResource:
 
         assert "# Erro" in result
         assert "Not found" in result
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResourceSnapshot:
+    """Tests for the background-refreshed resource snapshot."""
+
+    @staticmethod
+    def _resources(calls):
+        """Build fake resource functions that count their calls."""
+        def make(name):
+            async def compute():
+                calls.append(name)
+                return {"name": name, "version": calls.count(name)}
+            return compute
+        return {name: make(name) for name in ("agencies", "themes", "stats")}
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.snapshot.get_async_typesense_client")
+    async def test_snapshot_serves_reads_from_memory(self, mock_get_client):
+        """Test the first read computes the snapshot and later reads reuse it."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_collection_info.return_value = {"num_documents": 100}
+
+        calls = []
+        with patch.dict("govbrnews_mcp.resources.snapshot.SNAPSHOT_RESOURCES", self._resources(calls)):
+            snapshot = ResourceSnapshot(refresh_interval=60, timer=FakeTimer())
+
+            agencies = await snapshot.get("agencies")
+            await snapshot.get("agencies")
+            await snapshot.get("themes")
+
+        assert sorted(calls) == ["agencies", "stats", "themes"]
+        assert agencies["name"] == "agencies"
+        assert agencies["snapshot"]["num_documents"] == 100
+        assert agencies["snapshot"]["age_seconds"] == 0
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.snapshot.get_async_typesense_client")
+    async def test_snapshot_stale_while_revalidate(self, mock_get_client):
+        """Test stale reads return current data and refresh in the background."""
+        import asyncio
+
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_collection_info.return_value = {"num_documents": 100}
+
+        calls = []
+        timer = FakeTimer()
+        with patch.dict("govbrnews_mcp.resources.snapshot.SNAPSHOT_RESOURCES", self._resources(calls)):
+            snapshot = ResourceSnapshot(refresh_interval=60, timer=timer)
+            await snapshot.get("stats")
+
+            # Vencido, mas a coleção não mudou: só o watermark é conferido
+            timer.now += 120
+            stale = await snapshot.get("stats")
+            await asyncio.sleep(0)
+            await snapshot.refresh()
+            assert stale["snapshot"]["age_seconds"] == 120
+            assert calls.count("stats") == 1
+
+            # Vencido e com novos documentos: recalcula em segundo plano
+            timer.now += 120
+            mock_client.get_collection_info.return_value = {"num_documents": 150}
+            stale = await snapshot.get("stats")
+            assert stale["version"] == 1
+            await snapshot._refresh_task
+
+            fresh = await snapshot.get("stats")
+
+        assert fresh["version"] == 2
+        assert fresh["snapshot"]["num_documents"] == 150
+        assert fresh["snapshot"]["age_seconds"] == 0
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.resources.snapshot.get_async_typesense_client")
+    async def test_snapshot_keeps_previous_data_on_error(self, mock_get_client):
+        """Test a failed recomputation keeps the previous resource version."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_collection_info.return_value = {"num_documents": 100}
+
+        calls = []
+        resources = self._resources(calls)
+        with patch.dict("govbrnews_mcp.resources.snapshot.SNAPSHOT_RESOURCES", resources):
+            snapshot = ResourceSnapshot(refresh_interval=60, timer=FakeTimer())
+            await snapshot.get("themes")
+
+            async def failing():
+                return {"error": "Não foi possível obter taxonomia de temas", "themes": []}
+
+            resources["themes"] = failing
+            await snapshot.refresh(force=True)
+            themes = await snapshot.get("themes")
+
+        assert "error" not in themes
+        assert themes["name"] == "themes"
+
+    def test_format_with_snapshot_info(self):
+        """Test formatted resources report snapshot age and watermark."""
+        result = format_agencies({
+            "total_agencies": 1,
+            "agencies": [{"agency": "MEC", "count": 10}],
+            "snapshot": {"age_seconds": 125, "num_documents": 295511},
+        })
+
+        assert "Snapshot atualizado há 2min" in result
+        assert "295,511 documentos" in result
@@ -0,0 +1,115 @@
+"""Tests for collection schema introspection."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from govbrnews_mcp.schema import CollectionSchema
+
+
+COLLECTION_INFO = {
+    "name": "news",
+    "num_documents": 1000,
+    "fields": [
+        {"name": "title", "type": "string"},
+        {"name": "agency", "type": "string", "facet": True},
+        {"name": "published_week", "type": "int32", "facet": True},
+    ],
+}
+
+
+class FakeTimer:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.schema.get_async_typesense_client")
+async def test_schema_loads_once(mock_get_client):
+    """Test capability checks reuse the loaded schema."""
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get_collection_info.return_value = COLLECTION_INFO
+
+    schema = CollectionSchema("news", ttl=60)
+
+    assert await schema.is_facetable("published_week") is True
+    assert await schema.is_facetable("title") is False
+    assert await schema.has_field("title") is True
+    assert await schema.has_field("missing") is False
+    assert schema.num_documents == 1000
+    mock_client.get_collection_info.assert_called_once_with("news")
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.schema.get_async_typesense_client")
+async def test_schema_refreshes_after_ttl(mock_get_client):
+    """Test the schema is reloaded once the TTL expires."""
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get_collection_info.return_value = COLLECTION_INFO
+
+    timer = FakeTimer()
+    schema = CollectionSchema("news", ttl=60, timer=timer)
+
+    await schema.has_field("title")
+    timer.now = 30
+    await schema.has_field("title")
+    assert mock_client.get_collection_info.call_count == 1
+
+    timer.now = 61
+    await schema.has_field("title")
+    assert mock_client.get_collection_info.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.schema.get_async_typesense_client")
+async def test_schema_invalidate_forces_reload(mock_get_client):
+    """Test invalidate() triggers a reload on the next check."""
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get_collection_info.return_value = COLLECTION_INFO
+
+    schema = CollectionSchema("news", ttl=3600)
+
+    await schema.has_field("title")
+    schema.invalidate()
+    await schema.has_field("title")
+
+    assert mock_client.get_collection_info.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.schema.get_async_typesense_client")
+async def test_schema_keeps_previous_fields_on_error(mock_get_client):
+    """Test a failed refresh keeps the last known schema and retries later."""
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get_collection_info.side_effect = [COLLECTION_INFO, Exception("down"), COLLECTION_INFO]
+
+    schema = CollectionSchema("news", ttl=3600)
+
+    await schema.has_field("title")
+    schema.invalidate()
+    assert await schema.is_facetable("published_week") is True  # stale but usable
+    assert await schema.is_facetable("published_week") is True  # retried
+    assert mock_client.get_collection_info.call_count == 3
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.schema.get_async_typesense_client")
+async def test_schema_unavailable_uses_default(mock_get_client):
+    """Test checks fall back to the given default if the schema never loaded."""
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+    mock_client.get_collection_info.side_effect = Exception("down")
+
+    schema = CollectionSchema("news", ttl=3600)
+
+    assert await schema.is_facetable("agency") is False
+    assert await schema.is_facetable("agency", default=True) is True
+    assert await schema.has_field("agency", default=True) is True
@@ -1,18 +1,22 @@
 """Tests for search_news tool."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from typesense.exceptions import TypesenseClientError
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_basic(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_basic(mock_get_client, mock_typesense_search_response):
     """Test basic search functionality."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    result = search_news("educação")
+    result = await search_news("educação")
 
     # Verify search was called correctly
     mock_client.search.assert_called_once()
@@ -24,20 +28,28 @@ def test_search_news_basic(mock_client, mock_typesense_search_response):
     assert search_params["query_by"] == "title,content"
     assert search_params["per_page"] == 10
 
+    # Only metadata and a server-side snippet are requested
+    assert "content" not in search_params["include_fields"].split(",")
+    assert search_params["highlight_fields"] == "content"
+
     # Verify result formatting
     assert "# Resultados da Busca" in result
     assert "3 notícias" in result
     assert "Notícia sobre educação" in result
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_with_agency_filter(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_with_agency_filter(mock_get_client, mock_typesense_search_response):
     """Test search with agency filter."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    result = search_news("educação", agencies=["Ministério da Educação"])
+    result = await search_news("educação", agencies=["Ministério da Educação"])
 
     # Verify filter was applied
     call_args = mock_client.search.call_args[0][1]
@@ -46,14 +58,18 @@ def test_search_news_with_agency_filter(mock_client, mock_typesense_search_respo
     assert "Ministério da Educação" in call_args["filter_by"]
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_with_year_range(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_with_year_range(mock_get_client, mock_typesense_search_response):
     """Test search with year range filter."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    result = search_news("educação", year_from=2023, year_to=2024)
+    result = await search_news("educação", year_from=2023, year_to=2024)
 
     # Verify year filters
     call_args = mock_client.search.call_args[0][1]
@@ -62,14 +78,40 @@ def test_search_news_with_year_range(mock_client, mock_typesense_search_response
     assert "published_year:<=2024" in call_args["filter_by"]
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_with_themes(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_year_range_without_year_field(
+    mock_get_client, mock_typesense_search_response, collection_schema
+):
+    """Test year filters fall back to published_at when published_year is missing."""
+    from govbrnews_mcp.tools.search import search_news
+
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+    mock_client.search.return_value = mock_typesense_search_response
+
+    collection_schema.update({"fields": [{"name": "published_at", "type": "int64"}]})
+
+    await search_news("educação", year_from=2023, year_to=2024)
+
+    filter_by = mock_client.search.call_args[0][1]["filter_by"]
+    assert "published_year" not in filter_by
+    assert "published_at:>=" in filter_by
+    assert "published_at:<" in filter_by
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_with_themes(mock_get_client, mock_typesense_search_response):
     """Test search with theme filter."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    result = search_news("educação", themes=["Educação e Cultura"])
+    result = await search_news("educação", themes=["Educação e Cultura"])
 
     # Verify theme filter
     call_args = mock_client.search.call_args[0][1]
@@ -77,74 +119,94 @@ def test_search_news_with_themes(mock_client, mock_typesense_search_response):
     assert "theme_1_level_1:=" in call_args["filter_by"]
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_limit_validation(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_limit_validation(mock_get_client, mock_typesense_search_response):
     """Test that limit is clamped to 1-100 range."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
     # Test limit too low
-    search_news("test", limit=0)
+    await search_news("test", limit=0)
     assert mock_client.search.call_args[0][1]["per_page"] == 1
 
     # Test limit too high
-    search_news("test", limit=200)
+    await search_news("test", limit=200)
     assert mock_client.search.call_args[0][1]["per_page"] == 100
 
     # Test valid limit
-    search_news("test", limit=50)
+    await search_news("test", limit=50)
     assert mock_client.search.call_args[0][1]["per_page"] == 50
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_sort_newest(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_sort_newest(mock_get_client, mock_typesense_search_response):
     """Test sorting by newest first."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    search_news("test", sort="newest")
+    await search_news("test", sort="newest")
 
     call_args = mock_client.search.call_args[0][1]
     assert call_args["sort_by"] == "published_at:desc"
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_sort_oldest(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_sort_oldest(mock_get_client, mock_typesense_search_response):
     """Test sorting by oldest first."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    search_news("test", sort="oldest")
+    await search_news("test", sort="oldest")
 
     call_args = mock_client.search.call_args[0][1]
     assert call_args["sort_by"] == "published_at:asc"
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_sort_relevant(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_sort_relevant(mock_get_client, mock_typesense_search_response):
     """Test default sorting (relevant)."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    search_news("test", sort="relevant")
+    await search_news("test", sort="relevant")
 
     call_args = mock_client.search.call_args[0][1]
     # Relevant uses default ranking, so no sort_by param
     assert "sort_by" not in call_args
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_multiple_filters(mock_client, mock_typesense_search_response):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_multiple_filters(mock_get_client, mock_typesense_search_response):
     """Test search with multiple filters combined."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = mock_typesense_search_response
 
-    result = search_news(
+    result = await search_news(
         "educação",
         agencies=["Ministério da Educação", "MEC"],
         year_from=2023,
@@ -167,28 +229,92 @@ def test_search_news_multiple_filters(mock_client, mock_typesense_search_respons
     assert call_args["sort_by"] == "published_at:desc"
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_error_handling(mock_client):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_error_handling(mock_get_client):
     """Test error handling when search fails."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.side_effect = TypesenseClientError("Connection failed")
 
-    result = search_news("test")
+    result = await search_news("test")
 
     # Should return error message, not raise exception
     assert "Erro ao buscar notícias" in result
     assert "Typesense" in result
 
 
-@patch("govbrnews_mcp.tools.search.typesense_client")
-def test_search_news_empty_results(mock_client):
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_empty_results(mock_get_client):
     """Test search with no results."""
     from govbrnews_mcp.tools.search import search_news
 
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
     mock_client.search.return_value = {"found": 0, "hits": []}
 
-    result = search_news("xyzabc123nonexistent")
+    result = await search_news("xyzabc123nonexistent")
 
     assert "0 notícias" in result
     assert "Nenhuma notícia encontrada" in result
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_title_only_match_has_summary(mock_get_client):
+    """Test hits matched only in the title still get a summary."""
+    from govbrnews_mcp.tools.search import search_news
+
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
+    mock_client.search.return_value = {"found": 2, "hits": [
+        {
+            "document": {"id": "1", "title": "Programa Pé-de-Meia"},
+            "highlights": [{"field": "title", "snippet": "Programa <mark>Pé-de-Meia</mark>"}],
+        },
+        {
+            "document": {"id": "2", "title": "Outra notícia"},
+            "highlights": [{"field": "content", "snippet": "O **Pé-de-Meia** paga"}],
+        },
+    ]}
+    mock_client.get_documents.return_value = {
+        "1": {"id": "1", "title": "Programa Pé-de-Meia", "content": "Estudantes recebem incentivo"},
+    }
+
+    result = await search_news("pé-de-meia")
+
+    # Only the hit without a content snippet is fetched
+    mock_client.get_documents.assert_called_once_with("news", ["1"])
+    assert "Estudantes recebem incentivo" in result
+    assert "O **Pé-de-Meia** paga" in result
+
+
+@pytest.mark.asyncio
+@patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+async def test_search_news_does_not_mutate_cached_response(mock_get_client):
+    """Test fetched bodies are not written into the (shared, cached) search response."""
+    from govbrnews_mcp.tools.search import search_news
+
+    mock_client = AsyncMock()
+    mock_get_client.return_value = mock_client
+
+    # The same object is returned on every call, like a ResponseCache hit
+    cached = {"found": 1, "hits": [{"document": {"id": "1", "title": "Programa Pé-de-Meia"}}]}
+    mock_client.search.return_value = cached
+    mock_client.get_documents.return_value = {
+        "1": {"id": "1", "title": "Programa Pé-de-Meia", "content": "Estudantes recebem incentivo"},
+    }
+
+    first = await search_news("pé-de-meia")
+    second = await search_news("pé-de-meia")
+
+    assert "Estudantes recebem incentivo" in first
+    assert second == first
+    assert "content" not in cached["hits"][0]["document"]
+    assert mock_client.get_documents.call_count == 2
@@ -0,0 +1,299 @@
+"""Tests for the local TF-IDF content similarity engine."""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from govbrnews_mcp.similarity import TfidfIndex, get_similarity_index, tokenize
+from govbrnews_mcp.similarity.build import build_corpus_index
+from govbrnews_mcp.similarity.rerank import rerank_candidates
+from govbrnews_mcp.tools.similar import similar_news, similar_news_batch
+
+DOCUMENTS = [
+    ("1", "Vacinação contra a gripe começa nas unidades de saúde"),
+    ("2", "Campanha de vacinação contra gripe é ampliada para crianças"),
+    ("3", "Leilão de energia eólica bate recorde de investimentos"),
+    ("4", "Ministério anuncia investimentos em energia solar e eólica"),
+    ("5", ""),
+]
+
+
+class TestTokenize:
+    """Tests for Portuguese tokenization."""
+
+    def test_strips_accents_stopwords_and_short_tokens(self):
+        """Test accents are removed and function words dropped."""
+        assert tokenize("A Educação é prioridade do Governo Federal") == ["educacao", "prioridade"]
+
+    def test_keeps_years_but_not_other_numbers(self):
+        """Test four-digit years survive while other numbers are dropped."""
+        assert tokenize("Orçamento de 2025 prevê 150 milhões") == [
+            "orcamento", "2025", "preve", "milhoes"
+        ]
+
+
+class TestTfidfIndex:
+    """Tests for TfidfIndex."""
+
+    def test_most_similar_ranks_by_content(self):
+        """Test neighbors share vocabulary and the reference is excluded."""
+        index = TfidfIndex.build(DOCUMENTS)
+
+        ranked = index.most_similar("vacinação contra gripe", 3, exclude={"1"})
+
+        assert [doc_id for doc_id, _ in ranked] == ["2"]
+        assert 0 < ranked[0][1] <= 1
+
+    def test_scores_match_dense_cosine(self):
+        """Test the inverted-index product equals the dense cosine."""
+        index = TfidfIndex.build(DOCUMENTS)
+        terms, weights = index.vectorize("energia eólica e investimentos")
+
+        dense = np.zeros((len(index), len(index.vocabulary)))
+        for term, position in index.vocabulary.items():
+            start, end = index.postings_ptr[position], index.postings_ptr[position + 1]
+            dense[index.postings_docs[start:end], position] = index.postings_weights[start:end]
+        query = np.zeros(len(index.vocabulary))
+        query[terms] = weights
+
+        np.testing.assert_allclose(index.scores(terms, weights), dense @ query, rtol=1e-5)
+        # Documentos normalizados: cosseno de um documento consigo mesmo é 1
+        np.testing.assert_allclose(np.linalg.norm(dense[:4], axis=1), 1, rtol=1e-5)
+
+    def test_unknown_terms_have_no_neighbors(self):
+        """Test a text without indexed terms returns nothing."""
+        index = TfidfIndex.build(DOCUMENTS)
+
+        assert index.most_similar("futebol", 5) == []
+
+    def test_save_and_load_memory_mapped(self, tmp_path):
+        """Test a saved index reopens memory-mapped with the same results."""
+        index = TfidfIndex.build(DOCUMENTS)
+        index.save(tmp_path / "index")
+
+        loaded = TfidfIndex.load(tmp_path / "index")
+
+        assert isinstance(loaded.postings_weights, np.memmap)
+        assert loaded.ids == index.ids
+        assert loaded.most_similar("energia eólica", 2) == index.most_similar("energia eólica", 2)
+
+    def test_get_similarity_index_from_settings(self, tmp_path, test_settings):
+        """Test the configured index is loaded once and a missing one is ignored."""
+        TfidfIndex.build(DOCUMENTS).save(tmp_path)
+        test_settings.similarity_index_path = str(tmp_path)
+
+        index = get_similarity_index()
+
+        assert len(index) == len(DOCUMENTS)
+        assert get_similarity_index() is index
+
+    def test_get_similarity_index_reloads_after_save(self, tmp_path, test_settings):
+        """Test a rebuilt index replaces the loaded one without breaking its memory-map."""
+        TfidfIndex.build(DOCUMENTS[:2]).save(tmp_path / "index")
+        test_settings.similarity_index_path = str(tmp_path / "index")
+        old = get_similarity_index()
+        weights = np.array(old.postings_weights)
+
+        TfidfIndex.build(DOCUMENTS).save(tmp_path / "index")
+
+        assert len(get_similarity_index()) == len(DOCUMENTS)
+        np.testing.assert_array_equal(old.postings_weights, weights)
+
+    def test_get_similarity_index_missing(self, tmp_path, test_settings):
+        """Test a path without an index falls back to None."""
+        test_settings.similarity_index_path = str(tmp_path / "missing")
+
+        assert get_similarity_index() is None
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.similarity.build.get_async_typesense_client")
+    async def test_build_corpus_index_from_export(self, mock_get_client, tmp_path):
+        """Test the corpus index is built from the streamed export and saved."""
+        async def export_documents(collection, include_fields=None):
+            for doc_id, title in DOCUMENTS:
+                yield {"id": doc_id, "title": title}
+
+        mock_client = AsyncMock()
+        mock_client.export_documents = export_documents
+        mock_get_client.return_value = mock_client
+
+        index = await build_corpus_index(tmp_path)
+
+        assert index.ids == [doc_id for doc_id, _ in DOCUMENTS]
+        assert TfidfIndex.load(tmp_path).most_similar("eólica", 5) == index.most_similar("eólica", 5)
+
+
+class TestRerankCandidates:
+    """Tests for the combined rerank score."""
+
+    REFERENCE = {"id": "0", "agency": "MEC", "theme_1_level_1": "Educação", "published_at": 1704067200}
+
+    def test_metadata_breaks_text_ties(self):
+        """Test agency, theme and date reorder candidates with similar text."""
+        documents = {
+            "far": {"id": "far", "agency": "MS", "published_at": 1704067200 - 400 * 86400},
+            "near": {"id": "near", "agency": "MEC", "theme_1_level_1": "Educação",
+                     "published_at": 1704067200 + 86400},
+        }
+
+        ranked = rerank_candidates(self.REFERENCE, documents, {"far": 0.5, "near": 0.45}, 5)
+
+        assert [doc_id for doc_id, _ in ranked] == ["near", "far"]
+        assert ranked[0][1] <= 1
+
+    def test_candidates_without_shared_terms_are_dropped(self):
+        """Test metadata alone never makes a candidate similar."""
+        documents = {"1": {"id": "1", "agency": "MEC", "published_at": 1704067200}}
+
+        assert rerank_candidates(self.REFERENCE, documents, {"1": 0.0}, 5) == []
+
+    def test_reference_without_metadata_ranks_by_text(self):
+        """Test a reference without agency, theme or date keeps the text order."""
+        documents = {"a": {"id": "a", "agency": "MEC"}, "b": {"id": "b"}}
+
+        ranked = rerank_candidates({"id": "0"}, documents, {"a": 0.2, "b": 0.3}, 5)
+
+        assert [doc_id for doc_id, _ in ranked] == ["b", "a"]
+
+
+class TestSimilarNewsContent:
+    """Tests for content-based similar_news."""
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_candidates_are_ranked_by_content(self, mock_get_client):
+        """Test Typesense candidates are reranked by TF-IDF cosine."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_document.return_value = {
+            "id": "1", "title": "Vacinação contra a gripe", "content": "Campanha nas unidades de saúde"
+        }
+        mock_client.search.return_value = {"found": 3, "hits": [
+            {"document": {"id": "1", "title": "Vacinação contra a gripe"}},
+            {"document": {"id": "3", "title": "Gripe aviária: vigilância reforçada"}},
+            {
+                "document": {"id": "2", "title": "Campanha de vacinação contra gripe"},
+                "highlights": [{
+                    "field": "content", "snippet": "<mark>Unidades</mark> de saúde abrem no sábado"
+                }],
+            },
+        ]}
+        mock_client.get_documents.return_value = {
+            "2": {"id": "2", "title": "Campanha de vacinação contra gripe",
+                  "content": "Unidades de saúde abrem no sábado", "url": "https://gov.br/2"},
+            "3": {"id": "3", "title": "Gripe aviária: vigilância reforçada"},
+        }
+
+        result = await similar_news("1", limit=5)
+
+        params = mock_client.search.call_args[0][1]
+        assert params["q"] == "vacinacao gripe"
+        assert params["drop_tokens_threshold"] == params["per_page"] == 200
+        # Candidatos sem o texto completo: só um trecho do conteúdo
+        assert "content" not in params["include_fields"].split(",")
+        assert params["highlight_fields"] == "content"
+        # Texto completo apenas dos reranqueados exibidos
+        mock_client.get_documents.assert_called_once_with("news", ["2", "3"])
+        assert "https://gov.br/2" in result
+
+        assert "Conteúdo (TF-IDF, cosseno), agência, tema e proximidade temporal" in result
+        assert "Candidatos:" in result and "Reranqueamento:" in result
+        assert result.index("Campanha de vacinação") < result.index("Gripe aviária")
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_candidates_are_restricted_to_date_window(self, mock_get_client, test_settings):
+        """Test the candidate query filters a window around the reference date."""
+        test_settings.similarity_window_days = 10
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_document.return_value = {
+            "id": "1", "title": "Vacinação contra a gripe", "published_at": 1704067200
+        }
+        mock_client.search.return_value = {"found": 0, "hits": []}
+
+        await similar_news("1")
+
+        assert mock_client.search.call_args_list[0][0][1]["filter_by"] == (
+            "published_at:>=1703203200 && published_at:<=1704931200"
+        )
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_similarity_index")
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_corpus_index_is_used_when_available(self, mock_get_client, mock_get_index):
+        """Test the on-disk index ranks the corpus without a candidate search."""
+        mock_get_index.return_value = TfidfIndex.build(DOCUMENTS)
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_document.return_value = {"id": "3", "title": "Energia eólica"}
+        mock_client.get_documents.return_value = {
+            "4": {"id": "4", "title": "Investimentos em energia solar e eólica"},
+        }
+
+        result = await similar_news("3", limit=2)
+
+        mock_client.search.assert_not_called()
+        mock_client.get_documents.assert_called_once_with("news", ["4"])
+        assert "índice do corpus (5 notícias)" in result
+        assert "Investimentos em energia solar e eólica" in result
+
+
+class TestSimilarNewsBatch:
+    """Tests for similar_news_batch."""
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_references_and_candidates_are_batched(self, mock_get_client):
+        """Test one reference fetch and one multi_search serve every reference."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_documents.return_value = {
+            "1": {"id": "1", "title": "Vacinação contra a gripe"},
+            "3": {"id": "3", "title": "Leilão de energia eólica"},
+        }
+        mock_client.multi_search.return_value = [
+            {"hits": [{"document": {"id": "2", "title": "Campanha de vacinação contra gripe"}}]},
+            {"hits": [{"document": {"id": "4", "title": "Investimentos em energia eólica"}}]},
+        ]
+
+        result = await similar_news_batch(["1", "3", "9"], limit=3)
+
+        mock_client.get_documents.assert_called_once_with("news", ["1", "3", "9"])
+        mock_client.multi_search.assert_called_once()
+        mock_client.get_document.assert_not_called()
+        mock_client.search.assert_not_called()
+        searches = mock_client.multi_search.call_args[0][0]
+        assert [search["q"] for search in searches] == ["vacinacao gripe", "leilao energia eolica"]
+
+        assert "**Referências:** 2" in result
+        assert "**Não encontradas:** `9`" in result
+        assert result.index("Campanha de vacinação") < result.index("## 2. Leilão de energia")
+        assert result.index("Investimentos em energia") > result.index("## 2. Leilão de energia")
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.similar.get_async_typesense_client")
+    async def test_references_without_content_neighbors_fall_back(self, mock_get_client):
+        """Test only references without content neighbors get the metadata query."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_documents.return_value = {
+            "1": {"id": "1", "title": "", "agency": "MEC"},
+        }
+        mock_client.multi_search.return_value = [
+            {"hits": [{"document": {"id": "1"}}, {"document": {"id": "5", "title": "Outra do MEC"}}]},
+        ]
+
+        result = await similar_news_batch(["1"])
+
+        searches = mock_client.multi_search.call_args[0][0]
+        assert searches[0]["filter_by"] == "agency:=`MEC`"
+        assert "Mesma agência e/ou tema" in result
+        assert "Outra do MEC" in result
+
+    @pytest.mark.asyncio
+    async def test_requires_reference_ids(self):
+        """Test an empty list returns an error message."""
+        result = await similar_news_batch([])
+
+        assert "# Erro" in result
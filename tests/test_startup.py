@@ -0,0 +1,85 @@
+"""Cold-start tests for the stdio server."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Time budget from process spawn until the `initialize` request is answered
+COLD_START_BUDGET_SECONDS = 5.0
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def _server_env(**overrides: str) -> dict[str, str]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")])),
+        "TYPESENSE_API_KEY": "test_api_key",
+        # Unreachable endpoint: startup must not wait on Typesense
+        "TYPESENSE_HOST": "127.0.0.1",
+        "TYPESENSE_PORT": "1",
+        "LOG_LEVEL": "WARNING",
+    }
+    env.update(overrides)
+    return env
+
+
+def test_import_does_not_require_settings(tmp_path):
+    """Importing the server must not load settings or create clients."""
+    env = _server_env()
+    env.pop("TYPESENSE_API_KEY")
+    code = (
+        "import govbrnews_mcp.server, govbrnews_mcp.config as c, "
+        "govbrnews_mcp.typesense_client as t; "
+        "assert c._settings is None; "
+        "assert t._async_typesense_client is None"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, timeout=30
+    )
+
+    assert result.returncode == 0, result.stderr.decode()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stdio pipes")
+def test_cold_start_answers_initialize_within_budget(tmp_path):
+    """`python -m govbrnews_mcp` answers the first stdio request within budget."""
+    request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "cold-start-test", "version": "0"},
+        },
+    }
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "govbrnews_mcp"],
+        cwd=tmp_path,
+        env=_server_env(),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        process.stdin.write((json.dumps(request) + "\n").encode())
+        process.stdin.flush()
+        line = process.stdout.readline()
+        elapsed = time.perf_counter() - started
+    finally:
+        process.kill()
+        process.wait(timeout=10)
+
+    response = json.loads(line)
+    assert response["id"] == 1
+    assert response["result"]["serverInfo"]["name"] == "GovBRNews"
+    assert elapsed < COLD_START_BUDGET_SECONDS, f"cold start took {elapsed:.2f}s"
@@ -0,0 +1,138 @@
+"""Tests for the vectorized temporal series statistics."""
+
+from govbrnews_mcp.utils.stats import compute_series_stats
+from govbrnews_mcp.utils.temporal import format_temporal_distribution
+
+
+def _monthly(counts, start_year=2023):
+    """Dense monthly distribution starting in January of start_year."""
+    return [
+        {
+            "period": f"{start_year + i // 12}-{i % 12 + 1:02d}",
+            "label": f"{i % 12 + 1:02d}/{start_year + i // 12}",
+            "count": count,
+        }
+        for i, count in enumerate(counts)
+    ]
+
+
+class TestSeriesStats:
+    """Tests for compute_series_stats."""
+
+    def test_basic_stats_and_growth(self):
+        """Test mean, extremes and period-over-period growth."""
+        stats = compute_series_stats(_monthly([100, 200, 100, 0, 50]), "monthly")
+
+        assert stats["periods"] == 5
+        assert stats["mean"] == 90
+        assert stats["max"] == {"label": "02/2023", "count": 200}
+        assert stats["min"] == {"label": "04/2023", "count": 0}
+        # Crescimento sobre zero é indefinido e fica de fora
+        assert stats["last_change"] is None
+        assert stats["mean_growth"] == (100 - 50 - 100) / 3
+
+    def test_rolling_mean(self):
+        """Test the rolling mean only starts with a full window."""
+        stats = compute_series_stats(_monthly([3, 6, 9, 12]), "monthly")
+
+        assert stats["rolling_window"] == 3
+        assert stats["rolling_mean"] == [None, None, 6.0, 9.0]
+
+    def test_mad_flags_spike_and_drop(self):
+        """Test the robust score flags a spike and a drop but not normal noise."""
+        counts = [100, 104, 98, 101, 500, 99, 103, 2, 100, 97]
+        stats = compute_series_stats(_monthly(counts), "monthly")
+
+        assert stats["anomaly_method"] == "mad"
+        assert [(a["label"], a["direction"]) for a in stats["anomalies"]] == [
+            ("05/2023", "pico"), ("08/2023", "queda")
+        ]
+
+    def test_zscore_fallback_when_mad_is_zero(self):
+        """Test a mostly-flat series falls back to the plain z-score."""
+        counts = [0] * 20 + [50]
+        stats = compute_series_stats(_monthly(counts), "monthly")
+
+        assert stats["anomaly_method"] == "zscore"
+        assert [a["count"] for a in stats["anomalies"]] == [50]
+
+    def test_short_series_has_no_anomalies(self):
+        """Test series shorter than the minimum are not scored."""
+        stats = compute_series_stats(_monthly([1, 1000, 1]), "monthly")
+
+        assert stats["anomalies"] == []
+
+    def test_monthly_seasonality_and_year_over_year(self):
+        """Test seasonality by calendar month and deltas 12 months apart."""
+        counts = [10] * 11 + [40] + [20] * 11 + [80]
+        stats = compute_series_stats(_monthly(counts), "monthly")
+
+        seasonality = {item["label"]: item["index"] for item in stats["seasonality"]}
+        mean = sum(counts) / len(counts)
+        assert seasonality["Dez"] == 60 / mean
+        assert seasonality["Jan"] == 15 / mean
+
+        assert len(stats["yoy"]) == 12
+        assert stats["yoy"][-1] == {
+            "label": "12/2024", "count": 80, "previous": 40, "delta": 40, "change": 100.0
+        }
+
+    def test_gaps_disable_seasonality_and_year_over_year(self):
+        """Test calendar comparisons need a contiguous series."""
+        distribution = _monthly([10] * 26)
+        del distribution[5]
+
+        stats = compute_series_stats(distribution, "monthly")
+
+        assert stats["seasonality"] is None
+        assert stats["yoy"] == []
+
+    def test_weekly_periods_are_iso_weeks(self):
+        """Test weekly periods are read as ISO weeks across the year boundary."""
+        from govbrnews_mcp.utils.stats import _period_ordinals
+        from govbrnews_mcp.utils.temporal import _week_entry
+
+        ordinals = _period_ordinals(["2024-W52", "2025-W01", "2025-W02"], "weekly")
+
+        assert list(ordinals[1:] - ordinals[:-1]) == [1, 1]
+        assert _week_entry(202501, 3)["label"] == "Semana de 30/12/2024"
+
+    def test_weekly_has_no_year_over_year(self):
+        """Test weekly series (at most 52 weeks) skip the yearly comparison."""
+        distribution = [
+            {"period": f"2024-W{week:02d}", "label": str(week), "count": week}
+            for week in range(1, 53)
+        ]
+
+        stats = compute_series_stats(distribution, "weekly")
+
+        assert stats["yoy"] == []
+        assert stats["rolling_window"] == 4
+
+    def test_daily_seasonality_by_weekday(self):
+        """Test daily series get a weekday index (2024-01-01 was a Monday)."""
+        distribution = [
+            {"period": f"2024-01-{day:02d}", "label": str(day), "count": 0 if day % 7 == 0 else 6}
+            for day in range(1, 15)
+        ]
+
+        stats = compute_series_stats(distribution, "daily")
+
+        seasonality = {item["label"]: item["index"] for item in stats["seasonality"]}
+        assert seasonality["Dom"] == 0
+        assert seasonality["Seg"] == 6 / (72 / 14)
+
+    def test_format_surfaces_anomalies(self):
+        """Test format_temporal_distribution lists flagged periods."""
+        counts = [100, 104, 98, 101, 500, 99, 103, 100]
+        result = format_temporal_distribution({
+            "granularity": "monthly",
+            "query": "enchentes",
+            "total_found": sum(counts),
+            "distribution": _monthly(counts),
+            "filters": {},
+        })
+
+        assert "| Período | Quantidade | Média Móvel (3) |" in result
+        assert "## Anomalias" in result
+        assert "| 05/2023 | 500 | pico |" in result
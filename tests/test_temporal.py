@@ -1,10 +1,10 @@
 """Tests for temporal analysis tool and utilities."""
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
 
-from govbrnews_mcp.tools.temporal import analyze_temporal
+from govbrnews_mcp.tools.temporal import analyze_temporal, analyze_temporal_multi
 from govbrnews_mcp.utils.temporal import (
     get_temporal_distribution,
     format_temporal_distribution,
@@ -21,13 +21,14 @@ class TestTemporalUtils:
         assert _get_month_name(6) == "Junho"
         assert _get_month_name(12) == "Dezembro"
 
-    @patch("govbrnews_mcp.utils.temporal.get_typesense_client")
-    def test_get_temporal_distribution_yearly(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_yearly(self, mock_get_client):
         """Test yearly temporal distribution."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.multi_search.return_value = [{
             "found": 10000,
             "facet_counts": [
                 {
@@ -38,9 +39,9 @@ class TestTemporalUtils:
                     ]
                 }
             ]
-        }
+        }]
 
-        result = get_temporal_distribution("educação", "yearly")
+        result = await get_temporal_distribution("educação", "yearly")
 
         assert result["granularity"] == "yearly"
         assert result["query"] == "educação"
@@ -49,13 +50,14 @@ class TestTemporalUtils:
         assert result["distribution"][0]["period"] == "2024"
         assert result["distribution"][0]["count"] == 6000
 
-    @patch("govbrnews_mcp.utils.temporal.get_typesense_client")
-    def test_get_temporal_distribution_yearly_with_filters(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_yearly_with_filters(self, mock_get_client):
         """Test yearly distribution with year filters."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
+        mock_client.multi_search.return_value = [{
             "found": 5000,
             "facet_counts": [
                 {
@@ -63,98 +65,257 @@ class TestTemporalUtils:
                     "counts": [{"value": "2024", "count": 5000}]
                 }
             ]
-        }
+        }]
 
-        result = get_temporal_distribution("saúde", "yearly", year_from=2024, year_to=2024)
+        result = await get_temporal_distribution("saúde", "yearly", year_from=2024, year_to=2024)
 
         assert result["filters"]["year_from"] == 2024
         assert result["filters"]["year_to"] == 2024
 
         # Verificar que filtro foi usado
-        call_args = mock_client.client.collections.__getitem__.return_value.documents.search.call_args
-        assert "filter_by" in call_args[0][0]
-        assert "published_year:>=2024" in call_args[0][0]["filter_by"]
-        assert "published_year:<=2024" in call_args[0][0]["filter_by"]
+        search = mock_client.multi_search.call_args[0][0][0]
+        assert "published_year:>=2024" in search["filter_by"]
+        assert "published_year:<=2024" in search["filter_by"]
 
-    @patch("govbrnews_mcp.utils.temporal.get_typesense_client")
-    def test_get_temporal_distribution_monthly(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_monthly(self, mock_get_client):
         """Test monthly temporal distribution."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        # Mock inicial para descobrir anos
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
-            "found": 2000,
+        # Mock contagens mensais (um único multi_search)
+        def multi_search_side_effect(searches):
+            return [
+                {"found": 1000} if s["filter_by"].endswith(("published_month:=1", "published_month:=2"))
+                else {"found": 0}
+                for s in searches
+            ]
+
+        mock_client.multi_search.side_effect = multi_search_side_effect
+
+        result = await get_temporal_distribution("educação", "monthly", year_from=2025, year_to=2025, max_periods=12)
+
+        assert result["granularity"] == "monthly"
+        assert result["query"] == "educação"
+        assert "note" in result
+
+        # Todas as contagens mensais em uma única chamada
+        mock_client.search.assert_not_called()
+        mock_client.multi_search.assert_called_once()
+        searches = mock_client.multi_search.call_args[0][0]
+        assert len(searches) == 12
+        assert searches[0]["filter_by"] == "published_year:=2025 && published_month:=1"
+        # Série contínua: meses sem notícias aparecem com zero
+        assert [d["period"] for d in result["distribution"]] == [f"2025-{m:02d}" for m in range(1, 13)]
+        assert [d["count"] for d in result["distribution"]][:3] == [1000, 1000, 0]
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_monthly_partial_failure(self, mock_get_client):
+        """Test that a failed month in the batch is skipped."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        mock_client.multi_search.return_value = (
+            [{"found": 100}, {"error": "timeout", "code": 500}, {"found": 200}]
+            + [{"found": 0}] * 9
+        )
+
+        result = await get_temporal_distribution(
+            "test", "monthly", year_from=2025, year_to=2025, max_periods=12
+        )
+
+        periods = [d["period"] for d in result["distribution"]]
+        assert periods[:2] == ["2025-01", "2025-03"]
+        assert "2025-02" not in periods
+        assert [p["period"] for p in result["failed_periods"]] == ["2025-02"]
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_monthly_uses_year_month_facet(
+        self, mock_get_client, collection_schema
+    ):
+        """Test monthly distribution uses one published_year_month facet query."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        collection_schema.update({"fields": [
+            {"name": "published_year_month", "type": "int32", "facet": True},
+        ]})
+        mock_client.multi_search.return_value = [{
+            "found": 400,
             "facet_counts": [
                 {
-                    "field_name": "published_year",
-                    "counts": [{"value": "2025", "count": 2000}]
-                },
-                {
-                    "field_name": "published_month",
+                    "field_name": "published_year_month",
                     "counts": [
-                        {"value": "1", "count": 1000},
-                        {"value": "2", "count": 1000}
+                        {"value": "202412", "count": 300},
+                        {"value": "202411", "count": 100},
                     ]
                 }
             ]
-        }
+        }]
+
+        result = await get_temporal_distribution(
+            "educação", "monthly", year_from=2024, year_to=2024, max_periods=3
+        )
+
+        mock_client.search.assert_not_called()
+        searches = mock_client.multi_search.call_args[0][0]
+        assert len(searches) == 1
+        assert searches[0]["facet_by"] == "published_year_month"
+        assert searches[0]["filter_by"] == (
+            "published_year_month:>=202410 && published_year_month:<=202412"
+        )
+
+        # Ordem cronológica, limitada aos últimos max_periods meses, com zeros
+        assert [(d["period"], d["count"]) for d in result["distribution"]] == [
+            ("2024-10", 0), ("2024-11", 100), ("2024-12", 300)
+        ]
+        assert result["distribution"][0]["label"] == "Outubro/2024"
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_facet_failure_uses_ranges(
+        self, mock_get_client, collection_schema
+    ):
+        """Test a failed facet query is retried with one count per month."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
 
-        # Mock queries mensais subsequentes
-        def search_side_effect(params):
-            if "published_month:=1" in params.get("filter_by", ""):
-                return {"found": 1000}
-            elif "published_month:=2" in params.get("filter_by", ""):
-                return {"found": 1000}
-            else:
-                return {"found": 0}
+        collection_schema.update({"fields": [
+            {"name": "published_year_month", "type": "int32", "facet": True},
+        ]})
+        mock_client.multi_search.side_effect = [
+            [{"error": "Could not find a facet field named `published_year_month`", "code": 404}],
+            [{"found": 1}, {"found": 2}, {"found": 3}],
+        ]
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.side_effect = search_side_effect
+        result = await get_temporal_distribution("*", "monthly", year_to=2024, max_periods=3)
 
-        result = get_temporal_distribution("educação", "monthly", year_from=2025, year_to=2025, max_periods=12)
+        fallback = mock_client.multi_search.call_args_list[1][0][0]
+        assert fallback[0]["filter_by"] == "published_year:=2024 && published_month:=10"
+        assert [d["count"] for d in result["distribution"]] == [1, 2, 3]
 
-        assert result["granularity"] == "monthly"
-        assert result["query"] == "educação"
-        assert "note" in result
 
-    @patch("govbrnews_mcp.utils.temporal.get_typesense_client")
-    def test_get_temporal_distribution_weekly(self, mock_get_client):
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_weekly(self, mock_get_client):
         """Test weekly temporal distribution."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        # Mock para queries semanais
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
-            "found": 100
-        }
+        # Mock para queries semanais (fallback em um único multi_search)
+        mock_client.multi_search.side_effect = lambda searches: [{"found": 100}] * len(searches)
 
-        result = get_temporal_distribution("saúde", "weekly", max_periods=4)
+        result = await get_temporal_distribution("saúde", "weekly", max_periods=4)
 
         assert result["granularity"] == "weekly"
         assert result["query"] == "saúde"
         assert "distribution" in result
         assert "note" in result
         assert "semanal" in result["note"]
-        assert len(result["distribution"]) <= 4
+        assert len(result["distribution"]) == 4
+        assert result["total_found"] == 400
+        mock_client.multi_search.assert_called_once()
+        mock_client.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_weekly_partial_failure(self, mock_get_client):
+        """Test failed weeks in the fallback batch are reported individually."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        mock_client.multi_search.return_value = [
+            {"found": 10},
+            {"error": "Request timeout", "code": 408},
+            {"found": 30},
+        ]
+
+        result = await get_temporal_distribution("saúde", "weekly", max_periods=3)
+
+        assert len(result["distribution"]) == 2
+        assert result["total_found"] == 40
+        assert len(result["failed_periods"]) == 1
+        assert result["failed_periods"][0]["error"] == "Request timeout"
+
+        formatted = format_temporal_distribution(result)
+        assert "Períodos com Erro" in formatted
+        assert "Request timeout" in formatted
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_weekly_uses_schema(self, mock_get_client, collection_schema):
+        """Test weekly distribution uses published_week facets without probing."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        collection_schema.update({"fields": [
+            {"name": "published_week", "type": "int32", "facet": True},
+        ]})
+        mock_client.multi_search.return_value = [{
+            "found": 30,
+            "facet_counts": [
+                {
+                    "field_name": "published_week",
+                    "counts": [
+                        {"value": "202501", "count": 20},
+                        {"value": "202451", "count": 10},
+                    ]
+                }
+            ]
+        }]
+
+        result = await get_temporal_distribution("saúde", "weekly", year_to=2024, max_periods=4)
 
-    @patch("govbrnews_mcp.utils.temporal.get_typesense_client")
-    def test_get_temporal_distribution_weekly_limits(self, mock_get_client):
+        # Uma única query: sem consulta de teste ao campo published_week
+        searches = mock_client.multi_search.call_args[0][0]
+        assert len(searches) == 1
+        assert searches[0]["facet_by"] == "published_week"
+        assert [(d["period"], d["count"]) for d in result["distribution"]] == [
+            ("2024-W50", 0), ("2024-W51", 10), ("2024-W52", 0), ("2025-W01", 20)
+        ]
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_weekly_limits(self, mock_get_client):
         """Test that weekly distribution is limited to 52 weeks."""
-        mock_client = MagicMock()
+        mock_client = AsyncMock()
         mock_get_client.return_value = mock_client
 
-        mock_client.client.collections.__getitem__.return_value.documents.search.return_value = {
-            "found": 50
-        }
+        mock_client.multi_search.side_effect = lambda searches: [{"found": 50}] * len(searches)
 
-        result = get_temporal_distribution("test", "weekly", max_periods=100)
+        result = await get_temporal_distribution("test", "weekly", max_periods=100)
 
         # Should be limited to 52
-        assert len(result["distribution"]) <= 52
+        assert len(result["distribution"]) == 52
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_get_temporal_distribution_daily(self, mock_get_client):
+        """Test daily distribution sends every day in one multi_search."""
+        mock_client = AsyncMock()
+        mock_client.multi_search.side_effect = lambda searches: [
+            {"found": 2} for _ in searches
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = await get_temporal_distribution(
+            query="test",
+            granularity="daily",
+            max_periods=500
+        )
+
+        assert result["granularity"] == "daily"
+        mock_client.multi_search.assert_called_once()
+        assert len(result["distribution"]) == 366
+        assert result["total_found"] == 732
 
-    def test_get_temporal_distribution_invalid_granularity(self):
+    @pytest.mark.asyncio
+    async def test_get_temporal_distribution_invalid_granularity(self):
         """Test invalid granularity returns error in dict."""
-        result = get_temporal_distribution("test", "invalid")
+        result = await get_temporal_distribution("test", "invalid")
 
         assert "error" in result
         assert "Granularidade inválida" in result["error"]
@@ -214,8 +375,9 @@ class TestTemporalUtils:
 class TestAnalyzeTemporalTool:
     """Tests for analyze_temporal tool."""
 
+    @pytest.mark.asyncio
     @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
-    def test_analyze_temporal_monthly_success(self, mock_get_dist):
+    async def test_analyze_temporal_monthly_success(self, mock_get_dist):
         """Test successful monthly temporal analysis."""
         mock_get_dist.return_value = {
             "granularity": "monthly",
@@ -228,14 +390,15 @@ class TestAnalyzeTemporalTool:
             "filters": {"year_from": 2025, "year_to": 2025}
         }
 
-        result = analyze_temporal("educação", "monthly", 2025, 2025)
+        result = await analyze_temporal("educação", "monthly", 2025, 2025)
 
         assert "# Distribuição Temporal" in result
         assert "educação" in result
         assert "Janeiro/2025" in result
 
+    @pytest.mark.asyncio
     @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
-    def test_analyze_temporal_yearly(self, mock_get_dist):
+    async def test_analyze_temporal_yearly(self, mock_get_dist):
         """Test yearly temporal analysis."""
         mock_get_dist.return_value = {
             "granularity": "yearly",
@@ -248,13 +411,14 @@ class TestAnalyzeTemporalTool:
             "filters": {}
         }
 
-        result = analyze_temporal("saúde", "yearly")
+        result = await analyze_temporal("saúde", "yearly")
 
         assert "# Distribuição Temporal" in result
         assert "yearly" in result
 
+    @pytest.mark.asyncio
     @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
-    def test_analyze_temporal_weekly(self, mock_get_dist):
+    async def test_analyze_temporal_weekly(self, mock_get_dist):
         """Test weekly temporal analysis."""
         mock_get_dist.return_value = {
             "granularity": "weekly",
@@ -268,15 +432,16 @@ class TestAnalyzeTemporalTool:
             "note": "Distribuição semanal limitada a 52 semanas"
         }
 
-        result = analyze_temporal("meio ambiente", "weekly", max_periods=2)
+        result = await analyze_temporal("meio ambiente", "weekly", max_periods=2)
 
         assert "# Distribuição Temporal" in result
         assert "weekly" in result
         assert "Semana de" in result
 
-    def test_analyze_temporal_invalid_granularity(self):
+    @pytest.mark.asyncio
+    async def test_analyze_temporal_invalid_granularity(self):
         """Test with invalid granularity."""
-        result = analyze_temporal("test", "invalid")
+        result = await analyze_temporal("test", "invalid")
 
         assert "# Erro" in result
         assert "Granularidade inválida" in result
@@ -284,8 +449,9 @@ class TestAnalyzeTemporalTool:
         assert "monthly" in result
         assert "weekly" in result
 
+    @pytest.mark.asyncio
     @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
-    def test_analyze_temporal_limits_yearly(self, mock_get_dist):
+    async def test_analyze_temporal_limits_yearly(self, mock_get_dist):
         """Test that yearly max_periods is limited to 50."""
         mock_get_dist.return_value = {
             "granularity": "yearly",
@@ -295,14 +461,15 @@ class TestAnalyzeTemporalTool:
             "filters": {}
         }
 
-        analyze_temporal("test", "yearly", max_periods=100)
+        await analyze_temporal("test", "yearly", max_periods=100)
 
         # Verify it was called with max 50
         call_args = mock_get_dist.call_args
         assert call_args[1]["max_periods"] == 50
 
+    @pytest.mark.asyncio
     @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
-    def test_analyze_temporal_limits_monthly(self, mock_get_dist):
+    async def test_analyze_temporal_limits_monthly(self, mock_get_dist):
         """Test that monthly max_periods is limited to 60."""
         mock_get_dist.return_value = {
             "granularity": "monthly",
@@ -312,14 +479,15 @@ class TestAnalyzeTemporalTool:
             "filters": {}
         }
 
-        analyze_temporal("test", "monthly", max_periods=100)
+        await analyze_temporal("test", "monthly", max_periods=100)
 
         # Verify it was called with max 60
         call_args = mock_get_dist.call_args
         assert call_args[1]["max_periods"] == 60
 
+    @pytest.mark.asyncio
     @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
-    def test_analyze_temporal_limits_weekly(self, mock_get_dist):
+    async def test_analyze_temporal_limits_weekly(self, mock_get_dist):
         """Test that weekly max_periods is limited to 52."""
         mock_get_dist.return_value = {
             "granularity": "weekly",
@@ -330,18 +498,448 @@ class TestAnalyzeTemporalTool:
             "note": "Limited"
         }
 
-        analyze_temporal("test", "weekly", max_periods=100)
+        await analyze_temporal("test", "weekly", max_periods=100)
 
         # Verify it was called with max 52
         call_args = mock_get_dist.call_args
         assert call_args[1]["max_periods"] == 52
 
+    @pytest.mark.asyncio
     @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
-    def test_analyze_temporal_error_handling(self, mock_get_dist):
+    async def test_analyze_temporal_limits_daily(self, mock_get_dist):
+        """Test that daily granularity is accepted and limited to 366 days."""
+        mock_get_dist.return_value = {
+            "granularity": "daily",
+            "query": "test",
+            "total_found": 0,
+            "distribution": [],
+            "filters": {},
+        }
+
+        await analyze_temporal("test", "daily", max_periods=1000)
+
+        call_args = mock_get_dist.call_args
+        assert call_args[1]["granularity"] == "daily"
+        assert call_args[1]["max_periods"] == 366
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.temporal.get_temporal_distribution")
+    async def test_analyze_temporal_error_handling(self, mock_get_dist):
         """Test error handling in analyze_temporal."""
         mock_get_dist.side_effect = Exception("Database error")
 
-        result = analyze_temporal("test", "monthly")
+        result = await analyze_temporal("test", "monthly")
 
         assert "# Erro na Análise Temporal" in result
         assert "Database error" in result
+
+
+class TestAnalyzeTemporalMultiTool:
+    """Tests for analyze_temporal_multi tool."""
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.temporal.get_async_typesense_client")
+    async def test_multi_queries_run_in_one_batch(self, mock_get_client):
+        """Test every series goes out in one multi_search on a shared axis."""
+        mock_client = AsyncMock()
+        mock_client.multi_search.side_effect = lambda searches: [
+            {"found": 10 if s["q"] == "educação" else 5} for s in searches
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = await analyze_temporal_multi(queries=["educação", "saúde"], max_periods=3)
+
+        mock_client.multi_search.assert_called_once()
+        searches = mock_client.multi_search.call_args[0][0]
+        assert len(searches) == 2 * 3
+        # Mesmos meses nas duas séries
+        assert [s["filter_by"] for s in searches[:3]] == [s["filter_by"] for s in searches[3:]]
+
+        assert "# Análise Temporal Comparativa (monthly)" in result
+        assert "| Período | educação | saúde |" in result
+        assert "| 10 | 5 |" in result
+        assert "| educação | 30 | 10 |" in result
+        assert "| saúde | 15 | 5 |" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.temporal.get_async_typesense_client")
+    async def test_multi_agencies_filter_each_series(self, mock_get_client):
+        """Test agency series share the query and add an exact agency filter."""
+        mock_client = AsyncMock()
+        mock_client.multi_search.side_effect = lambda searches: [
+            {"found": 1} for _ in searches
+        ]
+        mock_get_client.return_value = mock_client
+
+        await analyze_temporal_multi(agencies=["mec", "capes"], query="bolsas", max_periods=2)
+
+        searches = mock_client.multi_search.call_args[0][0]
+        assert all(s["q"] == "bolsas" for s in searches)
+        assert searches[0]["filter_by"].endswith("&& agency:=`mec`")
+        assert searches[-1]["filter_by"].endswith("&& agency:=`capes`")
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.temporal.get_async_typesense_client")
+    async def test_multi_failed_period_shown_as_error(self, mock_get_client):
+        """Test a failed period is an error cell and left out of the stats."""
+        mock_client = AsyncMock()
+        mock_client.multi_search.side_effect = lambda searches: [
+            {"found": 4}, {"error": "timeout", "code": 500}, {"found": 2}, {"found": 2}
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = await analyze_temporal_multi(themes=["Saúde", "Educação"], max_periods=2)
+
+        assert "| 4 | 2 |" in result
+        assert "| erro | 2 |" in result
+        assert "| Saúde | 4 | 4 |" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.temporal.get_async_typesense_client")
+    async def test_multi_facet_failure_uses_ranges(self, mock_get_client, collection_schema):
+        """Test series are re-planned with per-day counts when the facet query fails."""
+        collection_schema.update({"fields": [
+            {"name": "published_date", "type": "int32", "facet": True},
+        ]})
+        mock_client = AsyncMock()
+        mock_client.multi_search.side_effect = [
+            [{"error": "Could not find a facet field named `published_date`", "code": 404}] * 2,
+            [{"found": 3}] * 4,
+        ]
+        mock_get_client.return_value = mock_client
+
+        result = await analyze_temporal_multi(
+            queries=["educação", "saúde"], granularity="daily", max_periods=2
+        )
+
+        assert mock_client.multi_search.call_count == 2
+        facet_searches, range_searches = [
+            call[0][0] for call in mock_client.multi_search.call_args_list
+        ]
+        assert all(s["facet_by"] == "published_date" for s in facet_searches)
+        # Uma contagem por dia de cada série, todas no mesmo lote
+        assert len(range_searches) == 4
+        assert all("published_at:>=" in s["filter_by"] for s in range_searches)
+        assert "| educação | 6 | 3 |" in result
+        assert "erro" not in result
+
+    @pytest.mark.asyncio
+    async def test_multi_requires_exactly_one_list(self):
+        """Test series must come from exactly one of queries/agencies/themes."""
+        result = await analyze_temporal_multi(queries=["a"], agencies=["mec"])
+        assert "# Erro" in result
+
+        result = await analyze_temporal_multi()
+        assert "# Erro" in result
+
+    @pytest.mark.asyncio
+    async def test_multi_invalid_granularity(self):
+        """Test invalid granularity is rejected before querying."""
+        result = await analyze_temporal_multi(queries=["a"], granularity="hourly")
+
+        assert "Granularidade inválida" in result
+
+
+class TestTemporalPlan:
+    """Tests for plan_temporal_distribution (planning without executing)."""
+
+    @pytest.mark.asyncio
+    async def test_plan_monthly_covers_calendar_window(self):
+        """Test the monthly plan has one count search per calendar month."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        plan = await plan_temporal_distribution(
+            "educação", "monthly", max_periods=3,
+            filter_by="agency:=mec", now=datetime(2025, 2, 15)
+        )
+
+        assert [s["filter_by"] for s in plan.searches] == [
+            "published_year:=2024 && published_month:=12 && agency:=mec",
+            "published_year:=2025 && published_month:=1 && agency:=mec",
+            "published_year:=2025 && published_month:=2 && agency:=mec",
+        ]
+
+        result = plan.build([{"found": 5}, {"found": 0}, {"error": "timeout", "code": 500}])
+
+        # Meses sem notícias são mantidos; meses com erro vão para failed_periods
+        assert [(d["period"], d["count"]) for d in result["distribution"]] == [
+            ("2024-12", 5), ("2025-01", 0)
+        ]
+        assert result["failed_periods"][0]["period"] == "2025-02"
+        assert result["total_found"] == 5
+
+    @pytest.mark.asyncio
+    async def test_plan_monthly_uses_year_month_facet(self, collection_schema):
+        """Test the monthly plan is one facet search, zero-filled per month."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        collection_schema.update({"fields": [
+            {"name": "published_year_month", "type": "int32", "facet": True},
+        ]})
+
+        plan = await plan_temporal_distribution("*", "monthly", max_periods=3, now=datetime(2025, 2, 1))
+
+        assert len(plan.searches) == 1
+        assert plan.searches[0]["filter_by"] == (
+            "published_year_month:>=202412 && published_year_month:<=202502"
+        )
+
+        result = plan.build([{
+            "found": 7,
+            "facet_counts": [{
+                "field_name": "published_year_month",
+                "counts": [{"value": "202502", "count": 7}]
+            }]
+        }])
+        assert [d["count"] for d in result["distribution"]] == [0, 0, 7]
+
+    @pytest.mark.asyncio
+    async def test_plan_monthly_respects_year_range(self):
+        """Test the monthly window ends at year_to and starts at year_from."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        plan = await plan_temporal_distribution(
+            "*", "monthly", year_from=2023, year_to=2023, max_periods=60,
+            now=datetime(2025, 6, 1)
+        )
+
+        assert len(plan.searches) == 12
+        assert plan.searches[0]["filter_by"] == "published_year:=2023 && published_month:=1"
+
+    @pytest.mark.asyncio
+    async def test_plan_weekly_uses_facet_when_available(self, collection_schema):
+        """Test the weekly plan is a single facet search over recent weeks."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        collection_schema.update({"fields": [
+            {"name": "published_week", "type": "int32", "facet": True},
+        ]})
+
+        plan = await plan_temporal_distribution("saúde", "weekly", max_periods=2, now=datetime(2025, 1, 20))
+
+        assert len(plan.searches) == 1
+        assert plan.searches[0]["facet_by"] == "published_week"
+        assert plan.searches[0]["filter_by"] == (
+            f"published_at:>={int(datetime(2025, 1, 6).timestamp())} && "
+            f"published_at:<{int(datetime(2025, 1, 20).timestamp())}"
+        )
+
+        result = plan.build([{
+            "found": 30,
+            "facet_counts": [{
+                "field_name": "published_week",
+                "counts": [{"value": "202503", "count": 20}, {"value": "202502", "count": 10}]
+            }]
+        }])
+        assert [(d["period"], d["count"]) for d in result["distribution"]] == [
+            ("2025-W02", 10), ("2025-W03", 20)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_plan_weekly_facet_respects_past_year_to(self, collection_schema):
+        """Test the weekly facet window ends at year_to, not at the current date."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        collection_schema.update({"fields": [
+            {"name": "published_week", "type": "int32", "facet": True},
+        ]})
+
+        plan = await plan_temporal_distribution(
+            "*", "weekly", year_to=2023, max_periods=3, now=datetime(2025, 3, 5)
+        )
+
+        assert plan.searches[0]["filter_by"] == (
+            f"published_at:>={int(datetime(2023, 12, 11).timestamp())} && "
+            f"published_at:<{int(datetime(2024, 1, 1).timestamp())}"
+        )
+
+        result = plan.build([{
+            "found": 5,
+            "facet_counts": [{
+                "field_name": "published_week",
+                "counts": [{"value": "202352", "count": 5}]
+            }]
+        }])
+        assert [(d["period"], d["count"]) for d in result["distribution"]] == [
+            ("2023-W50", 0), ("2023-W51", 0), ("2023-W52", 5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_plan_weekly_range_fallback(self):
+        """Test the weekly plan falls back to one range search per week."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        plan = await plan_temporal_distribution("saúde", "weekly", max_periods=4)
+
+        assert len(plan.searches) == 4
+        assert all("published_at:>=" in s["filter_by"] for s in plan.searches)
+        assert plan.build([{"found": 1}] * 4)["total_found"] == 4
+
+    @pytest.mark.asyncio
+    async def test_plan_daily_uses_date_facet(self, collection_schema):
+        """Test the daily plan is one published_date facet search, zero-filled per day."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        collection_schema.update({"fields": [
+            {"name": "published_date", "type": "int32", "facet": True},
+        ]})
+
+        plan = await plan_temporal_distribution("*", "daily", max_periods=3, now=datetime(2025, 3, 1))
+
+        assert len(plan.searches) == 1
+        assert plan.searches[0]["filter_by"] == (
+            "published_date:>=20250227 && published_date:<=20250301"
+        )
+
+        result = plan.build([{
+            "found": 4,
+            "facet_counts": [{
+                "field_name": "published_date",
+                "counts": [{"value": "20250227", "count": 4}]
+            }]
+        }])
+        assert [(d["period"], d["count"]) for d in result["distribution"]] == [
+            ("2025-02-27", 4), ("2025-02-28", 0), ("2025-03-01", 0)
+        ]
+        assert result["distribution"][0]["label"] == "27/02/2025"
+
+    @pytest.mark.asyncio
+    async def test_plan_daily_range_fallback(self):
+        """Test the daily plan falls back to one range search per day."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        plan = await plan_temporal_distribution("*", "daily", max_periods=2, now=datetime(2025, 1, 1))
+
+        assert len(plan.searches) == 2
+        assert all("published_at:>=" in s["filter_by"] for s in plan.searches)
+
+        result = plan.build([{"found": 3}, {"found": 0}])
+        assert [(d["period"], d["count"]) for d in result["distribution"]] == [
+            ("2024-12-31", 3), ("2025-01-01", 0)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_plan_invalid_granularity(self):
+        """Test invalid granularity is rejected while planning."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        with pytest.raises(ValueError):
+            await plan_temporal_distribution("test", "hourly")
+
+    @pytest.mark.asyncio
+    async def test_multi_search_groups_splits_results(self):
+        """Test grouped searches go out in one call and come back per group."""
+        from govbrnews_mcp.utils.batch import multi_search_groups
+
+        mock_client = AsyncMock()
+        mock_client.multi_search.side_effect = lambda searches: [
+            {"found": s["n"]} for s in searches
+        ]
+
+        grouped = await multi_search_groups(mock_client, [[{"n": 1}], [], [{"n": 2}, {"n": 3}]])
+
+        mock_client.multi_search.assert_called_once()
+        assert grouped == [[{"found": 1}], [], [{"found": 2}, {"found": 3}]]
+
+
+class TestPeriodCache:
+    """Tests for the closed-period count cache."""
+
+    @pytest.mark.asyncio
+    async def test_plan_requeries_only_open_period(self):
+        """Test closed months are served from cache and only the open one is queried."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        now = datetime(2025, 2, 15)
+        first = await plan_temporal_distribution("educação", "monthly", max_periods=3, now=now)
+        assert len(first.searches) == 3
+        first.build([{"found": 10}, {"found": 20}, {"found": 5}])
+
+        second = await plan_temporal_distribution("educação", "monthly", max_periods=3, now=now)
+
+        # Dezembro e janeiro estão encerrados; só fevereiro (em aberto) é consultado
+        assert [s["filter_by"] for s in second.searches] == [
+            "published_year:=2025 && published_month:=2"
+        ]
+        result = second.build([{"found": 7}])
+        assert [d["count"] for d in result["distribution"]] == [10, 20, 7]
+
+    @pytest.mark.asyncio
+    async def test_recently_closed_period_is_not_cached(self):
+        """Test a period is only cached after the settle delay has passed."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        # Janeiro terminou há menos de period_settle_seconds (2 dias)
+        now = datetime(2025, 2, 2)
+        first = await plan_temporal_distribution("saúde", "monthly", max_periods=2, now=now)
+        first.build([{"found": 1}, {"found": 2}])
+
+        second = await plan_temporal_distribution("saúde", "monthly", max_periods=2, now=now)
+        assert len(second.searches) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached_and_filters_are_separate(self):
+        """Test failed counts are retried and each filter has its own entries."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        now = datetime(2025, 6, 15)
+        first = await plan_temporal_distribution("*", "monthly", max_periods=2, now=now)
+        first.build([{"error": "timeout", "code": 408}, {"found": 3}])
+
+        second = await plan_temporal_distribution("*", "monthly", max_periods=2, now=now)
+        assert len(second.searches) == 2
+
+        other = await plan_temporal_distribution(
+            "*", "monthly", max_periods=2, filter_by="agency:=`mec`", now=now
+        )
+        assert len(other.searches) == 2
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.utils.temporal.get_async_typesense_client")
+    async def test_monthly_fallback_reuses_closed_months(self, mock_get_client):
+        """Test repeated monthly analyses of a past year send no count queries."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+
+        mock_client.multi_search.side_effect = lambda searches: [{"found": 10}] * len(searches)
+
+        first = await get_temporal_distribution("educação", "monthly", year_from=2023, year_to=2023)
+        second = await get_temporal_distribution("educação", "monthly", year_from=2023, year_to=2023)
+
+        mock_client.multi_search.assert_called_once()
+        assert first["distribution"] == second["distribution"]
+        assert len(second["distribution"]) == 12
+
+    @pytest.mark.asyncio
+    async def test_truncated_week_is_not_served_as_full_week(self):
+        """Test a week cut short by year_to does not answer for the full week."""
+        from govbrnews_mcp.utils.temporal import plan_temporal_distribution
+
+        now = datetime(2025, 3, 5)
+        truncated = await plan_temporal_distribution(
+            "*", "weekly", year_to=2024, max_periods=4, now=now, use_facets=False
+        )
+        assert truncated.searches[-1]["filter_by"].endswith(
+            f"published_at:<{int(datetime(2025, 1, 1).timestamp())}"
+        )
+        truncated.build([{"found": 10}] * len(truncated.searches))
+
+        full = await plan_temporal_distribution(
+            "*", "weekly", max_periods=10, now=now, use_facets=False
+        )
+
+        # A semana de 30/12/2024 inteira (até 06/01/2025) é consultada de novo
+        week_end = int(datetime(2025, 1, 6).timestamp())
+        assert any(s["filter_by"].endswith(f"published_at:<{week_end}") for s in full.searches)
+
+    def test_recent_weeks_are_aligned_to_mondays(self):
+        """Test closed weekly windows keep the same bounds between calls."""
+        from govbrnews_mcp.utils.temporal import _recent_weeks
+
+        _, _, weeks = _recent_weeks(None, None, 3, now=datetime(2025, 1, 22, 15, 30))
+
+        assert weeks == [
+            (datetime(2025, 1, 6), datetime(2025, 1, 13)),
+            (datetime(2025, 1, 13), datetime(2025, 1, 20)),
+            (datetime(2025, 1, 20), datetime(2025, 1, 22, 15, 30)),
+        ]
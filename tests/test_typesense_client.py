@@ -1,161 +1,369 @@
 """Tests for Typesense client wrapper."""
 
 import pytest
-from unittest.mock import MagicMock, patch
 from typesense.exceptions import ObjectNotFound, TypesenseClientError
 
 
-@patch("govbrnews_mcp.typesense_client.settings")
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_typesense_client_initialization(mock_client_class, mock_settings_patch):
-    """Test TypesenseClient initialization."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
+def _async_client_with_handler(handler):
+    """Build an AsyncTypesenseClient whose HTTP pool is served by `handler`."""
+    import httpx
+    from govbrnews_mcp.typesense_client import AsyncTypesenseClient
 
-    # Configure mock settings
-    mock_settings_patch.typesense_host = "localhost"
-    mock_settings_patch.typesense_port = 8108
-    mock_settings_patch.typesense_protocol = "http"
-    mock_settings_patch.typesense_api_key = "test_api_key"
+    client = AsyncTypesenseClient()
+    client._http = httpx.AsyncClient(
+        base_url=client.base_url,
+        headers=client._http.headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return client
 
-    client = TypesenseClient()
 
-    # Verify client was initialized with correct config
-    mock_client_class.assert_called_once()
-    call_args = mock_client_class.call_args[0][0]
+@pytest.mark.asyncio
+async def test_async_search_success(mock_typesense_search_response):
+    """Test async search sends a GET with encoded params and API key."""
+    import httpx
 
-    assert call_args["nodes"][0]["host"] == "localhost"
-    assert call_args["nodes"][0]["port"] == "8108"
-    assert call_args["nodes"][0]["protocol"] == "http"
-    assert call_args["api_key"] == "test_api_key"
+    requests = []
 
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=mock_typesense_search_response)
 
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_search_success(mock_client_class, mock_typesense_search_response, mock_settings):
-    """Test successful search operation."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
+    client = _async_client_with_handler(handler)
+    results = await client.search("news", {"q": "educação", "prioritize_exact_match": True})
 
-    # Setup mock
-    mock_instance = MagicMock()
-    mock_client_class.return_value = mock_instance
-    mock_instance.collections.__getitem__.return_value.documents.search.return_value = (
-        mock_typesense_search_response
-    )
+    assert results["found"] == 3
+    assert requests[0].url.path == "/collections/news/documents/search"
+    assert requests[0].url.params["q"] == "educação"
+    assert requests[0].url.params["prioritize_exact_match"] == "true"
+    assert "x-typesense-api-key" in requests[0].headers
+
+
+@pytest.mark.asyncio
+async def test_async_search_uses_cache(mock_typesense_search_response):
+    """Test repeated async searches are served from the response cache."""
+    import httpx
 
-    client = TypesenseClient()
-    results = client.search("news", {"q": "educação", "query_by": "title"})
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=mock_typesense_search_response)
+
+    client = _async_client_with_handler(handler)
+    await client.search("news", {"q": "educação"})
+    results = await client.search("news", {"q": "educação"})
 
     assert results["found"] == 3
-    assert len(results["hits"]) == 3
-    assert results["hits"][0]["document"]["title"] == "Notícia sobre educação"
+    assert len(calls) == 1
+    assert client.cache.stats()["bytes"] > 0
 
 
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_search_collection_not_found(mock_client_class, mock_settings):
-    """Test search with non-existent collection."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
+@pytest.mark.asyncio
+async def test_async_search_collection_not_found():
+    """Test async search maps HTTP 404 to ObjectNotFound."""
+    import httpx
 
-    # Setup mock to raise ObjectNotFound
-    mock_instance = MagicMock()
-    mock_client_class.return_value = mock_instance
-    mock_instance.collections.__getitem__.return_value.documents.search.side_effect = (
-        ObjectNotFound("Collection not found")
+    client = _async_client_with_handler(
+        lambda request: httpx.Response(404, json={"message": "Not found."})
     )
 
-    client = TypesenseClient()
-
     with pytest.raises(ObjectNotFound):
-        client.search("nonexistent", {"q": "test"})
+        await client.search("nonexistent", {"q": "test"})
 
 
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_get_collection_info_success(
-    mock_client_class, mock_typesense_collection_info, mock_settings
-):
-    """Test successful collection info retrieval."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
-
-    # Setup mock
-    mock_instance = MagicMock()
-    mock_client_class.return_value = mock_instance
-    mock_instance.collections.__getitem__.return_value.retrieve.return_value = (
-        mock_typesense_collection_info
+@pytest.mark.asyncio
+async def test_async_multi_search_chunks_and_orders_results():
+    """Test async multi_search chunks large batches and keeps result order."""
+    import json
+    import httpx
+    from govbrnews_mcp.typesense_client import MULTI_SEARCH_CHUNK_SIZE
+
+    calls = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        calls.append(len(body["searches"]))
+        return httpx.Response(
+            200, json={"results": [{"found": s["q"]} for s in body["searches"]]}
+        )
+
+    client = _async_client_with_handler(handler)
+    total = MULTI_SEARCH_CHUNK_SIZE * 2 + 5
+    results = await client.multi_search([{"collection": "news", "q": i} for i in range(total)])
+
+    assert sorted(calls) == [5, MULTI_SEARCH_CHUNK_SIZE, MULTI_SEARCH_CHUNK_SIZE]
+    assert [r["found"] for r in results] == list(range(total))
+
+
+@pytest.mark.asyncio
+async def test_async_get_document_quotes_id():
+    """Test async get_document escapes the document ID in the URL."""
+    import httpx
+
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.raw_path)
+        return httpx.Response(200, json={"id": "a/b"})
+
+    client = _async_client_with_handler(handler)
+    doc = await client.get_document("news", "a/b")
+
+    assert doc["id"] == "a/b"
+    assert paths[0] == b"/collections/news/documents/a%2Fb"
+
+
+@pytest.mark.asyncio
+async def test_async_health_check_connection_error():
+    """Test async health check returns False when Typesense is unreachable."""
+    import httpx
+
+    def handler(request):
+        raise httpx.ConnectError("Connection refused")
+
+    client = _async_client_with_handler(handler)
+
+    assert await client.health_check() is False
+
+
+@pytest.mark.asyncio
+async def test_async_connection_error_raises_typesense_error():
+    """Test transport errors surface as TypesenseClientError."""
+    import httpx
+
+    def handler(request):
+        raise httpx.ConnectError("Connection refused")
+
+    client = _async_client_with_handler(handler)
+
+    with pytest.raises(TypesenseClientError):
+        await client.get_collection_info("news")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Test identical concurrent calls share one execution."""
+    import asyncio
+    from govbrnews_mcp.typesense_client import SingleFlight
+
+    single_flight = SingleFlight()
+    executions = []
+
+    async def call():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return {"found": 1}
+
+    results = await asyncio.gather(*(single_flight.run("key", call) for _ in range(5)))
+
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.coalesced == 4
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_all_callers():
+    """Test a failed shared call raises in every waiting caller."""
+    import asyncio
+    from govbrnews_mcp.typesense_client import SingleFlight
+
+    single_flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise TypesenseClientError("boom")
+
+    results = await asyncio.gather(
+        *(single_flight.run("key", call) for _ in range(3)), return_exceptions=True
     )
 
-    client = TypesenseClient()
-    info = client.get_collection_info("news")
+    assert all(isinstance(result, TypesenseClientError) for result in results)
+    assert single_flight.executed == 1
 
-    assert info["name"] == "news"
-    assert info["num_documents"] == 295511
-    assert len(info["fields"]) == 5
 
+@pytest.mark.asyncio
+async def test_single_flight_survives_caller_cancellation():
+    """Test cancelling one caller does not cancel the shared call."""
+    import asyncio
+    from govbrnews_mcp.typesense_client import SingleFlight
 
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_get_document_success(mock_client_class, mock_settings):
-    """Test successful document retrieval."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
+    single_flight = SingleFlight()
 
-    # Setup mock
-    mock_instance = MagicMock()
-    mock_client_class.return_value = mock_instance
-    mock_doc = {
-        "unique_id": "test123",
-        "title": "Test Document",
-        "agency": "Test Agency",
-    }
-    mock_instance.collections.__getitem__.return_value.documents.__getitem__.return_value.retrieve.return_value = mock_doc
+    async def call():
+        await asyncio.sleep(0.02)
+        return "done"
 
-    client = TypesenseClient()
-    doc = client.get_document("news", "test123")
+    first = asyncio.ensure_future(single_flight.run("key", call))
+    second = asyncio.ensure_future(single_flight.run("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
 
-    assert doc["unique_id"] == "test123"
-    assert doc["title"] == "Test Document"
+    assert await second == "done"
 
 
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_get_document_not_found(mock_client_class, mock_settings):
-    """Test document retrieval for non-existent document."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
+@pytest.mark.asyncio
+async def test_async_concurrent_identical_searches_share_one_request(
+    mock_typesense_search_response,
+):
+    """Test concurrent identical searches reach Typesense only once."""
+    import asyncio
+    import httpx
+
+    calls = []
 
-    # Setup mock
-    mock_instance = MagicMock()
-    mock_client_class.return_value = mock_instance
-    mock_instance.collections.__getitem__.return_value.documents.__getitem__.return_value.retrieve.side_effect = ObjectNotFound(
-        "Document not found"
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=mock_typesense_search_response)
+
+    client = _async_client_with_handler(handler)
+    results = await asyncio.gather(
+        *(client.search("news", {"q": "educação", "facet_by": "agency"}) for _ in range(10))
     )
 
-    client = TypesenseClient()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
 
-    with pytest.raises(ObjectNotFound):
-        client.get_document("news", "nonexistent")
 
+@pytest.mark.asyncio
+async def test_async_get_document_uses_document_cache():
+    """Test repeated document lookups reach Typesense once."""
+    import httpx
+
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"id": "123", "title": "Test"})
+
+    client = _async_client_with_handler(handler)
+    await client.get_document("news", "123")
+    doc = await client.get_document("news", "123")
+
+    assert doc["title"] == "Test"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_get_documents_fetches_misses_in_one_search():
+    """Test batch fetch resolves uncached IDs with one filter in a POST body."""
+    import json
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path == "/multi_search":
+            return httpx.Response(200, json={"results": [{
+                "found": 2,
+                "hits": [
+                    {"document": {"id": "2", "title": "Two"}},
+                    {"document": {"id": "3", "title": "Three"}},
+                ],
+            }]})
+        return httpx.Response(200, json={"id": "1", "title": "One"})
+
+    client = _async_client_with_handler(handler)
+    await client.get_document("news", "1")
+    documents = await client.get_documents("news", ["1", "2", "3", "404"])
+
+    assert set(documents) == {"1", "2", "3"}
+    assert len(requests) == 2
+    assert requests[1].method == "POST"
+    assert not requests[1].url.params
+    assert json.loads(requests[1].content)["searches"] == [{
+        "collection": "news", "q": "*", "filter_by": "id:[`2`,`3`,`404`]", "per_page": 3,
+    }]
+
+    # Documentos agora em cache: nenhuma nova requisição
+    await client.get_documents("news", ["2", "3"])
+    assert len(requests) == 2
 
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_health_check_success(mock_client_class, mock_settings):
-    """Test successful health check."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
 
-    # Setup mock
-    mock_instance = MagicMock()
-    mock_client_class.return_value = mock_instance
-    mock_instance.operations.health.return_value = {"ok": True}
+@pytest.mark.asyncio
+async def test_async_get_documents_chunks_large_batches():
+    """Test batch fetch splits ID lists above the per_page limit."""
+    import json
+    import httpx
+    from govbrnews_mcp.typesense_client import MAX_PER_PAGE
 
-    client = TypesenseClient()
-    is_healthy = client.health_check()
+    requests = []
 
-    assert is_healthy is True
+    def handler(request):
+        requests.append(request)
+        searches = json.loads(request.content)["searches"]
+        return httpx.Response(200, json={"results": [{"found": 0, "hits": []} for _ in searches]})
 
+    client = _async_client_with_handler(handler)
+    await client.get_documents("news", [str(i) for i in range(MAX_PER_PAGE + 1)])
 
-@patch("govbrnews_mcp.typesense_client.typesense.Client")
-def test_health_check_failure(mock_client_class, mock_settings):
-    """Test failed health check."""
-    from govbrnews_mcp.typesense_client import TypesenseClient
+    searches = json.loads(requests[0].content)["searches"]
+    assert len(requests) == 1
+    assert sorted(search["per_page"] for search in searches) == [1, MAX_PER_PAGE]
 
-    # Setup mock
-    mock_instance = MagicMock()
-    mock_client_class.return_value = mock_instance
-    mock_instance.operations.health.side_effect = Exception("Connection refused")
 
-    client = TypesenseClient()
-    is_healthy = client.health_check()
+@pytest.mark.asyncio
+async def test_async_get_documents_raises_on_search_error():
+    """Test a failed ID search is raised instead of silently dropping documents."""
+    import httpx
 
-    assert is_healthy is False
+    def handler(request):
+        return httpx.Response(200, json={"results": [{"code": 400, "error": "Bad filter"}]})
+
+    client = _async_client_with_handler(handler)
+
+    with pytest.raises(TypesenseClientError, match="Bad filter"):
+        await client.get_documents("news", ["1"])
+
+
+@pytest.mark.asyncio
+async def test_async_client_singleton_is_lazy_and_resettable(mock_settings):
+    """Test the shared client is built on first use and rebuilt after reset."""
+    from govbrnews_mcp import typesense_client as module
+
+    await module.reset_typesense_clients()
+    assert module._async_typesense_client is None
+
+    client = module.get_async_typesense_client()
+    assert module.get_async_typesense_client() is client
+    assert client.base_url == "http://localhost:8108"
+
+    await module.reset_typesense_clients()
+    assert client._http.is_closed
+    assert module.get_async_typesense_client() is not client
+    await module.reset_typesense_clients()
+
+
+@pytest.mark.asyncio
+async def test_async_export_documents_streams_jsonl():
+    """Test export decodes one document per JSONL line with the requested fields."""
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=b'{"id": "1", "title": "A"}\n\n{"id": "2", "title": "B"}\n')
+
+    client = _async_client_with_handler(handler)
+    docs = [doc async for doc in client.export_documents("news", include_fields="id,title")]
+
+    assert docs == [{"id": "1", "title": "A"}, {"id": "2", "title": "B"}]
+    assert requests[0].url.path == "/collections/news/documents/export"
+    assert requests[0].url.params["include_fields"] == "id,title"
+
+
+@pytest.mark.asyncio
+async def test_async_export_documents_error():
+    """Test export failures raise the matching Typesense exception."""
+    import httpx
+    from typesense.exceptions import ObjectNotFound
+
+    client = _async_client_with_handler(lambda request: httpx.Response(404, text="Not Found"))
+
+    with pytest.raises(ObjectNotFound):
+        async for _ in client.export_documents("missing"):
+            pass
@@ -0,0 +1,170 @@
+"""Tests for local hashing embeddings and semantic search."""
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from govbrnews_mcp.similarity import VectorIndex, embed_text, embed_texts, get_vector_index
+from govbrnews_mcp.similarity.build import build_vector_index
+from govbrnews_mcp.similarity.vectors import EMBEDDING_DIM
+from govbrnews_mcp.tools.search import search_news
+
+DOCUMENTS = [
+    ("1", "Campanha de vacinação contra a gripe começa nas unidades de saúde"),
+    ("2", "Vacinas contra gripe já estão disponíveis nos postos de saúde"),
+    ("3", "Leilão de energia eólica bate recorde de investimentos"),
+    ("4", "Ministério anuncia investimentos em energia solar e eólica"),
+    ("5", ""),
+]
+
+
+class TestEmbeddings:
+    """Tests for hashing embeddings."""
+
+    def test_embedding_is_deterministic_and_normalized(self):
+        """Test the same text always has the same unit-norm float32 embedding."""
+        vector = embed_text(DOCUMENTS[0][1])
+
+        assert vector.shape == (EMBEDDING_DIM,)
+        assert vector.dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(vector), 1, rtol=1e-5)
+        np.testing.assert_array_equal(vector, embed_text(DOCUMENTS[0][1]))
+
+    def test_paraphrase_is_closer_than_unrelated_text(self):
+        """Test word variants (vacinação/vacinas) bring paraphrases together."""
+        vacinacao, vacinas, energia = embed_texts(text for _, text in DOCUMENTS[:3])
+
+        assert vacinacao @ vacinas > 0.3
+        assert abs(vacinacao @ energia) < 0.15
+
+    def test_empty_text_has_zero_embedding(self):
+        """Test a text without words does not match anything."""
+        assert not embed_text("").any()
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex."""
+
+    def test_most_similar_ranks_by_cosine(self):
+        """Test neighbors come back by similarity and exclusions are honored."""
+        index = VectorIndex.build(DOCUMENTS)
+
+        ranked = index.most_similar("vacina da gripe", 2)
+        excluded = index.most_similar("vacina da gripe", 2, exclude={ranked[0][0]})
+
+        assert {doc_id for doc_id, _ in ranked} == {"1", "2"}
+        assert ranked[0][0] not in [doc_id for doc_id, _ in excluded]
+        assert index.nlist == 0
+
+    def test_ivf_probing_every_list_matches_exact_search(self):
+        """Test the IVF lists cover every document."""
+        index = VectorIndex.build(DOCUMENTS, nlist=2)
+
+        assert index.nlist == 2
+        assert sorted(index.list_rows.tolist()) == list(range(len(DOCUMENTS)))
+        assert index.most_similar("energia eólica", 3, nprobe=2) == index.most_similar(
+            "energia eólica", 3
+        )
+        assert index.most_similar("energia eólica", 1, nprobe=1)[0][0] in {"3", "4"}
+
+    def test_save_and_load_memory_mapped(self, tmp_path):
+        """Test a saved index reopens memory-mapped with the same results."""
+        index = VectorIndex.build(DOCUMENTS, nlist=2)
+        index.save(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path)
+
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.nlist == 2
+        assert loaded.most_similar("gripe", 2, nprobe=1) == index.most_similar("gripe", 2, nprobe=1)
+
+    def test_get_vector_index_from_settings(self, tmp_path, test_settings):
+        """Test the configured index is loaded once and a missing one is ignored."""
+        VectorIndex.build(DOCUMENTS).save(tmp_path / "index")
+        test_settings.vector_index_path = str(tmp_path / "index")
+
+        index = get_vector_index()
+
+        assert len(index) == len(DOCUMENTS)
+        assert get_vector_index() is index
+
+    def test_get_vector_index_reloads_after_rebuild(self, tmp_path, test_settings):
+        """Test a rebuild with another nlist replaces the loaded index."""
+        VectorIndex.build(DOCUMENTS, nlist=2).save(tmp_path / "index")
+        test_settings.vector_index_path = str(tmp_path / "index")
+        old = get_vector_index()
+        vectors = np.array(old.vectors)
+
+        VectorIndex.build(DOCUMENTS, nlist=0).save(tmp_path / "index")
+
+        index = get_vector_index()
+        assert index.nlist == 0
+        assert not (tmp_path / "index" / "centroids.npy").exists()
+        np.testing.assert_array_equal(old.vectors, vectors)
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.similarity.build.get_async_typesense_client")
+    async def test_build_vector_index_from_export(self, mock_get_client, tmp_path):
+        """Test the vector index is built from the streamed export and saved."""
+        async def export_documents(collection, include_fields=None):
+            for doc_id, title in DOCUMENTS:
+                yield {"id": doc_id, "title": title}
+
+        mock_client = AsyncMock()
+        mock_client.export_documents = export_documents
+        mock_get_client.return_value = mock_client
+
+        index = await build_vector_index(tmp_path)
+
+        assert index.ids == [doc_id for doc_id, _ in DOCUMENTS]
+        assert VectorIndex.load(tmp_path).most_similar("eólica", 2) == index.most_similar("eólica", 2)
+
+
+class TestSemanticSearch:
+    """Tests for search_news(semantic=True)."""
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.search.get_vector_index")
+    @patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+    async def test_keyword_and_semantic_hits_are_blended(self, mock_get_client, mock_get_index):
+        """Test both searches go in one multi_search and results are fused."""
+        mock_get_index.return_value = VectorIndex.build(DOCUMENTS)
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.multi_search.return_value = [
+            {"found": 1, "hits": [{"document": {"id": "1", "title": DOCUMENTS[0][1]}}]},
+            {"found": 2, "hits": [
+                {"document": {"id": "1", "title": DOCUMENTS[0][1]}},
+                {"document": {"id": "2", "title": DOCUMENTS[1][1]}},
+            ]},
+        ]
+        mock_client.get_documents.return_value = {}
+
+        result = await search_news("vacina da gripe", agencies=["saude"], semantic=True)
+
+        mock_client.search.assert_not_called()
+        keyword, semantic = mock_client.multi_search.call_args[0][0]
+        assert keyword["q"] == "vacina da gripe"
+        assert semantic["q"] == "*"
+        assert semantic["filter_by"].startswith("id:=[")
+        assert semantic["filter_by"].endswith(f"&& {keyword['filter_by']}")
+
+        assert "**Mostrando:** 2 resultados" in result
+        assert result.index(DOCUMENTS[0][1]) < result.index(DOCUMENTS[1][1])
+        assert "1 não encontrados por palavras-chave" in result
+
+    @pytest.mark.asyncio
+    @patch("govbrnews_mcp.tools.search.get_async_typesense_client")
+    async def test_without_index_falls_back_to_keywords(
+        self, mock_get_client, mock_typesense_search_response
+    ):
+        """Test semantic mode without a vector index runs the keyword search only."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value = mock_client
+        mock_client.search.return_value = mock_typesense_search_response
+
+        result = await search_news("educação", semantic=True)
+
+        mock_client.multi_search.assert_not_called()
+        assert "Notícia sobre educação" in result
+        assert "índice vetorial não configurado" in result